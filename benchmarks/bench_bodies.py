@@ -0,0 +1,82 @@
+# ==========================
+# Benchmark: inline vs out-of-line script bodies (BodyStore)
+#   python benchmarks/bench_bodies.py
+#
+# Shelves of 300-line tool scripts (every 4th button shares a script).
+# Load size / time / memory should follow the button count with
+# "external"; the body is read on first use.
+# ==========================
+import os
+import sys
+import gc
+import time
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shelftoolpro_core.model import ShelfModel
+from shelftoolpro_core.persistence import open_store
+from shelftoolpro_core.bodies import BodyStore, bodies_dir_for
+
+SIZES = [100, 2000]
+TABS = 10
+SCRIPT_LINES = 300
+
+
+def script(n):
+    return "\n".join(f"    local v{i} = {n} * {i} -- step {i} of tool {n}" for i in range(SCRIPT_LINES))
+
+
+def build_model(buttons):
+    model = ShelfModel()
+    per_tab = buttons // TABS
+    for t in range(TABS):
+        model.add_tab(f"Tab {t}", [{
+            "title": f"Tool {t}-{i}", "icon": "", "shortcut": "", "ID": None,
+            "command": script((t * per_tab + i) // 4),
+        } for i in range(per_tab)])
+    return model
+
+
+def measure(path, bodies):
+    gc.collect()
+    tracemalloc.start()
+    t = time.perf_counter()
+    model = open_store(path, bodies=bodies).load()
+    load_ms = (time.perf_counter() - t) * 1000
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return model, load_ms, memory
+
+
+def main():
+    results = {}
+    print(f"{'buttons':>8} {'mode':<9} {'file KB':>9} {'bodies KB':>10} {'load ms':>9} {'memory MB':>10} {'1st click ms':>13}")
+    with tempfile.TemporaryDirectory() as folder:
+        for buttons in SIZES:
+            for mode in ("inline", "external"):
+                path = os.path.join(folder, f"{mode}-{buttons}", "shelves.json")
+                os.makedirs(os.path.dirname(path))
+                bodies = BodyStore(bodies_dir_for(path)) if mode == "external" else None
+                open_store(path, bodies=bodies).save(build_model(buttons))
+
+                body_bytes = 0
+                if bodies:
+                    for root, _, files in os.walk(bodies.folder):
+                        body_bytes += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+                reader = BodyStore(bodies_dir_for(path))
+                model, load_ms, memory = measure(path, reader)
+                tool = model.tabs[-1].actions[-1]
+                t = time.perf_counter()
+                text = reader.command_of(tool)
+                click_ms = (time.perf_counter() - t) * 1000
+                assert text.strip() == script((buttons - 1) // 4).strip()
+                print(f"{buttons:>8} {mode:<9} {os.path.getsize(path) / 1024:>9.0f} {body_bytes / 1024:>10.0f} "
+                      f"{load_ms:>9.2f} {memory / 1e6:>10.2f} {click_ms:>13.3f}")
+                results[f"{mode} load ms ({buttons} buttons)"] = load_ms
+    return results
+
+
+if __name__ == "__main__":
+    main()
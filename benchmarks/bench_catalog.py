@@ -0,0 +1,83 @@
+# ==========================
+# Benchmark: action catalog load (max_actions.json)
+#   python benchmarks/bench_catalog.py
+# ==========================
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shelftoolpro_core import catalog as catalog_module
+from shelftoolpro_core.catalog import load_catalog
+from shelftoolpro_core import shards as shards_module
+from shelftoolpro_core.shards import open_sharded_catalog
+
+JSON_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "max_actions.json")
+RUNS = 5
+
+
+def timed(fn):
+    best = None
+    for _ in range(RUNS):
+        t = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def main():
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        def cold():
+            catalog_module._memo.clear()
+            for name in os.listdir(cache_dir):
+                os.remove(os.path.join(cache_dir, name))
+            return load_catalog(JSON_PATH, cache_dir)
+
+        def warm():
+            catalog_module._memo.clear()
+            return load_catalog(JSON_PATH, cache_dir)
+
+        def memo():
+            return load_catalog(JSON_PATH, cache_dir)
+
+        def no_cache():
+            catalog_module._memo.clear()
+            return load_catalog(JSON_PATH, None)
+
+        print(f"{'catalog load':<28} {'best ms':>10}")
+        for label, fn in [("parse, no cache", no_cache), ("cold (parse + write cache)", cold),
+                          ("warm (pickle cache)", warm), ("in-process memo", memo)]:
+            ms, catalog = timed(fn)
+            results[label] = ms
+            print(f"{label:<28} {ms:>10.2f}")
+        print(f"  {len(catalog)} actions, {len(catalog.group_names())} groups")
+
+        def manifest():
+            shards_module._memo.clear()
+            return open_sharded_catalog(JSON_PATH, cache_dir)
+
+        def first_group():
+            sharded = manifest()
+            sharded.load_next()
+            return sharded
+
+        def all_groups():
+            sharded = manifest()
+            sharded.load_all()
+            return sharded
+
+        print(f"\n{'sharded catalog':<28} {'best ms':>10}")
+        for label, fn in [("open manifest", manifest), ("manifest + first group", first_group),
+                          ("manifest + all groups", all_groups)]:
+            ms, sharded = timed(fn)
+            results[label] = ms
+            print(f"{label:<28} {ms:>10.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# ==========================
+# Benchmark: in-memory size of the action catalog
+#   python benchmarks/bench_catalog_memory.py
+#
+# "dicts" is the old layout: the parsed max_actions.json dicts with
+# "_GroupName" / "ID" added. "records" is ActionCatalog.actions
+# (CatalogAction, interned strings). "catalog" adds the lookup indexes.
+# Sizes are what stays allocated after the JSON text has been dropped.
+# ==========================
+import os
+import sys
+import gc
+import json
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shelftoolpro_core.catalog import ActionCatalog, parse_action_command, make_action_id
+
+JSON_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "max_actions.json")
+SYNTHETIC_ACTIONS = 100_000
+SYNTHETIC_GROUPS = 200
+
+
+def read_text():
+    with open(JSON_PATH, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def synthetic_text():
+    groups = []
+    per_group = SYNTHETIC_ACTIONS // SYNTHETIC_GROUPS
+    for g in range(SYNTHETIC_GROUPS):
+        groups.append({"GroupName": f"Group {g}", "Actions": [
+            {"title": f"Action {g}-{i}", "command": f'actionMan.executeAction 0 "{g * per_group + i + 50000}"',
+             "shortcut": "", "icon": "default.png", "Cat": f"Group {g}"}
+            for i in range(per_group)]})
+    return json.dumps(groups)
+
+
+def legacy_dicts(text):
+    groups = json.loads(text)
+    actions = []
+    for group in groups:
+        for action in group.get("Actions", []):
+            action["_GroupName"] = group.get("GroupName", "")
+            if not action.get("ID"):
+                parsed = parse_action_command(action.get("command"))
+                if parsed:
+                    action["ID"] = make_action_id(*parsed)
+            actions.append(action)
+    return groups, actions
+
+
+def records(text):
+    return ActionCatalog(json.loads(text)).actions
+
+
+def catalog(text):
+    return ActionCatalog(json.loads(text))
+
+
+def retained(build, text):
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    result = build(text)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    results = {}
+    print(f"{'catalog':<22} {'actions':>8} {'dicts MB':>9} {'records MB':>11} {'catalog MB':>11} {'saved':>7}")
+    for label, text in (("max_actions.json", read_text()), ("synthetic 100k", synthetic_text())):
+        count = len(ActionCatalog(json.loads(text)))
+        old = retained(legacy_dicts, text)
+        new = retained(records, text)
+        full = retained(catalog, text)
+        print(f"{label:<22} {count:>8} {old / 1e6:>9.2f} {new / 1e6:>11.2f} {full / 1e6:>11.2f} "
+              f"{(1 - new / old) * 100:>6.0f}%")
+        results[f"{label} records MB"] = new / 1e6
+    return results
+
+
+if __name__ == "__main__":
+    main()
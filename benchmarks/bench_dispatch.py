@@ -0,0 +1,50 @@
+# ==========================
+# Benchmark: per-click command dispatch cost
+#   python benchmarks/bench_dispatch.py
+#
+# Runs against shelftoolpro_core.fake_runtime, whose execute() tokenizes
+# the script text as a stand-in for the MAXScript parser. Absolute numbers
+# are not 3ds Max numbers; the ratio between the paths is what matters.
+# ==========================
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shelftoolpro_core.dispatch import CommandDispatcher
+from shelftoolpro_core.fake_runtime import FakeRuntime
+
+CLICKS = 20000
+
+
+def per_click(fn, command):
+    t = time.perf_counter()
+    for _ in range(CLICKS):
+        fn(command)
+    return (time.perf_counter() - t) / CLICKS * 1e6
+
+
+def main():
+    action = 'actionMan.executeAction 0 "40714"'
+    # No globals: an assignment would be a local inside the compiled function
+    script = "\n".join(f'box pos:[{i},0,0] name:"obj{i}" -- line {i}' for i in range(200))
+
+    results = {}
+    print(f"{'path':<40} {'us/click':>10}")
+    for label, command in [("catalog action", action), ("200-line script", script)]:
+        rt = FakeRuntime()
+        baseline = per_click(lambda c: rt.execute(c.strip()), command)
+        dispatcher = CommandDispatcher(FakeRuntime())
+        dispatcher.prepare(command)
+        optimized = per_click(dispatcher.run, command)
+        name = "direct actionMan" if "executeAction" in command else "compiled-once cache"
+        print(f"{label + ': rt.execute every click':<40} {baseline:>10.2f}")
+        print(f"{label + ': ' + name:<40} {optimized:>10.2f}")
+        print(f"  {dispatcher.stats()}")
+        results[f"{label} us/click"] = optimized
+    return results
+
+
+if __name__ == "__main__":
+    main()
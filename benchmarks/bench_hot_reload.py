@@ -0,0 +1,62 @@
+# ==========================
+# Benchmark: hot reload diff (diff_models) at 1k and 100k buttons
+#   python benchmarks/bench_hot_reload.py
+#
+# "widgets touched" is what the dock updates; a full reload would rebuild
+# every button of every shown tab.
+# ==========================
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shelftoolpro_core.model import ShelfModel
+from shelftoolpro_core.diff import diff_models
+
+SIZES = [1000, 100000]
+TABS = 10
+
+
+def build_dict(buttons):
+    per_tab = buttons // TABS
+    return {"tabs": [{"name": f"Tab {t}", "actions": [{
+        "title": f"Tool {t}-{i}",
+        "icon": f"C:/icons/tool_{i % 50}.png",
+        "command": f'actionMan.executeAction 0 "{40000 + i}"',
+        "shortcut": "",
+        "ID": str(40000 + i),
+    } for i in range(per_tab)]} for t in range(TABS)]}
+
+
+def edited(data):
+    tabs = data["tabs"]
+    tabs[0]["actions"][5]["title"] += " (v2)"
+    tabs[1]["actions"].insert(3, dict(tabs[1]["actions"][0], title="New Tool", ID="99999", command=""))
+    del tabs[2]["actions"][7]
+    tabs[3]["name"] = "Renamed"
+    tabs.append({"name": "Pipeline", "actions": []})
+    return data
+
+
+def main():
+    results = {}
+    print(f"{'buttons':>8} {'parse+model ms':>15} {'diff ms':>9} {'changes':>8}")
+    for buttons in SIZES:
+        old = ShelfModel.from_dict(build_dict(buttons))
+        t = time.perf_counter()
+        new = ShelfModel.from_dict(edited(build_dict(buttons)))
+        build_ms = (time.perf_counter() - t) * 1000
+        t = time.perf_counter()
+        changes = diff_models(old, new)
+        diff_ms = (time.perf_counter() - t) * 1000
+        for op, payload in changes:
+            old.apply(op, payload)
+        assert old.to_dict() == new.to_dict()
+        print(f"{buttons:>8} {build_ms:>15.2f} {diff_ms:>9.2f} {len(changes):>8}")
+        results[f"diff ms ({buttons} buttons)"] = diff_ms
+    return results
+
+
+if __name__ == "__main__":
+    main()
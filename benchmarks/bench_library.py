@@ -0,0 +1,60 @@
+# ==========================
+# Benchmark: studio shelf library (ShelfLibrary) sync + load
+#   python benchmarks/bench_library.py
+#
+# The "share" is a local temp folder, so these are the CPU / local disk
+# costs; on a real network share every stat and read adds a round trip,
+# which is why only "updated" reads the source file.
+# ==========================
+import os
+import sys
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shelftoolpro_core.library import ShelfLibrary
+
+SOURCES = 4
+TOOLS_PER_SOURCE = 1000
+
+
+def write_source(path, version):
+    tabs = [{"name": f"Studio {os.path.basename(path)} {t}", "actions": [
+        {"title": f"Tool {t}-{i} v{version}", "icon": "", "command": f'print "{t}-{i}"', "shortcut": "", "ID": None}
+        for i in range(TOOLS_PER_SOURCE // 10)]} for t in range(10)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"tabs": tabs}, f, indent=4)
+
+
+def timed(label, fn):
+    t = time.perf_counter()
+    result = fn()
+    ms = (time.perf_counter() - t) * 1000
+    print(f"{label:<34} {ms:>8.2f} ms  {sorted(set(result.values())) if isinstance(result, dict) else len(result)}")
+    return ms
+
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        share = os.path.join(folder, "share")
+        os.makedirs(share)
+        sources = [os.path.join(share, f"s{n}.json") for n in range(SOURCES)]
+        for path in sources:
+            write_source(path, 1)
+        cache_dir = os.path.join(folder, "cache")
+
+        library = ShelfLibrary(sources, cache_dir, revalidate_s=300)
+        results = {}
+        results["first sync ms"] = timed("first sync (copy all)", library.sync)
+        results["sync within interval ms"] = timed("sync within interval", library.sync)
+        results["revalidate ms"] = timed("revalidate, nothing changed", lambda: library.sync(force=True))
+        write_source(sources[0], 2)
+        timed("revalidate, one source changed", lambda: library.sync(force=True))
+        results["load ms"] = timed("load local copies", library.load)
+    return results
+
+
+if __name__ == "__main__":
+    main()
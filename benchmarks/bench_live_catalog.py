@@ -0,0 +1,58 @@
+# ==========================
+# Benchmark: live catalog refresh from actionMan
+#   python benchmarks/bench_live_catalog.py
+#
+# Uses fake action tables holding every action of max_actions.json plus
+# synthetic plugin tables. Real pymxs calls cost more than these Python
+# attribute calls; the full vs incremental ratio is what matters.
+# ==========================
+import os
+import sys
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shelftoolpro_core.fake_runtime import FakeActionMan, FakeActionTable, FakeActionItem, fake_tables_from_catalog
+from shelftoolpro_core.live_catalog import build_live_catalog
+
+JSON_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "max_actions.json")
+PLUGIN_TABLES = 40
+PLUGIN_ITEMS = 50
+
+
+def make_action_man():
+    with open(JSON_PATH, "r", encoding="utf-8") as f:
+        tables = fake_tables_from_catalog(json.load(f))
+    for t in range(PLUGIN_TABLES):
+        tables.append(FakeActionTable(1000 + t, f"Plugin {t}", [
+            FakeActionItem(i, f"Plugin {t} Action {i}", f"Plugin {t}") for i in range(PLUGIN_ITEMS)]))
+    return FakeActionMan(tables)
+
+
+def timed(label, fn):
+    t = time.perf_counter()
+    stats = fn()
+    ms = (time.perf_counter() - t) * 1000
+    print(f"{label:<32} {ms:>9.2f} ms  {stats}")
+    return ms
+
+
+def main():
+    action_man = make_action_man()
+    with tempfile.TemporaryDirectory() as folder:
+        json_path = os.path.join(folder, "max_actions_live.json")
+        state_path = os.path.join(folder, "live_catalog_state.json")
+        results = {}
+        results["full build ms"] = timed("full build", lambda: build_live_catalog(action_man, json_path, state_path))
+        results["refresh ms"] = timed("refresh, nothing changed",
+                                      lambda: build_live_catalog(action_man, json_path, state_path))
+        action_man.tables[-1].items.append(FakeActionItem(999, "New Plugin Action", "Plugin New"))
+        timed("refresh, one table changed", lambda: build_live_catalog(action_man, json_path, state_path))
+        timed("forced full refresh", lambda: build_live_catalog(action_man, json_path, state_path, force=True))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# ==========================
+# Benchmark: MacroScript bulk import (5,000 .mcr files)
+#   python benchmarks/bench_macro_import.py
+# ==========================
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shelftoolpro_core import macroscript
+from shelftoolpro_core.macroscript import MacroImporter, macros_to_tabs
+
+FILES = 5000
+CATEGORIES = 40
+
+MACRO = '''-- Generated tool {n}
+macroScript Tool{n}
+    category:"Studio {cat}"
+    buttonText:"Tool {n}"
+    tooltip:"Does thing {n} (fast)"
+    icon:#("Standard", {icon})
+(
+    /* a longer body, like real tools */
+    local objs = for o in selection where isKindOf o GeometryClass collect o
+    if objs.count == 0 then messageBox "Select geometry first (tool {n})"
+    else
+    (
+        undo "Tool {n}" on
+        (
+            for o in objs do ( o.pivot = o.center; resetXForm o; collapseStack o )
+        )
+    )
+)
+'''
+
+
+def write_tree(root):
+    for n in range(FILES):
+        folder = os.path.join(root, f"cat{n % CATEGORIES:02d}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"tool{n:05d}.mcr"), "w", encoding="utf-8") as f:
+            f.write(MACRO.format(n=n, cat=n % CATEGORIES, icon=n % 30 + 1) * 2)
+
+
+def timed(label, fn):
+    t = time.perf_counter()
+    result = fn()
+    result["seconds"] = time.perf_counter() - t
+    print(f"{label:<36} {result['seconds']:>7.2f} s  parsed {result['parsed']:>5}  "
+          f"skipped {result['skipped']:>5}  macros {len(result['macros'])}")
+    return result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        root = os.path.join(folder, "macros")
+        write_tree(root)
+        index = os.path.join(folder, "macro_import.json")
+
+        result = timed("cold import, process pool", lambda: MacroImporter(index).import_tree(root))
+        t = time.perf_counter()
+        tabs = macros_to_tabs(result["macros"])
+        print(f"{'macros -> tabs':<36} {time.perf_counter() - t:>7.2f} s  {len(tabs)} tabs")
+        results = {"cold import s": result["seconds"]}
+        unchanged = timed("re-import, nothing changed", lambda: MacroImporter(index).import_tree(root))
+        results["re-import unchanged s"] = unchanged["seconds"]
+
+        paths = macroscript.find_macro_files(root)
+        for path in paths[:500]:
+            os.utime(path, None)
+        timed("re-import, 500 touched (same hash)", lambda: MacroImporter(index).import_tree(root))
+        for path in paths[:50]:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("\n-- edited\n")
+        timed("re-import, 50 edited", lambda: MacroImporter(index).import_tree(root))
+
+        python = macroscript.python_executable
+        macroscript.python_executable = lambda: None
+        try:
+            timed("cold import, threads (no python.exe)", lambda: MacroImporter(None).import_tree(root))
+        finally:
+            macroscript.python_executable = python
+    return results
+
+
+if __name__ == "__main__":
+    main()
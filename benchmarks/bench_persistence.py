@@ -0,0 +1,75 @@
+# ==========================
+# Benchmark: shelf save / load at 10, 1k and 100k buttons
+#   python benchmarks/bench_persistence.py
+# ==========================
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shelftoolpro_core.model import ShelfModel
+from shelftoolpro_core.persistence import open_store, STORAGE_SNAPSHOT, STORAGE_JOURNAL
+
+SIZES = [10, 1000, 100000]
+TABS = 10
+
+
+def build_model(buttons):
+    model = ShelfModel()
+    per_tab = max(1, buttons // TABS)
+    for t in range(min(TABS, buttons)):
+        model.add_tab(f"Tab {t}", [{
+            "title": f"Tool {t}-{i}",
+            "icon": f"C:/icons/tool_{i % 50}.png",
+            "command": f'actionMan.executeAction 0 "{40000 + i}"',
+            "shortcut": "",
+            "ID": str(40000 + i),
+        } for i in range(per_tab)])
+    model.mark_saved()
+    return model
+
+
+def bench(buttons, mode, folder):
+    path = os.path.join(folder, f"shelves-{mode}-{buttons}.json")
+    model = build_model(buttons)
+    store = open_store(path, mode)
+
+    t = time.perf_counter()
+    store.save(model)
+    full_save = time.perf_counter() - t
+
+    # One edit after the first save: what a debounced save writes.
+    store = open_store(path, mode)
+    model = store.load()
+    store.attach(model)
+    tab = model.tabs[0]
+    model.update_action(tab.name, tab.actions[0], {"title": "Renamed"})
+    t = time.perf_counter()
+    store.save(model)
+    edit_save = time.perf_counter() - t
+
+    t = time.perf_counter()
+    open_store(path, mode).load()
+    load = time.perf_counter() - t
+    size_kb = os.path.getsize(path) / 1024
+    print(f"{buttons:>8} {mode:<9} {full_save * 1000:>12.2f} {edit_save * 1000:>12.2f}"
+          f" {load * 1000:>10.2f} {size_kb:>10.0f}")
+    return edit_save * 1000, load * 1000
+
+
+def main():
+    print(f"{'buttons':>8} {'storage':<9} {'save ms':>12} {'1 edit ms':>12} {'load ms':>10} {'file KB':>10}")
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for buttons in SIZES:
+            for mode in (STORAGE_SNAPSHOT, STORAGE_JOURNAL):
+                edit_ms, load_ms = bench(buttons, mode, folder)
+                results[f"{mode} 1 edit ms ({buttons} buttons)"] = edit_ms
+                results[f"{mode} load ms ({buttons} buttons)"] = load_ms
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# ==========================
+# Benchmark: tools that run a script file (ScriptFileCache)
+#   python benchmarks/bench_script_files.py
+#
+# Cost of resolving a 300-line .py tool per click: re-reading and
+# compiling it every time vs the cache within the TTL, on a click or after
+# the TTL (one stat) and after the file changed (read + compile).
+# ==========================
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shelftoolpro_core.script_files import ScriptFileCache
+
+CLICKS = 2000
+SCRIPT_LINES = 300
+
+
+def script(version):
+    return "\n".join(f"v{i} = {version} * {i}  # step {i}" for i in range(SCRIPT_LINES)) + "\n"
+
+
+def per_click_us(fn):
+    t = time.perf_counter()
+    for i in range(CLICKS):
+        fn(i)
+    return (time.perf_counter() - t) / CLICKS * 1e6
+
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "tool.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(script(0))
+
+        def uncached(_):
+            with open(path, "r", encoding="utf-8") as f:
+                compile(f.read(), path, "exec")
+
+        cache = ScriptFileCache()
+        cache.get(path, now=0.0)
+        rows = [("read + compile every click", per_click_us(uncached), CLICKS, CLICKS)]
+
+        stats, reads = cache.stats, cache.reads
+        us = per_click_us(lambda i: cache.get(path, now=1.0))
+        rows.append(("cached, within TTL", us, cache.stats - stats, cache.reads - reads))
+
+        stats, reads = cache.stats, cache.reads
+        us = per_click_us(lambda i: cache.get(path, now=10.0 + i * cache.ttl_s))
+        rows.append(("click, or TTL expired (stat)", us, cache.stats - stats, cache.reads - reads))
+
+        def changed(i):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(script(i + 1))
+            os.utime(path, ns=(i * 10 ** 9, i * 10 ** 9))
+            cache.get(path, now=1e6 + i * cache.ttl_s)
+
+        stats, reads = cache.stats, cache.reads
+        us = per_click_us(changed)
+        rows.append(("file changed (write+read+compile)", us, cache.stats - stats, cache.reads - reads))
+
+        print(f"{'case':<36} {'us/click':>9} {'stats':>7} {'reads':>7}")
+        for name, us, stats, reads in rows:
+            print(f"{name:<36} {us:>9.2f} {stats:>7} {reads:>7}")
+    return {"cached us/click": rows[1][1], "TTL expired us/click": rows[2][1]}
+
+
+if __name__ == "__main__":
+    main()
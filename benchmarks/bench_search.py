@@ -0,0 +1,72 @@
+# ==========================
+# Benchmark: Add Tool search, per-keystroke latency
+#   python benchmarks/bench_search.py
+# ==========================
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shelftoolpro_core.catalog import load_catalog
+from shelftoolpro_core.search import SearchIndex, SearchSession
+
+QUERIES = ["toggle snap", "tgl snp", "render", "select object", "xyz"]
+
+
+def synthetic_catalog(actions, count, seed=42):
+    rng = random.Random(seed)
+    words = sorted({w for a in actions for w in a.get("title", "").split()})
+    groups = sorted({a["_GroupName"] for a in actions})
+    result = []
+    for i in range(count):
+        group = rng.choice(groups)
+        result.append({
+            "title": " ".join(rng.choice(words) for _ in range(rng.randint(1, 4))),
+            "command": f'actionMan.executeAction 0 "{100000 + i}"',
+            "_GroupName": group,
+        })
+    return result
+
+
+def linear_scan(actions, text):
+    # What _populate_actions did before the index.
+    text = text.lower()
+    return [a for a in actions if text in a.get("title", "").lower()]
+
+
+def bench(name, actions):
+    t = time.perf_counter()
+    index = SearchIndex(actions)
+    build = time.perf_counter() - t
+    print(f"\n{name}: {len(actions)} actions, index build {build * 1000:.1f} ms")
+    print(f"  {'query':<14} {'linear/key':>12} {'index/key':>12} {'worst key':>12} {'hits':>7}")
+    worst = 0.0
+    for query in QUERIES:
+        session = SearchSession(index)
+        linear = []
+        keyed = []
+        for i in range(1, len(query) + 1):
+            t = time.perf_counter()
+            linear_scan(actions, query[:i])
+            linear.append(time.perf_counter() - t)
+            t = time.perf_counter()
+            hits = session.search(query[:i])
+            keyed.append(time.perf_counter() - t)
+        print(f"  {query!r:<14} {sum(linear) / len(linear) * 1000:>9.2f} ms"
+              f" {sum(keyed) / len(keyed) * 1000:>9.2f} ms {max(keyed) * 1000:>9.2f} ms {len(hits):>7}")
+        worst = max(worst, max(keyed) * 1000)
+    return worst
+
+
+def main():
+    catalog = load_catalog(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                        "max_actions.json"), cache_dir=None)
+    actions = catalog.actions
+    return {"max_actions.json worst key ms": bench("max_actions.json", actions),
+            "synthetic 100k worst key ms": bench("synthetic", synthetic_catalog(actions, 100000))}
+
+
+if __name__ == "__main__":
+    main()
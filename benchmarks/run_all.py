@@ -0,0 +1,48 @@
+# ==========================
+# Run every benchmark (no 3ds Max, no Qt needed)
+#   python benchmarks/run_all.py
+#
+# Exits with status 1 when a result is over its budget, so a CI box
+# catches regressions. Budgets are a few times a typical run: a slow
+# machine passes, an accidental O(n) per keystroke / click does not.
+# ==========================
+import os
+import runpy
+
+BENCHMARKS = ["bench_catalog.py", "bench_catalog_memory.py", "bench_live_catalog.py", "bench_library.py", "bench_search.py", "bench_persistence.py", "bench_bodies.py", "bench_script_files.py", "bench_hot_reload.py", "bench_macro_import.py", "bench_dispatch.py"]
+
+# benchmark -> {result name: upper limit} (ms / us / MB / s as in the name)
+BUDGETS = {
+    "bench_catalog.py": {"warm (pickle cache)": 50.0, "open manifest": 10.0},
+    "bench_catalog_memory.py": {"synthetic 100k records MB": 45.0},
+    "bench_live_catalog.py": {"refresh ms": 100.0},
+    "bench_library.py": {"sync within interval ms": 1.0, "revalidate ms": 20.0},
+    "bench_search.py": {"max_actions.json worst key ms": 10.0, "synthetic 100k worst key ms": 50.0},
+    "bench_persistence.py": {"journal 1 edit ms (100000 buttons)": 10.0},
+    "bench_bodies.py": {"external load ms (2000 buttons)": 100.0},
+    "bench_script_files.py": {"cached us/click": 5.0, "TTL expired us/click": 50.0},
+    "bench_hot_reload.py": {"diff ms (100000 buttons)": 250.0},
+    "bench_macro_import.py": {"re-import unchanged s": 1.0},
+    "bench_dispatch.py": {"catalog action us/click": 20.0, "200-line script us/click": 20.0},
+}
+
+
+def main():
+    folder = os.path.dirname(os.path.abspath(__file__))
+    over = []
+    for name in BENCHMARKS:
+        print(f"\n===== {name} =====")
+        results = runpy.run_path(os.path.join(folder, name))["main"]() or {}
+        for key, limit in BUDGETS.get(name, {}).items():
+            if results[key] > limit:
+                over.append(f"{name}: {key} = {results[key]:.2f}, budget {limit}")
+    if over:
+        print("\n[ERROR] Over budget:")
+        for line in over:
+            print(f"  {line}")
+        raise SystemExit(1)
+    print("\n[INFO] All benchmarks within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,81 @@
 # IMAN SHIRANI
 # 2026 V0.0.3
 # ==========================
+import time
+_IMPORT_START = time.perf_counter()
+
 import sys
 import os
-import json
-import ast
+
+# shelftoolpro_core/ sits next to this file; Scripts/ is not always on sys.path
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
 import pymxs
 import configparser
 import webbrowser
-import platform
+from collections import OrderedDict
+
+from shelftoolpro_core.catalog import load_catalog, split_action_id, parse_action_command, make_action_id
+from shelftoolpro_core.shards import open_sharded_catalog
+from shelftoolpro_core.live_catalog import build_live_catalog
+from shelftoolpro_core.library import ShelfLibrary, split_sources, SOURCE_UPDATED, DEFAULT_REVALIDATE_S
+from shelftoolpro_core.diff import diff_models
+from shelftoolpro_core.watch import FileWatcher, stat_paths
+from shelftoolpro_core.macroscript import MacroImporter, macros_to_tabs, macro_definitions, reimport_fields
+from shelftoolpro_core.bodies import BodyStore, InlineBodies, bodies_dir_for, COMMANDS_INLINE, COMMANDS_EXTERNAL
+from shelftoolpro_core.script_files import ScriptFileCache, SCRIPT_PYTHON, maxscript_call
+from shelftoolpro_core.search import SearchIndex, SearchSession
+from shelftoolpro_core.model import ShelfModel, ShelfTab, MOST_USED_TAB, RESERVED_TAB_NAMES
+from shelftoolpro_core.persistence import open_store, STORAGE_SNAPSHOT, STORAGE_JOURNAL, JOURNAL_SUFFIX
+from shelftoolpro_core.dispatch import CommandDispatcher
+from shelftoolpro_core.tracing import TRACER, traced, enable_from_env
+from shelftoolpro_core.telemetry import ToolTelemetry, tool_key, command_tool_key, DEFAULT_SLOW_MS
+from shelftoolpro_core.usage import UsageStore
+from shelftoolpro_core.shortcuts import ShortcutRegistry, normalize_shortcut
+from shelftoolpro_core.macro import is_macro, make_macro, new_uid, uid_index, macro_steps, macro_script
+
+SAVE_DELAY_MS = 400  # one save per burst of edits
+STATS_CHECK_MS = 5000  # how often tool stats / usage batches are checked for a flush
+WATCH_POLL_MS = 500  # hot reload: how often shelves.json / settings.ini are stat'ed
+
+# Catalog loading: whole max_actions.json, or a manifest + one shard per group
+CATALOG_FULL = "full"
+CATALOG_SHARDED = "sharded"
+# Catalog source: the shipped max_actions.json, or one built from this 3ds Max's actionMan
+CATALOG_SOURCE_FILE = "file"
+CATALOG_SOURCE_LIVE = "live"
+
+# Shelf views: one QToolButton per tool, or one painted strip per tab
+SHELF_VIEW_BUTTONS = "buttons"
+SHELF_VIEW_VIRTUAL = "virtual"
+
+DEFAULT_FOLDER = os.path.join(os.path.expanduser("~"), "Documents", "3dsMaxShelves")
+SETTINGS_PATH = os.path.join(DEFAULT_FOLDER, "settings.ini")
+
+# Tracing: settings.ini "trace = True" or SHELFTOOL_TRACE=1 (or =<trace file>)
+DEFAULT_TRACE_PATH = os.path.join(DEFAULT_FOLDER, "trace.json")
+enable_from_env(DEFAULT_TRACE_PATH)
+
+
+def enable_trace_from_settings(settings_path):
+    # Read before check_max_version(), so its span is recorded too.
+    config = configparser.ConfigParser()
+    if os.path.exists(settings_path):
+        config.read(settings_path)
+    if "Settings" not in config or TRACER.enabled:
+        return
+    settings = config["Settings"]
+    if settings.getboolean("trace", False):
+        TRACER.enable(settings.get("trace_path", DEFAULT_TRACE_PATH))
+        # Import finished before settings.ini could switch tracing on.
+        TRACER.complete("import shelftoolpro", _IMPORT_START, _IMPORT_END)
 
 # ==========================
 # Check 3ds Max Version
 # ==========================
+@traced()
 def check_max_version():
     rt = pymxs.runtime
     py_major = sys.version_info.major
@@ -31,70 +94,100 @@ def check_max_version():
 # ==========================
 def safe_import_pyside6():
     global QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QScrollArea
-    global QTabWidget, QLineEdit, QLabel, QDialog, QToolButton, QMenu, QListWidget
-    global QComboBox, QSizePolicy, QDockWidget, QFileDialog, QInputDialog, QTextEdit
-    global QIcon, QCursor, QPixmap, QAction, QShortcut, QKeySequence
-    global Qt, QSize
+    global QTabWidget, QLineEdit, QLabel, QDialog, QToolButton, QMenu, QListWidget, QListView
+    global QComboBox, QDockWidget, QFileDialog, QInputDialog, QTextEdit, QStyle
+    global QAbstractScrollArea, QStyleOptionToolButton, QToolTip, QTableWidget, QTableWidgetItem, QHeaderView
+    global QIcon, QCursor, QPixmap, QImage, QAction, QShortcut, QKeySequence, QPainter
+    global Qt, QSize, QRect, QEvent, QAbstractListModel, QAbstractProxyModel, QModelIndex, QTimer
+    global QObject, Signal, QRunnable, QThreadPool
 
     from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QScrollArea,
-                                   QTabWidget, QLineEdit, QLabel, QDialog, QToolButton, QMenu, QListWidget,
-                                   QComboBox, QSizePolicy, QDockWidget, QFileDialog, QInputDialog, QTextEdit )
-    from PySide6.QtGui import QIcon, QCursor, QPixmap, QAction, QShortcut, QKeySequence
-    from PySide6.QtCore import Qt, QSize
+                                   QTabWidget, QLineEdit, QLabel, QDialog, QToolButton, QMenu, QListWidget, QListView,
+                                   QComboBox, QDockWidget, QFileDialog, QInputDialog, QTextEdit, QStyle,
+                                   QAbstractScrollArea, QStyleOptionToolButton, QToolTip,
+                                   QTableWidget, QTableWidgetItem, QHeaderView )
+    from PySide6.QtGui import QIcon, QCursor, QPixmap, QImage, QAction, QShortcut, QKeySequence, QPainter
+    from PySide6.QtCore import (Qt, QSize, QRect, QEvent, QAbstractListModel, QAbstractProxyModel, QModelIndex, QTimer,
+                                QObject, Signal, QRunnable, QThreadPool)
 
 # ==========================
 # EXECUTION FLOW
 # ==========================
-
-check_max_version()
+# The version check talks to 3ds Max, so it runs from main(), not on import.
 safe_import_pyside6()
 
 
 # ==========================
 # Helper to run max command (With Debug)
 # ==========================
-def run_max_command(command):
-    rt = pymxs.runtime
+# actionMan commands are called directly; scripts are compiled once per session
+DISPATCHER = CommandDispatcher(pymxs.runtime)
+# Per-tool counts / latency / errors, flushed to disk in batches by ShelfTool
+TELEMETRY = ToolTelemetry()
+# Launches / additions per tool (frecency), same batching
+USAGE = UsageStore()
+# Tools that run a .ms / .py file: contents + compiled form per (path, size, mtime)
+SCRIPT_FILES = ScriptFileCache()
+
+def run_max_command(command, tool=None):
     if isinstance(command, str):
         command = command.strip()
         print(f"[RUNNING COMMAND] {command}")
+        error = None
+        start = time.perf_counter()
         try:
-            rt.execute(command)
+            DISPATCHER.run(command)
         except Exception as e:
+            error = e
             print(f"[ERROR running command]: {e}")
+        TELEMETRY.record(tool_key(tool) if tool else command_tool_key(command),
+                         (time.perf_counter() - start) * 1000, error, tool.get("title", "") if tool else "")
+
+def run_script_file(path, tool=None):
+    error = None
+    start = time.perf_counter()
+    try:
+        # A click always stats the file: an edit saved just now is run.
+        script, replaced = SCRIPT_FILES.get(path, fresh=True)
+        if replaced is not None:
+            DISPATCHER.invalidate(replaced)
+        print(f"[RUNNING SCRIPT FILE] {path}")
+        if script.kind == SCRIPT_PYTHON:
+            if script.error is not None:
+                raise script.error
+            exec(script.code, {"__name__": "__main__", "__file__": path})
+        else:
+            DISPATCHER.run(script.text)
+    except Exception as e:
+        error = e
+        print(f"[ERROR running script file]: {e}")
+    TELEMETRY.record(tool_key(tool) if tool else "file:" + os.path.normcase(path),
+                     (time.perf_counter() - start) * 1000, error, tool.get("title", "") if tool else "")
+
 # Helper to trigger actionMan actions by ID
-def trigger_action(action_id, context_id=0):
+def trigger_action(action_id, context_id=None, tool=None):
     rt = pymxs.runtime
+    if context_id is None:
+        context_id, action_id = split_action_id(action_id)
+    error = None
+    start = time.perf_counter()
     try:
         print(f"[TRIGGERING ACTION ID] {action_id}")
         rt.actionMan.executeAction(context_id, str(action_id))
     except Exception as e:
+        error = e
         print(f"[ERROR triggering action]: {e}")
+    TELEMETRY.record(tool_key(tool) if tool else str(action_id),
+                     (time.perf_counter() - start) * 1000, error, tool.get("title", "") if tool else "")
 
 
 
-# ==========================
-# Find Action Data
-# ==========================
-def _find_action_data(self, action_name):
-    for group in self.action_list:
-        if 'Actions' in group:
-            for action in group['Actions']:
-                if action.get('Desc') == action_name:
-                    # Make sure 'title' exists
-                    if 'title' not in action or not action['title']:
-                        action['title'] = action.get('Desc', 'Unknown Action')
-
-                    # Make sure 'command' exists
-                    if 'command' not in action:
-                        if 'ID' in action:
-                            action["command"] = 'actionMan.executeAction 0 "{}"'.format(action["ID"])
-                        else:
-                            action['command'] = ''  # fallback empty if no ID
-
-                    return action
-    return None
-    
+def exec_dialog(dialog, span_name, start):
+    # The span covers building the dialog, not the time it stays open.
+    TRACER.complete(span_name, start, time.perf_counter())
+    return dialog.exec()
+
+
 # ==========================
 # Additional: Run Script from Editor
 # ==========================
@@ -114,6 +207,464 @@ def add_run_script_button(layout, command_edit):
     run_script_button.clicked.connect(lambda: run_script_from_editor(command_edit))
     layout.addWidget(run_script_button)
     
+# ==========================
+# Shared Icon Cache (background decoding)
+# ==========================
+ICON_CACHE_SIZE = 512
+ICON_DECODE_THREADS = 2
+
+
+class _IconSignals(QObject):
+    # (path, size, mtime or None, QImage or None); queued to the UI thread
+    decoded = Signal(str, int, object, object)
+
+
+class _IconDecodeTask(QRunnable):
+    # Runs on the worker pool: stat + QImage decode + scale, never QPixmap.
+    def __init__(self, signals, path, size, known_keys):
+        super().__init__()
+        self.signals = signals
+        self.path = path
+        self.size = size
+        self.known_keys = known_keys
+
+    def run(self):
+        image = None
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime is not None and (self.path, self.size, mtime) not in self.known_keys:
+            image = QImage(self.path)
+            if image.isNull():
+                mtime, image = None, None
+            elif image.width() > self.size or image.height() > self.size:
+                image = image.scaled(self.size, self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.signals.decoded.emit(self.path, self.size, mtime, image)
+
+
+class IconCache(QObject):
+    """Process-wide LRU of decoded icons keyed by (path, size, mtime).
+
+    request_*() returns at once: the cached image, or a placeholder while
+    the file is stat'ed and decoded on a worker thread; `callback` receives
+    the real icon / pixmap on the UI thread. Missing or unreadable files are
+    cached too, so a shelf of 'default.png' buttons touches the disk once.
+    revalidate_all() makes the next request for each icon stat its file
+    again (a rebuilt page picks up an edited icon); an unchanged file is not
+    decoded again.
+    """
+
+    def __init__(self, max_entries=ICON_CACHE_SIZE, parent=None):
+        super().__init__(parent)
+        self.max_entries = max_entries
+        self._pixmaps = OrderedDict()   # (path, size, mtime) -> QPixmap (null = unreadable)
+        self._resolved = {}             # (path, size) -> current key
+        self._waiting = {}              # (path, size) -> [callbacks]
+        self._checked = {}              # (path, size) -> generation of the last stat
+        self._generation = 0
+        self._signals = _IconSignals()
+        self._signals.decoded.connect(self._on_decoded)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(ICON_DECODE_THREADS)
+        self._placeholder = None
+
+    def placeholder(self):
+        if self._placeholder is None:
+            self._placeholder = QApplication.style().standardIcon(QStyle.SP_FileIcon)
+        return self._placeholder
+
+    def _cached(self, path, size):
+        key = self._resolved.get((path, size))
+        if key is not None and key in self._pixmaps:
+            self._pixmaps.move_to_end(key)
+            return self._pixmaps[key]
+        return None
+
+    def revalidate_all(self):
+        self._generation += 1
+
+    def _request(self, path, size, callback, revalidate):
+        pixmap = self._cached(path, size)
+        stale = self._checked.get((path, size)) != self._generation
+        if pixmap is not None and not revalidate and not stale:
+            return pixmap
+        waiters = self._waiting.get((path, size))
+        if waiters is not None:
+            waiters.append(callback)
+            return pixmap
+        self._waiting[(path, size)] = [callback]
+        self._checked[(path, size)] = self._generation
+        # Key snapshot lets the worker skip decoding an unchanged file.
+        known = frozenset(k for k in self._pixmaps if k[0] == path and k[1] == size)
+        self._pool.start(_IconDecodeTask(self._signals, path, size, known))
+        return pixmap
+
+    def request_icon(self, path, size, callback):
+        pixmap = self._request(path, size, lambda p: callback(QIcon(p)), revalidate=False)
+        if pixmap is None:
+            return self.placeholder()
+        return QIcon(pixmap)
+
+    def request_pixmap(self, path, size, callback, revalidate=True):
+        # Previews revalidate: the file may have just been edited.
+        return self._request(path, size, callback, revalidate)
+
+    def _on_decoded(self, path, size, mtime, image):
+        key = (path, size, mtime)
+        if image is not None:
+            self._pixmaps[key] = QPixmap.fromImage(image)
+        elif key not in self._pixmaps:
+            self._pixmaps[key] = QPixmap()
+        self._pixmaps.move_to_end(key)
+        while len(self._pixmaps) > self.max_entries:
+            old_key, _ = self._pixmaps.popitem(last=False)
+            if self._resolved.get(old_key[:2]) == old_key:
+                del self._resolved[old_key[:2]]
+                self._checked.pop(old_key[:2], None)
+        self._resolved[(path, size)] = key
+
+        pixmap = self._pixmaps[key]
+        for callback in self._waiting.pop((path, size), []):
+            try:
+                callback(pixmap)
+            except RuntimeError:
+                pass  # the button / label was deleted meanwhile
+
+
+_icon_cache = None
+
+def icon_cache():
+    global _icon_cache
+    if _icon_cache is None:
+        _icon_cache = IconCache()
+    return _icon_cache
+
+
+def set_button_icon(button, icon_path, size):
+    if not icon_path:
+        button.setIcon(QIcon())
+        return
+    button.setIcon(icon_cache().request_icon(icon_path, size, button.setIcon))
+
+
+def set_preview_pixmap(label, path):
+    def show(pixmap):
+        if not pixmap.isNull():
+            label.setPixmap(pixmap)
+        else:
+            label.clear()
+    pixmap = icon_cache().request_pixmap(path, 100, show) if path else None
+    if pixmap is not None:
+        show(pixmap)
+
+
+# ==========================
+# Background disk checks (hot reload, studio library)
+# ==========================
+class _TaskSignals(QObject):
+    # (result, exception or None); queued to the UI thread
+    finished = Signal(object, object)
+
+
+class _BackgroundTask(QRunnable):
+    # Runs fn(*args) on a worker pool; fn must not touch widgets or the model.
+    def __init__(self, signals, fn, *args):
+        super().__init__()
+        self.signals = signals
+        self.fn = fn
+        self.args = args
+
+    def run(self):
+        try:
+            result, error = self.fn(*self.args), None
+        except Exception as e:
+            result, error = None, e
+        self.signals.finished.emit(result, error)
+
+
+# ==========================
+# Action List Model (Add Tool dialog)
+# ==========================
+class ActionListModel(QAbstractListModel):
+    # Read-only view over the shared catalog list; one row per catalog action.
+    # The list only grows (sharded loading); call sync() after it did.
+    def __init__(self, actions, parent=None):
+        super().__init__(parent)
+        self._actions = actions
+        self._count = len(actions)
+
+    def sync(self):
+        if len(self._actions) > self._count:
+            self.beginInsertRows(QModelIndex(), self._count, len(self._actions) - 1)
+            self._count = len(self._actions)
+            self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        action = self._actions[index.row()]
+        if role == Qt.DisplayRole:
+            return action.get('title', 'Unknown')
+        if role == Qt.ToolTipRole:
+            return f"{action.get('_GroupName', '')}\n{action.get('command', '')}"
+        if role == Qt.UserRole:
+            return action.get('ID')
+        return None
+
+
+class ActionFilterProxy(QAbstractProxyModel):
+    # Shows a ranked subset of the source rows. Filtering swaps one list of
+    # row numbers; no per-row objects are created, and the view only asks for
+    # the rows that are actually on screen.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._proxy_rows = None
+
+    def set_rows(self, rows):
+        # A layout change, not a reset: the view keeps its scroll position,
+        # and the current / selected rows (persistent indexes) move to where
+        # their actions are now, or go away if they were filtered out.
+        self.layoutAboutToBeChanged.emit()
+        old_rows = self._rows
+        self._rows = rows
+        self._proxy_rows = None
+        persistent = self.persistentIndexList()
+        if persistent:
+            moved = []
+            for index in persistent:
+                row = self._proxy_row(old_rows[index.row()]) if index.row() < len(old_rows) else None
+                moved.append(QModelIndex() if row is None else self.createIndex(row, 0))
+            self.changePersistentIndexList(persistent, moved)
+        self.layoutChanged.emit()
+
+    def _proxy_row(self, source_row):
+        if self._proxy_rows is None:
+            self._proxy_rows = {row: i for i, row in enumerate(self._rows)}
+        return self._proxy_rows.get(source_row)
+
+    def source_row(self, proxy_index):
+        if not proxy_index.isValid() or proxy_index.row() >= len(self._rows):
+            return None
+        return self._rows[proxy_index.row()]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or column != 0 or not 0 <= row < len(self._rows):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        row = self.source_row(proxy_index)
+        if row is None:
+            return QModelIndex()
+        return self.sourceModel().index(row, 0)
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = self._proxy_row(source_index.row())
+        return QModelIndex() if row is None else self.createIndex(row, 0)
+
+
+# ==========================
+# Virtualized Shelf Strip (shelf_view = virtual)
+# ==========================
+class ShelfStripView(QAbstractScrollArea):
+    """One widget for a whole tab: paints only the tools that are on screen.
+
+    Cells are fixed-width (button_base_width) so the visible range is plain
+    arithmetic on the scroll offset; clicks and right-clicks are hit-tested
+    here and handed to the callbacks with the tool's dict. One style option
+    object is reused for every cell.
+    """
+
+    def __init__(self, tab, icon_size, cell_width, spacing, on_click, on_context_menu, parent=None):
+        super().__init__(parent)
+        self.tab = tab
+        self.icon_size = icon_size
+        self.cell_width = max(cell_width, icon_size + 8)
+        self.spacing = spacing
+        self.on_click = on_click
+        self.on_context_menu = on_context_menu
+        self._icons = {}
+        self._hover = -1
+        self._pressed = -1
+        self._option = QStyleOptionToolButton()
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.viewport().setMouseTracking(True)
+        self.horizontalScrollBar().setSingleStep(self.cell_width // 2)
+
+    # ==========================
+    # Geometry
+    # ==========================
+    def _cell_height(self):
+        return self.icon_size + self.fontMetrics().height() + 12
+
+    def _pitch(self):
+        return self.cell_width + self.spacing
+
+    def _cell_rect(self, index):
+        x = index * self._pitch() - self.horizontalScrollBar().value()
+        return QRect(x, 0, self.cell_width, self._cell_height())
+
+    def index_at(self, pos):
+        x = pos.x() + self.horizontalScrollBar().value()
+        index, offset = divmod(x, self._pitch())
+        if offset >= self.cell_width or pos.y() > self._cell_height() or not 0 <= index < len(self.tab.actions):
+            return -1
+        return index
+
+    def sizeHint(self):
+        return QSize(self._pitch() * 4, self._cell_height() + self.horizontalScrollBar().sizeHint().height())
+
+    def _update_scrollbar(self):
+        total = max(0, len(self.tab.actions) * self._pitch() - self.spacing)
+        bar = self.horizontalScrollBar()
+        bar.setPageStep(self.viewport().width())
+        bar.setRange(0, max(0, total - self.viewport().width()))
+
+    def refresh(self):
+        # Call after the tab's tools changed (add / edit / delete).
+        self._icons.clear()
+        self._hover = self._pressed = -1
+        self._update_scrollbar()
+        self.viewport().update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbar()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    # ==========================
+    # Painting
+    # ==========================
+    def _icon(self, action_data):
+        path = action_data.get("icon")
+        if not path:
+            return None
+        icon = self._icons.get(path)
+        if icon is None:
+            def ready(new_icon, path=path):
+                self._icons[path] = new_icon
+                self.viewport().update()
+            icon = self._icons[path] = icon_cache().request_icon(path, self.icon_size, ready)
+        return icon
+
+    def paintEvent(self, event):
+        actions = self.tab.actions
+        if not actions:
+            return
+        painter = QPainter(self.viewport())
+        pitch = self._pitch()
+        scroll = self.horizontalScrollBar().value()
+        first = max(0, scroll // pitch)
+        last = min(len(actions) - 1, (scroll + self.viewport().width()) // pitch)
+
+        option = self._option
+        style = self.style()
+        for index in range(first, last + 1):
+            action_data = actions[index]
+            option.initFrom(self.viewport())
+            option.rect = self._cell_rect(index)
+            option.text = action_data.get("title", "Unknown")
+            option.iconSize = QSize(self.icon_size, self.icon_size)
+            option.icon = self._icon(action_data) or QIcon()
+            option.toolButtonStyle = Qt.ToolButtonTextUnderIcon
+            option.subControls = QStyle.SC_ToolButton
+            option.features = QStyleOptionToolButton.ToolButtonFeature.None_
+            option.state = QStyle.State_Enabled | QStyle.State_AutoRaise
+            if index == self._hover:
+                option.state |= QStyle.State_MouseOver | QStyle.State_Raised
+            if index == self._pressed:
+                option.state |= QStyle.State_Sunken
+            option.activeSubControls = QStyle.SC_ToolButton if index == self._hover else QStyle.SC_None
+            style.drawComplexControl(QStyle.CC_ToolButton, option, painter, self.viewport())
+        painter.end()
+
+    # ==========================
+    # Mouse
+    # ==========================
+    def _set_hover(self, index):
+        if index != self._hover:
+            self._hover = index
+            self.viewport().update()
+
+    def mouseMoveEvent(self, event):
+        self._set_hover(self.index_at(event.position().toPoint()))
+
+    def leaveEvent(self, event):
+        self._set_hover(-1)
+        super().leaveEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._pressed = self.index_at(event.position().toPoint())
+            self.viewport().update()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return
+        index = self.index_at(event.position().toPoint())
+        pressed, self._pressed = self._pressed, -1
+        self.viewport().update()
+        if index != -1 and index == pressed:
+            self.on_click(self.tab.actions[index])
+
+    def contextMenuEvent(self, event):
+        index = self.index_at(event.pos())
+        if index != -1:
+            self.on_context_menu(self.tab.actions[index])
+
+    def viewportEvent(self, event):
+        if event.type() == QEvent.ToolTip:
+            index = self.index_at(event.pos())
+            if index != -1:
+                QToolTip.showText(event.globalPos(), self.tab.actions[index].get("title", ""), self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().viewportEvent(event)
+
+
+# ==========================
+# Lazy Tab Page
+# ==========================
+class LazyTabPage(QWidget):
+    # Empty page until the tab is first shown; see ShelfTool._ensure_tab_built
+    # generated = read-only page not backed by the shelf model (Most Used)
+    # studio = source of a read-only studio library tab (ShelfLibrary)
+    def __init__(self, tab, parent=None, generated=False, studio=None):
+        super().__init__(parent)
+        self.tab = tab
+        self.built = False
+        self.generated = generated
+        self.studio = studio
+        self.usage_revision = None
+        QVBoxLayout(self)
+
+    @property
+    def read_only(self):
+        return self.generated or self.studio is not None
+
+
 # ==========================
 # Main Shelf Tool
 # ==========================
@@ -124,12 +675,27 @@ class ShelfTool(QWidget):
 
         
         # Load settings
-        default_folder = os.path.join(os.path.expanduser("~"), "Documents", "3dsMaxShelves")
-        self.settings_path = os.path.join(default_folder, "settings.ini")
-        self.shelves_save_path = os.path.join(default_folder, "shelves.json") 
+        self.settings_path = SETTINGS_PATH
+        self.shelves_save_path = os.path.join(DEFAULT_FOLDER, "shelves.json") 
         self.icon_size = 32
         self.button_base_width = 80
         self.button_spacing = 5
+        self.release_hidden_tabs = True
+        self.shelf_view = SHELF_VIEW_BUTTONS
+        self.storage_mode = STORAGE_SNAPSHOT
+        self.journal_compact_kb = 256
+        self.trace_enabled = False
+        self.trace_path = DEFAULT_TRACE_PATH
+        self.slow_tool_ms = DEFAULT_SLOW_MS
+        self.most_used_tab = True
+        self.most_used_count = 20
+        self.catalog_loading = CATALOG_SHARDED
+        self.catalog_source = CATALOG_SOURCE_FILE
+        self.studio_shelves = ""
+        self.studio_revalidate_s = DEFAULT_REVALIDATE_S
+        self.hot_reload = True
+        self.command_storage = COMMANDS_INLINE
+        # trace / trace_path are applied by enable_trace_from_settings() in main()
         self.load_settings_from_ini()
 
         self.layout = QVBoxLayout(self)
@@ -138,25 +704,82 @@ class ShelfTool(QWidget):
 
         self.hidden_tabs = {}
         self.tab_toolbars = {}
-        self.action_list = []
-
-        
+        self.studio_tabs = {}
+        self._studio_revision = 0
+        self.model = ShelfModel()
+        self.store = None
+        self.bodies = BodyStore(bodies_dir_for(self.shelves_save_path))
+        self.catalog = None
+        self.shards = None
+        self._all_actions = []
+        self._search_index = None
+        self._action_model = None
+        self._uid_index = {}
+        self._uid_index_key = None
+
+        # Debounced save: edits mark the model dirty, one write per burst
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._flush_pending_save)
+        QApplication.instance().aboutToQuit.connect(self._flush_pending_save)
+        QApplication.instance().aboutToQuit.connect(self._export_trace)
+
+        # Tool stats: clicks only touch memory, the file is written in batches
+        TELEMETRY.filepath = os.path.join(os.path.dirname(self.settings_path), "tool_stats.json")
+        TELEMETRY.slow_ms = self.slow_tool_ms
+        TELEMETRY.load()
+        USAGE.filepath = os.path.join(os.path.dirname(self.settings_path), "usage.json")
+        USAGE.load()
+        self._stats_timer = QTimer(self)
+        self._stats_timer.setInterval(STATS_CHECK_MS)
+        self._stats_timer.timeout.connect(self._flush_tool_stats)
+        self._stats_timer.start()
+        QApplication.instance().aboutToQuit.connect(lambda: self._flush_tool_stats(force=True))
+
+        # Hot reload: shelf file / settings.ini changed by someone else
+        # (the stat calls run on a worker, a slow disk never blocks the UI)
+        self._watcher = FileWatcher()
+        self._watch_timer = QTimer(self)
+        self._watch_timer.setInterval(WATCH_POLL_MS)
+        self._watch_timer.timeout.connect(self._poll_watched_files)
+        self._watch_pool = QThreadPool(self)
+        self._watch_pool.setMaxThreadCount(1)
+        self._watch_signals = _TaskSignals()
+        self._watch_signals.finished.connect(self._on_watched_files_statted)
+        self._watch_busy = False
+
+        # Shelf shortcuts: one registry, one QShortcut per key in use
+        self._qshortcuts = {}
+        self.shortcuts = ShortcutRegistry(self._add_qshortcut, self._remove_qshortcut)
 
         self._load_actions()
         self._add_tab_manager_buttons()
 
         self.tab_widget.tabBar().setContextMenuPolicy(Qt.CustomContextMenu)
         self.tab_widget.tabBar().customContextMenuRequested.connect(self._show_tab_context_menu)
-
-        if os.path.exists(self.shelves_save_path):
-            self.load_shelves_from_file(self.shelves_save_path)
-        else:
-            self.save_shelves_to_file(self.shelves_save_path)
-            
-    
-
-
-
+        self.tab_widget.currentChanged.connect(self._on_current_tab_changed)
+
+        # Studio shelves: startup shows the local copies, the share is
+        # revalidated right after and then every studio_revalidate_s.
+        self.library = None
+        self._library_timer = QTimer(self)
+        self._library_timer.timeout.connect(self._revalidate_library)
+        # The share is stat'ed / read on a worker; tabs reload on the UI thread
+        self._library_pool = QThreadPool(self)
+        self._library_pool.setMaxThreadCount(1)
+        self._library_signals = _TaskSignals()
+        self._library_signals.finished.connect(self._on_library_synced)
+        self._library_syncing = None
+        self._open_library()
+
+        # Startup only reads; the file is first written by the first edit.
+        self.load_shelves_from_file(self.shelves_save_path)
+        self._watch_files()
+
+        if TRACER.enabled:
+            print(TRACER.summary("startup", since=_IMPORT_START, until=time.perf_counter()))
+            self._export_trace()
 
 
     # ==========================
@@ -172,6 +795,29 @@ class ShelfTool(QWidget):
                 self.icon_size = int(settings.get("icon_size", self.icon_size))
                 self.button_base_width = int(settings.get("button_base_width", self.button_base_width))
                 self.button_spacing = int(settings.get("button_spacing", self.button_spacing))
+                self.release_hidden_tabs = settings.getboolean("release_hidden_tabs", self.release_hidden_tabs)
+                self.shelf_view = settings.get("shelf_view", self.shelf_view)
+                self.storage_mode = settings.get("storage_mode", self.storage_mode)
+                self.journal_compact_kb = int(settings.get("journal_compact_kb", self.journal_compact_kb))
+                self.trace_enabled = settings.getboolean("trace", self.trace_enabled)
+                self.trace_path = settings.get("trace_path", self.trace_path)
+                self.slow_tool_ms = float(settings.get("slow_tool_ms", self.slow_tool_ms))
+                self.most_used_tab = settings.getboolean("most_used_tab", self.most_used_tab)
+                self.most_used_count = int(settings.get("most_used_count", self.most_used_count))
+                self.catalog_loading = settings.get("catalog_loading", self.catalog_loading)
+                self.catalog_source = settings.get("catalog_source", self.catalog_source)
+                self.studio_shelves = settings.get("studio_shelves", self.studio_shelves)
+                self.studio_revalidate_s = int(settings.get("studio_revalidate_s", self.studio_revalidate_s))
+                self.hot_reload = settings.getboolean("hot_reload", self.hot_reload)
+                self.command_storage = settings.get("command_storage", self.command_storage)
+
+    def _export_trace(self):
+        try:
+            path = TRACER.export()
+            if path:
+                print(f"[INFO] Trace written to {path}")
+        except Exception as e:
+            print(f"[WARNING] Could not write trace: {e}")
 
     # ==========================
     # Save settings to INI
@@ -182,11 +828,27 @@ class ShelfTool(QWidget):
             "save_path": self.shelves_save_path,
             "icon_size": str(self.icon_size),
             "button_base_width": str(self.button_base_width),
-            "button_spacing": str(self.button_spacing)
+            "button_spacing": str(self.button_spacing),
+            "release_hidden_tabs": str(self.release_hidden_tabs),
+            "shelf_view": self.shelf_view,
+            "storage_mode": self.storage_mode,
+            "journal_compact_kb": str(self.journal_compact_kb),
+            "trace": str(self.trace_enabled),
+            "trace_path": self.trace_path,
+            "slow_tool_ms": str(self.slow_tool_ms),
+            "most_used_tab": str(self.most_used_tab),
+            "most_used_count": str(self.most_used_count),
+            "catalog_loading": self.catalog_loading,
+            "catalog_source": self.catalog_source,
+            "studio_shelves": self.studio_shelves,
+            "studio_revalidate_s": str(self.studio_revalidate_s),
+            "hot_reload": str(self.hot_reload),
+            "command_storage": self.command_storage
         }
         os.makedirs(os.path.dirname(self.settings_path), exist_ok=True)
         with open(self.settings_path, "w", encoding="utf-8") as configfile:
             config.write(configfile)
+        self._watcher.remember(self.settings_path)
 
     # ==========================
     # Show Tab Contex
@@ -204,39 +866,173 @@ class ShelfTool(QWidget):
     # ==========================
     # Delete Icon
     # ==========================                
-    def _delete_action(self, button, tab_name):
+    def _delete_action(self, button, tab_name, action_data):
             from PySide6.QtWidgets import QMessageBox
             reply = QMessageBox.question(self, "Delete Tool", "Are you sure you want to delete this tool?", QMessageBox.Yes | QMessageBox.No)
             if reply == QMessageBox.Yes:
+                self.model.remove_action(tab_name, action_data)
+                self.shortcuts.unbind(action_data)
                 layout = self.tab_toolbars.get(tab_name)
-                if layout:
+                if isinstance(layout, ShelfStripView):
+                    layout.refresh()
+                elif layout:
                     layout.removeWidget(button)
                     button.deleteLater()
-                    self.save_shelves_to_file(self.shelves_save_path)
 
     # ==========================
     # Load Action
     # ==========================  
-    def _load_actions(self):
+    @traced()
+    def _load_actions(self, force_live=False):
         try:
-            with open('max_actions.json', 'r', encoding='utf-8') as f:
-                self.action_list = json.load(f)
-                #print(f"[DEBUG] Loaded {len(self.action_list)} actions from max_actions.json")
+            json_path = os.path.join(SCRIPT_DIR, "max_actions.json")
+            cache_dir = os.path.join(os.path.dirname(self.settings_path), "cache")
+            if self.catalog_source == CATALOG_SOURCE_LIVE:
+                json_path = self._refresh_live_catalog(force_live) or json_path
+            if self.catalog_loading == CATALOG_SHARDED:
+                # Only the manifest is read here; groups load when needed.
+                self.shards = open_sharded_catalog(json_path, cache_dir)
+                self.catalog = self.shards.catalog
+            else:
+                self.catalog = load_catalog(json_path, cache_dir=cache_dir)
+            self._all_actions = self.catalog.actions
+            #print(f"[DEBUG] Loaded {len(self._all_actions)} actions from max_actions.json")
         except Exception as e:
             print(f"Error loading actions: {e}")
 
+    @traced()
+    def _refresh_live_catalog(self, force=False):
+        # Rebuild max_actions_live.json from actionMan; only changed tables are re-read.
+        folder = os.path.dirname(self.settings_path)
+        json_path = os.path.join(folder, "max_actions_live.json")
+        try:
+            stats = build_live_catalog(pymxs.runtime.actionMan, json_path,
+                                       os.path.join(folder, "cache", "live_catalog_state.json"), force)
+            print(f"[INFO] Live catalog: {stats['actions']} actions in {stats['tables']} tables, "
+                  f"{stats['reread']} tables re-read")
+            return json_path
+        except Exception as e:
+            print(f"[ERROR] Could not build the live catalog, using max_actions.json: {e}")
+            return None
+
+    def _reload_catalog(self, force_live=False):
+        # force_live re-reads every actionMan table instead of only the changed ones.
+        self._search_index = None
+        self._action_model = None
+        self.shards = None
+        self._load_actions(force_live)
+
     # ==========================
     # Add New Tab
     # ========================== 
+    @traced()
     def add_tab(self, tab_name, actions_data=None):
-        new_tab = QWidget()
-        new_tab_layout = QVBoxLayout(new_tab)
+        if not tab_name or self.model.tab(tab_name) is not None or tab_name in self.studio_tabs:
+            print(f"[WARNING] Tab name is empty or already exists: {tab_name!r}")
+            return
+        if tab_name in RESERVED_TAB_NAMES:
+            print(f"[WARNING] Tab name is reserved for a generated tab: {tab_name!r}")
+            return
+        tab = self.model.add_tab(tab_name, actions_data)
+        self.tab_widget.addTab(self._build_tab_widget(tab), tab_name)
+
+    def _build_tab_widget(self, tab):
+        # Only the header and an empty page exist until the tab is shown.
+        return LazyTabPage(tab)
+
+    def _on_current_tab_changed(self, index):
+        page = self.tab_widget.widget(index)
+        if isinstance(page, LazyTabPage):
+            if page.generated and page.built and page.usage_revision != USAGE.revision:
+                self._clear_tab_page(page)
+            self._ensure_tab_built(page)
+
+    def _is_read_only_tab(self, index):
+        page = self.tab_widget.widget(index)
+        if isinstance(page, LazyTabPage) and page.generated:
+            print(f"[INFO] '{page.tab.name}' is generated from usage; turn it off in Settings.")
+            return True
+        if isinstance(page, LazyTabPage) and page.studio is not None:
+            print(f"[INFO] '{page.tab.name}' is a studio shelf (read-only): {page.studio}")
+            return True
+        return False
+
+    def _clear_tab_page(self, page):
+        self.tab_toolbars.pop(page.tab.name, None)
+        self._clear_layout(page.layout())
+        page.built = False
+        # The rebuilt page shows icons edited since they were cached.
+        icon_cache().revalidate_all()
+
+    def _clear_layout(self, layout):
+        # Nested layouts too (the Add Tool / Create ... button row).
+        while layout.count():
+            item = layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+            elif item.layout():
+                self._clear_layout(item.layout())
+                item.layout().deleteLater()
+
+    # ==========================
+    # Most Used (generated from USAGE)
+    # ==========================
+    def _most_used_actions(self):
+        shelf_tools = {tool_key(a): a for tab in self._all_shelf_tabs() for a in tab.actions}
+        result = []
+        for key in USAGE.top(self.most_used_count * 2):
+            action_data = shelf_tools.get(key) or self._find_action_data(key)
+            if action_data:
+                result.append(action_data)
+                if len(result) >= self.most_used_count:
+                    break
+        return result
+
+    def _all_shelf_tabs(self):
+        # The user's tabs, then the studio library tabs.
+        return self.model.tabs + [page.tab for page in self.studio_tabs.values()]
+
+    def _add_most_used_tab(self):
+        if not self.most_used_tab or self.model.tab(MOST_USED_TAB) is not None:
+            return
+        page = LazyTabPage(ShelfTab(MOST_USED_TAB), generated=True)
+        self.tab_widget.addTab(page, MOST_USED_TAB)
+
+    def _release_tab_page(self, page):
+        if page is None:
+            return
+        if page.built:
+            self.tab_toolbars.pop(page.tab.name, None)
+        page.deleteLater()
+
+    @traced("build tab")
+    def _ensure_tab_built(self, page):
+        if page.built:
+            return
+        page.built = True
+        tab = page.tab
+        tab_name = tab.name
+        new_tab_layout = page.layout()
+        editable = not page.read_only
+        if page.generated:
+            tab.actions = self._most_used_actions()
+            page.usage_revision = USAGE.revision
+
+        if self.shelf_view == SHELF_VIEW_VIRTUAL:
+            strip = ShelfStripView(tab, self.icon_size, self.button_base_width, self.button_spacing,
+                                   self._run_tool,
+                                   (lambda action_data: self._show_action_context_menu(None, tab.name, action_data))
+                                   if editable else (lambda action_data: None))
+            new_tab_layout.addWidget(strip)
+            self.tab_toolbars[tab_name] = strip
+            if editable:
+                self._add_tab_tool_buttons(tab, new_tab_layout)
+            strip.refresh()
+            return
 
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         #scroll_area.setFixedHeight(100)
-        dock.setMinimumHeight(200)
-        dock.setMaximumHeight(200)
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
 
@@ -249,44 +1045,67 @@ class ShelfTool(QWidget):
         new_tab_layout.addWidget(scroll_area)
 
         self.tab_toolbars[tab_name] = scroll_layout
+        if editable:
+            self._add_tab_tool_buttons(tab, new_tab_layout)
 
+        for action_data in tab.actions:
+            self._create_action_button(tab, action_data, editable)
+
+    def _add_tab_tool_buttons(self, tab, new_tab_layout):
         button_layout = QHBoxLayout()
 
+        # Tab name is looked up at click time: the tab may be renamed later
         add_tool_button = QPushButton("Add Tool", self)
-        add_tool_button.clicked.connect(lambda: self._open_add_tool_dialog(tab_name))
+        add_tool_button.clicked.connect(lambda: self._open_add_tool_dialog(tab.name))
         button_layout.addWidget(add_tool_button)
 
         create_custom_tool_button = QPushButton("Create Custom Tool", self)
-        create_custom_tool_button.clicked.connect(lambda: self._open_create_custom_tool_dialog(tab_name))
+        create_custom_tool_button.clicked.connect(lambda: self._open_create_custom_tool_dialog(tab.name))
         button_layout.addWidget(create_custom_tool_button)
 
-        new_tab_layout.addLayout(button_layout)
-
-        self.tab_widget.addTab(new_tab, tab_name)
-
-        if actions_data:
-            for action_data in actions_data:
-                self._add_action_to_toolbar(tab_name, action_data)
+        create_macro_button = QPushButton("Create Macro", self)
+        create_macro_button.clicked.connect(lambda: self._open_macro_dialog(tab.name))
+        button_layout.addWidget(create_macro_button)
 
-        self.save_shelves_to_file(self.shelves_save_path)
+        new_tab_layout.addLayout(button_layout)
 
     # ==========================
     # Rename Tab
     # ==========================
     def _rename_tab(self, index):
+        if self._is_read_only_tab(index):
+            return
         old_name = self.tab_widget.tabText(index)
         new_name, ok = QInputDialog.getText(self, "Rename Tab", "Enter new tab name:", text=old_name)
-        if ok and new_name:
-            widget = self.tab_widget.widget(index)
-            self.tab_widget.removeTab(index)
-            self.tab_toolbars[new_name] = self.tab_toolbars.pop(old_name)
-            self.tab_widget.insertTab(index, widget, new_name)
-            self.save_shelves_to_file(self.shelves_save_path)
+        if ok and new_name and new_name != old_name:
+            if self.model.tab(new_name) is not None or new_name in self.studio_tabs:
+                print(f"[WARNING] Tab already exists: {new_name}")
+                return
+            if new_name in RESERVED_TAB_NAMES:
+                print(f"[WARNING] Tab name is reserved for a generated tab: {new_name}")
+                return
+            self.model.rename_tab(old_name, new_name)
+            if old_name in self.tab_toolbars:
+                self.tab_toolbars[new_name] = self.tab_toolbars.pop(old_name)
+            self.tab_widget.setTabText(index, new_name)
 
     def _add_action_to_toolbar(self, tab_name, action_data):
-        layout = self.tab_toolbars.get(tab_name)
+        tab = self.model.tab(tab_name)
+        if tab is None:
+            return
+        self.model.add_action(tab_name, action_data)
+        self.shortcuts.bind(action_data)
+        USAGE.record_add(tool_key(action_data))
+        DISPATCHER.prepare(action_data.get("command"))
+        self._create_action_button(tab, action_data)
+
+    def _create_action_button(self, tab, action_data, editable=True, index=None):
+        layout = self.tab_toolbars.get(tab.name)
         if layout is None:
             return
+        if isinstance(layout, ShelfStripView):
+            layout.refresh()
+            return
 
         button = QToolButton()
         button.setText(action_data.get("title", "Unknown"))
@@ -294,45 +1113,269 @@ class ShelfTool(QWidget):
         button.setIconSize(QSize(self.icon_size, self.icon_size))
 
         if icon_path := action_data.get("icon"):
-            button.setIcon(QIcon(icon_path))
+            set_button_icon(button, icon_path, self.icon_size)
 
-        button.setProperty("action_data", action_data)        
+        button.clicked.connect(lambda: self._run_tool(action_data))
+        if index is None:
+            layout.addWidget(button)
+        else:
+            layout.insertWidget(index, button)
+        if not editable:
+            return
 
-        def on_button_clicked():
-            action_data = button.property("action_data")
-            command = action_data.get("command", "").strip()
-            action_id = action_data.get("ID", None)
+        button.setContextMenuPolicy(Qt.CustomContextMenu)
+        button.customContextMenuRequested.connect(lambda pos, b=button: self._show_action_context_menu(b, tab.name, action_data))
 
-            if command:
-                print(f"[RUNNING COMMAND] {command}")
-                run_max_command(command)
-            elif action_id:
-                print(f"[TRIGGERING ACTION ID] {action_id}")
-                trigger_action(action_id)
-            else:
-                print("[WARNING] No command or action defined!")
+    # ==========================
+    # Shortcuts (see ShortcutRegistry)
+    # ==========================
+    def _add_qshortcut(self, key):
+        qshortcut = QShortcut(QKeySequence(key), self)
+        qshortcut.activated.connect(lambda key=key: self._dispatch_shortcut(key))
+        self._qshortcuts[key] = qshortcut
+
+    def _remove_qshortcut(self, key):
+        qshortcut = self._qshortcuts.pop(key, None)
+        if qshortcut is not None:
+            qshortcut.setEnabled(False)
+            qshortcut.deleteLater()
+
+    def _dispatch_shortcut(self, key):
+        action_data = self.shortcuts.lookup(key)
+        if action_data is not None:
+            self._run_tool(action_data)
+
+    def _add_shortcut_check(self, layout, shortcut_edit, action_data=None):
+        # Live conflict hint under the shortcut field; returns the save-time check.
+        hint = QLabel()
+        layout.addWidget(hint)
+
+        def problem():
+            text = shortcut_edit.text()
+            key = normalize_shortcut(text)
+            if key is None:
+                return f"'{text}' is not a single key combination (e.g. Ctrl+Shift+B)."
+            other = self.shortcuts.conflict(key, action_data)
+            if other is not None:
+                return f"{key} is already used by '{other.get('title', '')}'."
+            return ""
+
+        shortcut_edit.textChanged.connect(lambda: hint.setText(problem()))
+        hint.setText(problem())
+
+        def check():
+            message = problem()
+            if message:
+                from PySide6.QtWidgets import QMessageBox
+                QMessageBox.warning(self, "Shortcut", message)
+                return False
+            shortcut_edit.setText(normalize_shortcut(shortcut_edit.text()))
+            return True
+        return check
+
+    def _run_tool(self, action_data):
+        if is_macro(action_data):
+            USAGE.record_launch(tool_key(action_data))
+            self._run_macro(action_data)
+            return
+        if action_data.get("script_path"):
+            USAGE.record_launch(tool_key(action_data))
+            run_script_file(action_data["script_path"], action_data)
+            return
+        command = self.bodies.command_of(action_data).strip()
+        action_id = action_data.get("ID", None)
+        if command or action_id:
+            USAGE.record_launch(tool_key(action_data))
+
+        if command:
+            print(f"[RUNNING COMMAND] {command}")
+            run_max_command(command, action_data)
+        elif action_id:
+            print(f"[TRIGGERING ACTION ID] {action_id}")
+            trigger_action(action_id, tool=action_data)
+        else:
+            print("[WARNING] No command or action defined!")
 
+    # ==========================
+    # Macro tools
+    # ==========================
+    def _tools_by_uid(self):
+        key = (id(self.model), self.model.revision, self._studio_revision)
+        if key != self._uid_index_key:
+            self._uid_index = uid_index(self.model)
+            for page in self.studio_tabs.values():
+                for action in page.tab.actions:
+                    if action.get("uid"):
+                        self._uid_index.setdefault(action["uid"], action)
+            self._uid_index_key = key
+        return self._uid_index
+
+    def _run_macro(self, macro):
+        tools, missing = macro_steps(macro, self._tools_by_uid())
+        if missing:
+            print(f"[WARNING] Macro '{macro.get('title', '')}': {len(missing)} step(s) no longer on the shelf")
+        if not tools:
+            print("[WARNING] Macro has no steps!")
+            return
+        # Steps with out-of-line bodies or script files: load the text (only for this call).
+        replaced = SCRIPT_FILES.revalidate([t["script_path"] for t in tools if t.get("script_path")], fresh=True)
+        if replaced:
+            for text in replaced:
+                DISPATCHER.invalidate(text)
+        tools = [dict(tool, command=self._step_command(tool)) if tool.get("command_ref") or tool.get("script_path")
+                 else tool for tool in tools]
+        try:
+            script = macro_script(macro, tools)
+        except ValueError as e:
+            print(f"[ERROR] Macro '{macro.get('title', '')}': {e}")
+            return
+        # Same text every click: compiled once by DISPATCHER, one undo entry
+        run_max_command(script, macro)
 
-        button.clicked.connect(on_button_clicked)
+    def _step_command(self, tool):
+        path = tool.get("script_path")
+        if not path:
+            return self.bodies.command_of(tool)
+        try:
+            script, _ = SCRIPT_FILES.get(path)
+        except OSError as e:
+            print(f"[WARNING] Script file not found: {path} ({e})")
+            return ""
+        return maxscript_call(path) if script.kind == SCRIPT_PYTHON else script.text
+
+    def _add_script_file_row(self, layout, path=""):
+        # "Script File" field of the tool dialogs; returns the line edit.
+        script_edit = QLineEdit(path)
+        script_edit.setPlaceholderText("Optional .ms / .py file, run instead of the command")
+        browse_script_button = QPushButton("Browse Script File")
+        browse_script_button.clicked.connect(lambda: self._browse_script_file(script_edit))
+        layout.addWidget(QLabel("Script File (optional):"))
+        layout.addWidget(script_edit)
+        layout.addWidget(browse_script_button)
+        return script_edit
+
+    def _browse_script_file(self, line_edit):
+        path, _ = QFileDialog.getOpenFileName(self, "Select Script File", os.path.dirname(line_edit.text()),
+                                              "Scripts (*.ms *.mcr *.py)")
+        if path:
+            line_edit.setText(path)
 
-        # Add shortcut binding if exists
-        shortcut = action_data.get("shortcut", "").strip()
-        if shortcut:
-            qshortcut = QShortcut(QKeySequence(shortcut), button)
-            qshortcut.activated.connect(on_button_clicked)
+    def _open_macro_dialog(self, tab_name, macro=None, button=None):
+        start = time.perf_counter()
+        dialog = QDialog(self)
+        dialog.resize(600, 450)
+        dialog.setWindowTitle("Macro Tool")
+        layout = QVBoxLayout(dialog)
 
-        layout.addWidget(button)
+        title_edit = QLineEdit(macro.get("title", "") if macro else "")
+        shortcut_edit = QLineEdit(macro.get("shortcut", "") if macro else "")
+        icon_edit = QLineEdit(macro.get("icon", "") if macro else "")
+        icon_preview = QLabel()
+        icon_preview.setFixedSize(100, 100)
+        if icon_edit.text():
+            set_preview_pixmap(icon_preview, icon_edit.text())
+        browse_button = QPushButton("Browse Icon")
+        browse_button.clicked.connect(lambda: self._browse_icon(icon_edit, icon_preview))
 
-        button.setContextMenuPolicy(Qt.CustomContextMenu)
-        button.customContextMenuRequested.connect(lambda pos, b=button: self._show_action_context_menu(b, tab_name))
+        # Every shelf tool can be a step (nested macros run their own steps)
+        tools = [(tab.name, tool) for tab in self.model.tabs for tool in tab.actions if tool is not macro]
+        available_list = QListWidget()
+        for name, tool in tools:
+            available_list.addItem(f"{name} / {tool.get('title', '')}")
+
+        steps = []
+        steps_list = QListWidget()
+
+        def add_step(tool, label):
+            steps.append(tool)
+            steps_list.addItem(label)
+
+        if macro:
+            by_uid = self._tools_by_uid()
+            for uid in macro.get("steps", []):
+                tool = by_uid.get(uid)
+                if tool is not None:
+                    owner = self.model.tab_of(tool)
+                    add_step(tool, f"{owner.name if owner else '?'} / {tool.get('title', '')}")
+
+        def add_selected():
+            row = available_list.currentRow()
+            if row != -1:
+                add_step(tools[row][1], available_list.item(row).text())
+
+        def remove_selected():
+            row = steps_list.currentRow()
+            if row != -1:
+                del steps[row]
+                steps_list.takeItem(row)
+
+        def move_selected(offset):
+            row = steps_list.currentRow()
+            target = row + offset
+            if row != -1 and 0 <= target < len(steps):
+                steps.insert(target, steps.pop(row))
+                steps_list.insertItem(target, steps_list.takeItem(row))
+                steps_list.setCurrentRow(target)
+
+        available_list.itemDoubleClicked.connect(lambda item: add_selected())
+        step_buttons = QHBoxLayout()
+        for text, handler in [("Add Step", add_selected), ("Remove Step", remove_selected),
+                              ("Move Up", lambda: move_selected(-1)), ("Move Down", lambda: move_selected(1))]:
+            btn = QPushButton(text)
+            btn.clicked.connect(handler)
+            step_buttons.addWidget(btn)
+
+        def save_macro():
+            if not shortcut_ok():
+                return
+            if not steps:
+                print("[WARNING] A macro needs at least one step.")
+                return
+            # Steps are referenced by uid so they survive renames and moves
+            for tool in steps:
+                if not tool.get("uid"):
+                    owner = self.model.tab_of(tool)
+                    if owner is not None:
+                        self.model.update_action(owner.name, tool, {"uid": new_uid()})
+            uids = [tool["uid"] for tool in steps if tool.get("uid")]
+            if macro is None:
+                self._add_action_to_toolbar(tab_name, make_macro(title_edit.text(), uids,
+                                                                 icon_edit.text(), shortcut_edit.text()))
+            else:
+                self.model.update_action(tab_name, macro, {"title": title_edit.text(), "icon": icon_edit.text(),
+                                                           "shortcut": shortcut_edit.text(), "steps": uids})
+                self.shortcuts.bind(macro)
+                self._refresh_tool_widget(button, tab_name, macro)
+            dialog.accept()
+
+        save_button = QPushButton("Save Macro")
+        save_button.clicked.connect(save_macro)
+
+        layout.addWidget(QLabel("Title:"))
+        layout.addWidget(title_edit)
+        layout.addWidget(QLabel("Shelf Tools (double-click to add):"))
+        layout.addWidget(available_list)
+        layout.addLayout(step_buttons)
+        layout.addWidget(QLabel("Steps (run in order, one undo):"))
+        layout.addWidget(steps_list)
+        layout.addWidget(QLabel("Shortcut (optional):"))
+        layout.addWidget(shortcut_edit)
+        shortcut_ok = self._add_shortcut_check(layout, shortcut_edit, macro)
+        layout.addWidget(QLabel("Icon Path:"))
+        layout.addWidget(icon_edit)
+        layout.addWidget(browse_button)
+        layout.addWidget(icon_preview)
+        layout.addWidget(save_button)
+
+        exec_dialog(dialog, "dialog: macro", start)
 
-    def _show_action_context_menu(self, button, tab_name):
+    def _show_action_context_menu(self, button, tab_name, action_data):
         menu = QMenu()
         edit_action = menu.addAction("Edit Action")
         delete_action = menu.addAction("Delete Tool")
 
-        edit_action.triggered.connect(lambda: self._edit_action(button, tab_name))
-        delete_action.triggered.connect(lambda: self._delete_action(button, tab_name))
+        edit_action.triggered.connect(lambda: self._edit_action(button, tab_name, action_data))
+        delete_action.triggered.connect(lambda: self._delete_action(button, tab_name, action_data))
 
         menu.exec(QCursor.pos())
 
@@ -340,9 +1383,11 @@ class ShelfTool(QWidget):
     # ==========================
     # Edit Action Tool DIALOG
     # ========================== 
-    def _edit_action(self, button, tab_name):
-        action_data = button.property("action_data")
-
+    def _edit_action(self, button, tab_name, action_data):
+        if is_macro(action_data):
+            self._open_macro_dialog(tab_name, action_data, button)
+            return
+        start = time.perf_counter()
         dialog = QDialog(self)
         dialog.resize(500, 300)
         layout = QVBoxLayout(dialog)
@@ -350,7 +1395,7 @@ class ShelfTool(QWidget):
         # ??????
         title_edit = QLineEdit(action_data.get("title", ""))
         command_edit = QTextEdit()
-        command_edit.setPlainText(action_data.get("command", ""))
+        command_edit.setPlainText(self.bodies.command_of(action_data))
         command_edit.setMinimumHeight(100)
         shortcut_edit = QLineEdit(action_data.get("shortcut", ""))
         icon_edit = QLineEdit(action_data.get("icon", ""))
@@ -359,20 +1404,19 @@ class ShelfTool(QWidget):
 
         # ??? ????? ????
         if icon_edit.text():
-            pixmap = QPixmap(icon_edit.text())
-            if not pixmap.isNull():
-                icon_preview.setPixmap(pixmap.scaled(100, 100, Qt.KeepAspectRatio))
+            set_preview_pixmap(icon_preview, icon_edit.text())
 
         browse_button = QPushButton("Browse Icon")
         browse_button.clicked.connect(lambda: self._browse_icon(icon_edit, icon_preview))
 
         save_button = QPushButton("Save")
-        save_button.clicked.connect(lambda: self._update_action_data_full(button,
+        save_button.clicked.connect(lambda: self._update_action_data_full(button, tab_name, action_data,
                                                                            title_edit.text(),
                                                                            icon_edit.text(),
                                                                            command_edit.toPlainText(),
                                                                            shortcut_edit.text(),
-                                                                           dialog))
+                                                                           dialog, shortcut_ok,
+                                                                           script_edit.text().strip()))
 
         # ????? ????? ????
         layout.addWidget(QLabel("Title:"))
@@ -381,8 +1425,10 @@ class ShelfTool(QWidget):
         layout.addWidget(QLabel("Command (3dsMax Script or Action):"))
         layout.addWidget(command_edit)
         add_run_script_button(layout, command_edit)
+        script_edit = self._add_script_file_row(layout, action_data.get("script_path", ""))
         layout.addWidget(QLabel("Shortcut (optional):"))
         layout.addWidget(shortcut_edit)
+        shortcut_ok = self._add_shortcut_check(layout, shortcut_edit, action_data)
 
         layout.addWidget(QLabel("Icon Path:"))
         layout.addWidget(icon_edit)
@@ -392,111 +1438,156 @@ class ShelfTool(QWidget):
         layout.addWidget(save_button)
 
         dialog.setLayout(layout)
-        dialog.exec()
+        exec_dialog(dialog, "dialog: edit tool", start)
 
-    def _update_action_data_full(self, button, new_title, new_icon_path, new_command, new_shortcut, dialog):
-        action_data = button.property("action_data")
-        action_data.update({
+    def _update_action_data_full(self, button, tab_name, action_data, new_title, new_icon_path, new_command, new_shortcut, dialog, shortcut_ok=None, new_script_path=None):
+        if shortcut_ok is not None and not shortcut_ok():
+            return
+        new_shortcut = normalize_shortcut(new_shortcut) or ""
+        old_command = self.bodies.command_of(action_data)
+        if new_command != old_command:
+            DISPATCHER.invalidate(old_command)
+        fields = {
             "title": new_title,
             "icon": new_icon_path,
             "command": new_command,
             "shortcut": new_shortcut
-        })
-        button.setText(new_title)
-        button.setIcon(QIcon(new_icon_path))
-        button.setProperty("action_data", action_data)
-        self.save_shelves_to_file(self.shelves_save_path)
+        }
+        if new_script_path is not None:
+            fields["script_path"] = new_script_path
+        self.model.update_action(tab_name, action_data, fields)
+        self.shortcuts.bind(action_data)
+        self._refresh_tool_widget(button, tab_name, action_data)
         dialog.accept()
 
+    def _refresh_tool_widget(self, button, tab_name, action_data):
+        if button is not None:
+            button.setText(action_data.get("title", ""))
+            set_button_icon(button, action_data.get("icon", ""), self.icon_size)
+        elif isinstance(self.tab_toolbars.get(tab_name), ShelfStripView):
+            self.tab_toolbars[tab_name].refresh()
+
     def _browse_icon(self, line_edit, preview_label):
         path, _ = QFileDialog.getOpenFileName(self, "Select Icon", "", "Image Files (*.png *.jpg *.bmp)")
         if path:
             line_edit.setText(path)
-            pixmap = QPixmap(path)
-            if not pixmap.isNull():
-                preview_label.setPixmap(pixmap.scaled(100, 100, Qt.KeepAspectRatio))
+            set_preview_pixmap(preview_label, path)
 
     def _open_add_tool_dialog(self, tab_name):
+        start = time.perf_counter()
         dialog = QDialog(self)
         layout = QVBoxLayout(dialog)
 
         category_combo = QComboBox()
         search_edit = QLineEdit()
-        action_listbox = QListWidget()
+        action_view = QListView()
+        action_view.setUniformItemSizes(True)
 
         category_combo.addItem("All Categories")
-        categories = [group['GroupName'] for group in self.action_list if 'GroupName' in group]
-        category_combo.addItems(sorted(categories))
-
-        # ???? ???????
-        self._all_actions = []
-        for group in self.action_list:
-            for action in group.get('Actions', []):
-                action['_GroupName'] = group['GroupName']  # ????? ???? ??? ???? ?? ????
-                self._all_actions.append(action)
-
-        self._populate_actions(action_listbox, category_combo)
-
-        category_combo.currentIndexChanged.connect(lambda: self._populate_actions(action_listbox, category_combo, search_edit))
-        search_edit.textChanged.connect(lambda: self._populate_actions(action_listbox, category_combo, search_edit))
+        if self.shards is not None:
+            category_combo.addItems(sorted(self.shards.group_names()))
+        elif self.catalog:
+            category_combo.addItems(sorted(self.catalog.group_names()))
+
+        # Built once per shelf, reused by every dialog
+        if self._search_index is None:
+            self._search_index = SearchIndex(self._all_actions)
+            self._action_model = ActionListModel(self._all_actions, self)
+        self._sync_catalog_views()
+        # Often / recently used actions rank higher (USAGE frecency)
+        session = SearchSession(self._search_index, boost=self._usage_boost())
+
+        proxy = ActionFilterProxy(dialog)
+        proxy.setSourceModel(self._action_model)
+        action_view.setModel(proxy)
+
+        # Sharded catalog: groups load when picked or matched by the search
+        if self.shards is not None and not self.shards.complete:
+            search_edit.setPlaceholderText("Search all categories, or pick one")
+        self._populate_actions(proxy, category_combo, search_edit, session)
+
+        category_combo.currentIndexChanged.connect(lambda: self._populate_actions(proxy, category_combo, search_edit, session))
+        search_edit.textChanged.connect(lambda: self._populate_actions(proxy, category_combo, search_edit, session))
 
         add_button = QPushButton("Add Selected Tool")
-        add_button.clicked.connect(lambda: self._add_action_to_toolbar_from_list(tab_name, action_listbox.currentItem()) or dialog.accept())
+        add_button.clicked.connect(lambda: self._add_action_to_toolbar_from_list(tab_name, action_view.currentIndex().data(Qt.UserRole)) or dialog.accept())
 
-        for w in [category_combo, search_edit, action_listbox, add_button]:
+        for w in [category_combo, search_edit, action_view, add_button]:
             layout.addWidget(w)
 
-        dialog.exec()
+        exec_dialog(dialog, "dialog: add tool", start)
 
     # ==========================
-    # Populate Actions to Listbox
+    # Populate Actions to List View
     # ==========================
-    def _populate_actions(self, listbox, combo, search_edit=None):
+    @traced()
+    def _populate_actions(self, proxy, combo, search_edit, session):
         selected_cat = combo.currentText()
-        search_text = search_edit.text().lower() if search_edit else ""
-        
-        listbox.clear()
-        for action in self._all_actions:
-            if (selected_cat == "All Categories" or action.get('_GroupName') == selected_cat):
-                if not search_text or search_text in action.get('title', '').lower():
-                    listbox.addItem(action.get('title', 'Unknown'))
+        search_text = search_edit.text()
 
-    # ==========================
-    # Filter Actions
-    # ==========================
-    def _filter_actions(self, listbox, search_edit):
-        text = search_edit.text().lower()
-        listbox.clear()
-        for action in self.action_list:
-            if text in action.get("title", "").lower():
-                listbox.addItem(action.get("title", "Unknown"))
-
-    def _add_action_to_toolbar_from_list(self, tab_name, list_item):
-        if not list_item:
+        if self.shards is not None and not self.shards.complete:
+            if selected_cat != "All Categories":
+                pending = [] if self.shards.is_loaded(selected_cat) else [selected_cat]
+            else:
+                pending = self.shards.groups_matching(search_text)
+            for name in pending:
+                self.shards.load_group(name)
+            if pending:
+                self._refresh_search_session(session)
+
+        if session.scope_name != selected_cat:
+            rows = None if selected_cat == "All Categories" else self.catalog.group_rows(selected_cat)
+            session.set_scope(rows, selected_cat)
+
+        proxy.set_rows(session.search(search_text))
+
+    def _sync_catalog_views(self):
+        # Index / list model catch up with rows appended by shard loads.
+        if self._search_index is not None and self._search_index.size < len(self._all_actions):
+            self._search_index.add(self._all_actions[self._search_index.size:])
+            self._action_model.sync()
+
+    def _usage_boost(self):
+        return USAGE.boosts(self.catalog.row_of_id) if self.catalog else None
+
+    def _refresh_search_session(self, session):
+        self._sync_catalog_views()
+        session.boost = self._usage_boost()
+        # Forget the scope and cached results: they predate the new rows.
+        session.set_scope(None, None)
+
+    def _add_action_to_toolbar_from_list(self, tab_name, action_id):
+        if not action_id:
             return
-        action_data = self._find_action_data(list_item.text())
+        action_data = self._find_action_data(action_id)
         if action_data:
             self._add_action_to_toolbar(tab_name, action_data)
 
     # ==========================
-    # Find Action Data by Title
+    # Find Action Data by ID
     # ==========================
-    def _find_action_data(self, desc):
-        for action in self._all_actions:
-            if action.get("title", "") == desc:
-                return {
-                    "title": action.get("title", "Unknown Action"),
-                    "icon": action.get("icon", ""),
-                    "command": action.get("command", ""),
-                    "shortcut": action.get("shortcut", ""),
-                    "Cat": action.get("Cat", ""),
-                }
-        return None
+    def _find_action_data(self, action_id):
+        if self.shards is not None:
+            action = self.shards.ensure_id(action_id)
+            self._sync_catalog_views()
+        else:
+            action = self.catalog.by_id(action_id) if self.catalog else None
+        if action is None:
+            return None
+        return {
+            "title": action.get("title", "Unknown Action"),
+            "icon": action.get("icon", ""),
+            "command": action.get("command", ""),
+            "shortcut": action.get("shortcut", ""),
+            "Cat": action.get("Cat", ""),
+            "ID": action.get("ID"),
+        }
 
     # ==========================
     # Create Custom Tool DIALOG
     # ========================== 
     def _open_create_custom_tool_dialog(self, tab_name):
+        start = time.perf_counter()
         dialog = QDialog(self)
         dialog.resize(500, 300)
         layout = QVBoxLayout(dialog)
@@ -516,14 +1607,17 @@ class ShelfTool(QWidget):
         save_button = QPushButton("Create Tool")
 
         def save_custom_tool():
+            if not shortcut_ok():
+                return
             action_data = {
                 "title": title_edit.text(),
                 "command": command_edit.toPlainText(),
                 "shortcut": shortcut_edit.text(),
                 "icon": icon_edit.text()
             }
+            if script_edit.text().strip():
+                action_data["script_path"] = script_edit.text().strip()
             self._add_action_to_toolbar(tab_name, action_data)
-            self.save_shelves_to_file(self.shelves_save_path)
             dialog.accept()
 
         save_button.clicked.connect(save_custom_tool)
@@ -533,8 +1627,10 @@ class ShelfTool(QWidget):
         layout.addWidget(QLabel("Command (3dsMax Command or Script):"))        
         layout.addWidget(command_edit)
         add_run_script_button(layout, command_edit)
+        script_edit = self._add_script_file_row(layout)
         layout.addWidget(QLabel("Shortcut Key (Optional):"))
         layout.addWidget(shortcut_edit)
+        shortcut_ok = self._add_shortcut_check(layout, shortcut_edit)
         layout.addWidget(QLabel("Icon Path:"))
         layout.addWidget(icon_edit)
         layout.addWidget(browse_button)
@@ -542,14 +1638,15 @@ class ShelfTool(QWidget):
         layout.addWidget(save_button)
 
         dialog.setLayout(layout)
-        dialog.exec()
+        exec_dialog(dialog, "dialog: custom tool", start)
 
 
     def _add_tab_manager_buttons(self):
         layout = QHBoxLayout()
         for text, method in [("Add Tab", self._open_add_tab_dialog), ("Remove Tab", self._remove_current_tab),
                               ("Hide Tab", self._hide_current_tab), ("Unhide Tab", self._unhide_tab_dialog),
-                              ("Settings", self.open_settings_dialog)]:
+                              ("Import Macros", self._import_macroscripts),
+                              ("Tool Stats", self._open_tool_stats_dialog), ("Settings", self.open_settings_dialog)]:
             btn = QPushButton(text)
             btn.clicked.connect(method)
             layout.addWidget(btn)
@@ -567,19 +1664,31 @@ class ShelfTool(QWidget):
 
     def _remove_current_tab(self):
         index = self.tab_widget.currentIndex()
-        if index != -1:
+        if index != -1 and not self._is_read_only_tab(index):
             tab_name = self.tab_widget.tabText(index)
+            widget = self.tab_widget.widget(index)
+            tab = self.model.remove_tab(tab_name)
+            self.shortcuts.unbind_all(tab.actions)
             self.tab_widget.removeTab(index)
-            self.tab_toolbars.pop(tab_name, None)
-            self.save_shelves_to_file(self.shelves_save_path)
+            self._release_tab_page(widget)
 
     def _hide_current_tab(self):
         index = self.tab_widget.currentIndex()
-        if index != -1:
-            name = self.tab_widget.tabText(index)
-            widget = self.tab_widget.widget(index)
-            self.tab_widget.removeTab(index)
-            self.hidden_tabs[name] = widget
+        if index != -1 and not self._is_read_only_tab(index):
+            self._hide_tab(self.tab_widget.tabText(index))
+
+    def _hide_tab(self, name):
+        index = self.tab_widget.indexOf(self._tab_page(name))
+        widget = self.tab_widget.widget(index)
+        tab = self.model.set_tab_hidden(name, True)
+        # Tools on hidden tabs keep their shortcut text but are not bound
+        self.shortcuts.unbind_all(tab.actions)
+        self.tab_widget.removeTab(index)
+        # Hidden tabs are plain model data unless asked to keep widgets
+        if self.release_hidden_tabs:
+            self._release_tab_page(widget)
+            widget = None
+        self.hidden_tabs[name] = widget
 
     def _unhide_tab_dialog(self):
         if not self.hidden_tabs:
@@ -596,14 +1705,110 @@ class ShelfTool(QWidget):
 
     def _unhide_selected_tab(self, item):
         if item:
-            name = item.text()
-            widget = self.hidden_tabs.pop(name)
-            self.tab_widget.addTab(widget, name)
+            self._unhide_tab(item.text())
+
+    def _unhide_tab(self, name):
+        widget = self.hidden_tabs.pop(name)
+        tab = self.model.set_tab_hidden(name, False)
+        self.shortcuts.bind_all(tab.actions)
+        if widget is None:
+            widget = self._build_tab_widget(tab)
+        self.tab_widget.insertTab(self._tab_insert_index(tab), widget, name)
+
+    def _tab_page(self, name):
+        # Page of a (visible) user tab; studio / Most Used pages are not model tabs.
+        for i in range(self.tab_widget.count()):
+            page = self.tab_widget.widget(i)
+            if isinstance(page, LazyTabPage) and not page.read_only and page.tab.name == name:
+                return page
+        return None
+
+    def _tab_insert_index(self, tab):
+        # Before the next visible user tab of the model, else before the
+        # read-only pages (studio tabs, Most Used).
+        tabs = self.model.tabs
+        for later in tabs[tabs.index(tab) + 1:] if tab in tabs else []:
+            page = self._tab_page(later.name)
+            if page is not None:
+                return self.tab_widget.indexOf(page)
+        for i in range(self.tab_widget.count()):
+            page = self.tab_widget.widget(i)
+            if isinstance(page, LazyTabPage) and page.read_only:
+                return i
+        return self.tab_widget.count()
+
+    # ==========================
+    # Tool Stats
+    # ==========================
+    def _flush_tool_stats(self, force=False):
+        for store, label in [(TELEMETRY, "tool stats"), (USAGE, "usage data")]:
+            if force or store.flush_due():
+                try:
+                    store.flush()
+                except Exception as e:
+                    print(f"[WARNING] Could not save {label}: {e}")
+
+    def _open_tool_stats_dialog(self):
+        start = time.perf_counter()
+        dialog = QDialog(self)
+        dialog.resize(800, 400)
+        dialog.setWindowTitle("Tool Stats")
+        layout = QVBoxLayout(dialog)
+
+        headers = ["Tool", "Calls", "Errors", "p50 ms", "p95 ms", "Max ms", "Slow", "Last Error"]
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+
+        def fill():
+            table.setSortingEnabled(False)
+            table.setRowCount(len(TELEMETRY.tools))
+            for row, (key, stats) in enumerate(TELEMETRY.tools.items()):
+                values = [stats.title or key, stats.count, stats.errors,
+                          round(stats.percentile(0.5), 2), round(stats.percentile(0.95), 2), round(stats.max_ms, 2),
+                          "yes" if TELEMETRY.is_slow(stats) else "", stats.last_error]
+                for column, value in enumerate(values):
+                    item = QTableWidgetItem()
+                    item.setData(Qt.DisplayRole, value)
+                    if column == 0:
+                        item.setToolTip(key)
+                    table.setItem(row, column, item)
+            table.setSortingEnabled(True)
+            table.sortItems(4, Qt.DescendingOrder)
+
+        def export_stats():
+            path, _ = QFileDialog.getSaveFileName(dialog, "Export Tool Stats", "tool_stats.json", "JSON Files (*.json)")
+            if path:
+                try:
+                    TELEMETRY.export(path)
+                    print(f"[INFO] Tool stats exported to {path}")
+                except Exception as e:
+                    print(f"[ERROR] Could not export tool stats: {e}")
+
+        def reset_stats():
+            TELEMETRY.reset()
+            fill()
+
+        fill()
+        layout.addWidget(QLabel(f"Tools with p95 latency above {self.slow_tool_ms:g} ms are flagged as slow."))
+        layout.addWidget(table)
+
+        button_layout = QHBoxLayout()
+        for text, handler in [("Refresh", fill), ("Export JSON...", export_stats), ("Reset", reset_stats)]:
+            btn = QPushButton(text)
+            btn.clicked.connect(handler)
+            button_layout.addWidget(btn)
+        layout.addLayout(button_layout)
+
+        exec_dialog(dialog, "dialog: tool stats", start)
 
     # ==========================
     # Open Settings Dialog 
     # ==========================
     def open_settings_dialog(self):
+        start = time.perf_counter()
         dialog = QDialog(self)
         dialog.resize(500, 300)
         dialog.setWindowTitle("Settings")
@@ -639,20 +1844,90 @@ class ShelfTool(QWidget):
         layout.addWidget(QLabel("Settings INI Path:"))
         layout.addWidget(settings_path_edit)
         layout.addWidget(browse_ini_button)
-        
+
+        # Shelf View
+        view_combo = QComboBox()
+        view_combo.addItems([SHELF_VIEW_BUTTONS, SHELF_VIEW_VIRTUAL])
+        view_combo.setCurrentText(self.shelf_view)
+        layout.addWidget(QLabel("Shelf View (virtual = one painted strip per tab, for very large shelves):"))
+        layout.addWidget(view_combo)
+
+        # Slow Tool Threshold
+        slow_tool_edit = QLineEdit(f"{self.slow_tool_ms:g}")
+        layout.addWidget(QLabel("Slow Tool Threshold (p95 ms, Tool Stats):"))
+        layout.addWidget(slow_tool_edit)
+
+        # Storage Mode
+        storage_combo = QComboBox()
+        storage_combo.addItems([STORAGE_SNAPSHOT, STORAGE_JOURNAL])
+        storage_combo.setCurrentText(self.storage_mode)
+        layout.addWidget(QLabel("Storage Mode (journal = append edits, for large / remote shelf files):"))
+        layout.addWidget(storage_combo)
+
+        # Command Storage
+        commands_combo = QComboBox()
+        commands_combo.addItems([COMMANDS_INLINE, COMMANDS_EXTERNAL])
+        commands_combo.setCurrentText(self.command_storage)
+        layout.addWidget(QLabel("Script Storage (external = long scripts in bodies/, loaded on first use):"))
+        layout.addWidget(commands_combo)
+
+        # Catalog Source
+        source_combo = QComboBox()
+        source_combo.addItems([CATALOG_SOURCE_FILE, CATALOG_SOURCE_LIVE])
+        source_combo.setCurrentText(self.catalog_source)
+        layout.addWidget(QLabel("Action Catalog (live = built from this 3ds Max, incl. plugins):"))
+        layout.addWidget(source_combo)
+        refresh_catalog_button = QPushButton("Refresh Catalog from 3ds Max")
+
+        def refresh_catalog():
+            self.catalog_source = CATALOG_SOURCE_LIVE
+            source_combo.setCurrentText(CATALOG_SOURCE_LIVE)
+            self._reload_catalog(force_live=True)
+
+        refresh_catalog_button.clicked.connect(refresh_catalog)
+        layout.addWidget(refresh_catalog_button)
+
+        # Studio Shelves
+        studio_edit = QLineEdit(self.studio_shelves)
+        studio_edit.setPlaceholderText(r"\\server\shelves\studio.json; ...")
+        layout.addWidget(QLabel("Studio Shelves (read-only shelf files, separated by ';'):"))
+        layout.addWidget(studio_edit)
+        studio_interval_edit = QLineEdit(str(self.studio_revalidate_s))
+        layout.addWidget(QLabel("Studio Shelves Check Interval (s):"))
+        layout.addWidget(studio_interval_edit)
 
         # Save Button
         save_button = QPushButton("Save Settings")
         
         def save_all_settings():
+            look = (self.icon_size, self.button_base_width, self.button_spacing, self.shelf_view)
             self.icon_size = int(icon_size_edit.text())
             self.button_base_width = int(base_width_edit.text())
             self.button_spacing = int(button_spacing_edit.text())
             self.shelves_save_path = path_edit.text()
+            self.shelf_view = view_combo.currentText()
+            self.slow_tool_ms = float(slow_tool_edit.text())
+            TELEMETRY.slow_ms = self.slow_tool_ms
+            if source_combo.currentText() != self.catalog_source:
+                self.catalog_source = source_combo.currentText()
+                self._reload_catalog()
+            studio_interval = int(studio_interval_edit.text())
+            if studio_edit.text().strip() != self.studio_shelves or studio_interval != self.studio_revalidate_s:
+                self.studio_shelves = studio_edit.text().strip()
+                self.studio_revalidate_s = studio_interval
+                self._open_library()
+                self._reload_studio_tabs()
+            if (storage_combo.currentText(), commands_combo.currentText()) != (self.storage_mode, self.command_storage):
+                self.storage_mode = storage_combo.currentText()
+                self.command_storage = commands_combo.currentText()
+                self._set_store(self._open_store(self.shelves_save_path))
             self.save_settings_to_ini()
             self.save_shelves_to_file(self.shelves_save_path)
             self.settings_path = settings_path_edit.text()
             self.save_settings_to_ini()
+            self._watch_files()
+            if (self.icon_size, self.button_base_width, self.button_spacing, self.shelf_view) != look:
+                self._rebuild_built_pages()
             dialog.accept()
 
         save_button.clicked.connect(save_all_settings)
@@ -661,6 +1936,11 @@ class ShelfTool(QWidget):
         
         
 
+        cache_stats = DISPATCHER.stats()
+        layout.addWidget(QLabel(f"Command cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                                f"({cache_stats['entries']}/{cache_stats['max_entries']} scripts), "
+                                f"{cache_stats['direct']} direct action calls"))
+
         # ==========================
         # About Section
         # ==========================
@@ -673,7 +1953,7 @@ class ShelfTool(QWidget):
         layout.addWidget(donate_button)
 
         dialog.setLayout(layout)
-        dialog.exec()
+        exec_dialog(dialog, "dialog: settings", start)
 
     # ==========================
     # Save Settings
@@ -704,42 +1984,427 @@ class ShelfTool(QWidget):
     # ==========================
     # Save Shelves To File
     # ==========================
+    @traced()
     def save_shelves_to_file(self, filepath):
-        data = {"tabs": []}
-        for i in range(self.tab_widget.count()):
-            tab_name = self.tab_widget.tabText(i)
-            actions = []
-            layout = self.tab_toolbars.get(tab_name)
-            if layout:
-                for j in range(layout.count()):
-                    button = layout.itemAt(j).widget()
-                    if isinstance(button, QToolButton):
-                        action_data = button.property("action_data")
-                        actions.append({
-                            "title": action_data.get("title", ""),
-                            "icon": action_data.get("icon", ""),
-                            "command": action_data.get("command", ""),
-                            "shortcut": action_data.get("shortcut", ""),
-                            "ID": action_data.get("ID", None)
-                        })
-            data["tabs"].append({"name": tab_name, "actions": actions})
-
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
-        print(f"Shelves saved successfully to {filepath}")
+        self._save_timer.stop()
+        if self.store is None or self.store.filepath != filepath:
+            self._set_store(self._open_store(filepath))
+        try:
+            self.store.save(self.model)
+            self._watcher.remember(filepath)
+            self._watcher.remember(filepath + JOURNAL_SUFFIX)
+            print(f"Shelves saved successfully to {filepath}")
+        except Exception as e:
+            print(f"[ERROR] Could not save shelves: {e}")
+
+    def _on_model_changed(self, op, **payload):
+        # Restarting the timer coalesces a burst of edits into one write.
+        self._save_timer.start()
 
+    def _flush_pending_save(self):
+        if self.model.dirty:
+            self.save_shelves_to_file(self.shelves_save_path)
+
+    def hideEvent(self, event):
+        # Closing the dock hides this widget; don't leave edits unsaved.
+        self._flush_pending_save()
+        self._flush_tool_stats(force=True)
+        self._export_trace()
+        super().hideEvent(event)
+
+    def _set_model(self, model):
+        if self.store is not None:
+            self.store.detach(self.model)
+        self.model.remove_listener(self._on_model_changed)
+        self.model = model
+        self.model.add_listener(self._on_model_changed)
+        if self.store is not None:
+            self.store.attach(self.model)
+
+    def _open_store(self, filepath):
+        # Out-of-line script bodies are read from the shelf file's bodies/
+        # folder in any mode; command_storage "external" also writes there,
+        # "inline" writes the scripts of such tools back into the shelf file.
+        if self.bodies.folder != bodies_dir_for(filepath):
+            self.bodies = BodyStore(bodies_dir_for(filepath))
+        bodies = self.bodies if self.command_storage == COMMANDS_EXTERNAL else InlineBodies(self.bodies)
+        return open_store(filepath, self.storage_mode, self.journal_compact_kb * 1024, bodies)
+
+    def _set_store(self, store):
+        # Storage mode: "snapshot" rewrites shelves.json, "journal" appends
+        # each edit to shelves.json.journal and compacts past a size limit.
+        if self.store is not None:
+            self.store.detach(self.model)
+        self.store = store
+        self.store.attach(self.model)
+
+    def _catalog_id(self, action_data):
+        if self.shards is not None:
+            # Catalog commands carry their ID: no shard has to be loaded.
+            parsed = parse_action_command(action_data.get("command"))
+            if parsed and make_action_id(*parsed) in self.shards.manifest["ids"]:
+                return make_action_id(*parsed)
+            return None
+        action = self.catalog.by_command(action_data.get("command"))
+        return action.get("ID") if action else None
+
+    def _fill_catalog_ids(self, actions, tab_name=None):
+        # Older shelves were saved with "ID": null for catalog actions. With
+        # `tab_name` the IDs go through self.model, so they are saved (and
+        # journaled) like any edit; without it a detached model is filled.
+        if not self.catalog:
+            return
+        for action_data in actions:
+            if action_data.get("ID"):
+                continue
+            action_id = self._catalog_id(action_data)
+            if not action_id:
+                continue
+            if tab_name is None:
+                action_data["ID"] = action_id
+            else:
+                self.model.update_action(tab_name, action_data, {"ID": action_id})
 
+    @traced()
     def load_shelves_from_file(self, filepath):
+        store = self._open_store(filepath)
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            for tab in data.get("tabs", []):
-                self.add_tab(tab["name"], tab.get("actions", []))
+            model = store.load()
             print(f"Shelves loaded from {filepath}")
         except Exception as e:
             print(f"Error loading shelves: {e}")
+            model = ShelfModel()
+        self._set_store(store)
+        self._set_model(model)
+        for tab in model.tabs:
+            self._fill_catalog_ids(tab.actions, tab.name)
+            DISPATCHER.prepare_all(tab.actions)
+            if tab.hidden:
+                self.hidden_tabs[tab.name] = None
+            else:
+                self.shortcuts.bind_all(tab.actions)
+                self.tab_widget.addTab(self._build_tab_widget(tab), tab.name)
+        self._add_studio_tabs()
+        self._add_most_used_tab()
+
+    # ==========================
+    # Hot reload (see FileWatcher / diff_models)
+    # ==========================
+    def _watch_files(self):
+        for path in self._watcher.paths():
+            self._watcher.remove(path)
+        if not self.hot_reload:
+            self._watch_timer.stop()
+            return
+        for path in (self.shelves_save_path, self.shelves_save_path + JOURNAL_SUFFIX, self.settings_path):
+            self._watcher.add(path)
+        self._watch_timer.start()
+
+    def _poll_watched_files(self):
+        # One stat pass at a time: a stalled share skips ticks, not piles up.
+        if self._watch_busy:
+            return
+        self._watch_busy = True
+        self._watch_pool.start(_BackgroundTask(self._watch_signals, stat_paths, self._watcher.paths()))
 
+    def _on_watched_files_statted(self, keys, error):
+        self._watch_busy = False
+        if error is not None or not self.hot_reload:
+            return
+        changed = self._watcher.poll(keys=keys)
+        if not changed:
+            return
+        if self.settings_path in changed:
+            self._hot_reload_settings()
+        if self.shelves_save_path in changed or self.shelves_save_path + JOURNAL_SUFFIX in changed:
+            self._hot_reload_shelves()
+
+    @traced()
+    def _hot_reload_shelves(self, store=None):
+        # `store` is a new shelf file (save_path changed): it is adopted even
+        # when it holds the same shelves. False if it could not be read.
+        switching = store is not None
+        if store is None:
+            store = self._open_store(self.shelves_save_path)
+        try:
+            model = store.load()
+        except Exception as e:
+            print(f"[WARNING] Could not reload shelves (keeping the current ones): {e}")
+            return False
+        # IDs the running model filled in must not show up as changes.
+        for tab in model.tabs:
+            self._fill_catalog_ids(tab.actions)
+        changes = diff_models(self.model, model)
+        if not changes:
+            if switching:
+                self._set_store(store)
+            return True
+        if self.model.dirty:
+            print("[WARNING] Shelf file changed on disk; unsaved edits of this session are replaced by it")
+        # The file already holds these changes: nothing is recorded or saved.
+        self.store.detach(self.model)
+        self.store = None
+        for op, payload in changes:
+            try:
+                self._apply_shelf_change(op, payload)
+            except (KeyError, IndexError, ValueError) as e:
+                print(f"[WARNING] Could not apply shelf change {op}: {e}")
+        self._save_timer.stop()
+        self.model.mark_saved()
+        self._set_store(store)
+        print(f"[INFO] Shelves reloaded from {self.shelves_save_path}: {len(changes)} change(s)")
+        return True
+
+    def _switch_shelf_file(self, old_path):
+        # save_path / storage mode changed in settings.ini. Edits still pending
+        # go to the old file; the new one is loaded and diffed like an
+        # external edit before anything is written to it.
+        if self.model.dirty:
+            self.save_shelves_to_file(old_path)
+        self._save_timer.stop()
+        new_path = self.shelves_save_path
+        old_bodies = self.bodies
+        store = self._open_store(new_path)
+        if not os.path.exists(new_path) and not os.path.exists(new_path + JOURNAL_SUFFIX):
+            # Nothing there yet: the current shelves move to the new file.
+            self._set_store(store)
+            self.save_shelves_to_file(new_path)
+            return
+        if not self._hot_reload_shelves(store):
+            print(f"[WARNING] Shelves stay in {old_path} until {new_path} can be read")
+            self.shelves_save_path = old_path
+            self.bodies = old_bodies
+
+    def _tool_button(self, tab_name, index):
+        layout = self.tab_toolbars.get(tab_name)
+        if layout is None or isinstance(layout, ShelfStripView):
+            return None
+        item = layout.itemAt(index)
+        return item.widget() if item else None
+
+    def _apply_shelf_change(self, op, payload):
+        # One diff_models() change: the model op plus only the widgets it touches.
+        name = payload["name"]
+        if op == "add_tab":
+            tab = self.model.add_tab(name, [dict(a) for a in payload["actions"]], payload.get("index"))
+            if name in self.studio_tabs:
+                # The user's tab wins the name; the studio tab is skipped.
+                self._reload_studio_tabs()
+            DISPATCHER.prepare_all(tab.actions)
+            self.shortcuts.bind_all(tab.actions)
+            self.tab_widget.insertTab(self._tab_insert_index(tab), self._build_tab_widget(tab), name)
+        elif op == "remove_tab":
+            page = self.hidden_tabs.pop(name) if name in self.hidden_tabs else self._tab_page(name)
+            tab = self.model.remove_tab(name)
+            self.shortcuts.unbind_all(tab.actions)
+            if page is not None and self.tab_widget.indexOf(page) != -1:
+                self.tab_widget.removeTab(self.tab_widget.indexOf(page))
+            self._release_tab_page(page)
+        elif op == "rename_tab":
+            new_name = payload["new_name"]
+            page = self._tab_page(name)
+            self.model.rename_tab(name, new_name)
+            if name in self.hidden_tabs:
+                self.hidden_tabs[new_name] = self.hidden_tabs.pop(name)
+            if name in self.tab_toolbars:
+                self.tab_toolbars[new_name] = self.tab_toolbars.pop(name)
+            if page is not None:
+                self.tab_widget.setTabText(self.tab_widget.indexOf(page), new_name)
+        elif op == "hide_tab":
+            if payload["hidden"] and name not in self.hidden_tabs:
+                self._hide_tab(name)
+            elif not payload["hidden"] and name in self.hidden_tabs:
+                self._unhide_tab(name)
+        elif op == "add_action":
+            tab = self.model.tab(name)
+            action_data = self.model.add_action(name, dict(payload["action"]), payload["index"])
+            DISPATCHER.prepare(action_data.get("command"))
+            if not tab.hidden:
+                self.shortcuts.bind(action_data)
+            self._create_action_button(tab, action_data, index=payload["index"])
+        elif op == "update_action":
+            tab = self.model.tab(name)
+            index = payload["index"]
+            fields = payload["fields"]
+            action_data = self.model.update_action(name, tab.actions[index], fields)
+            if "shortcut" in fields and not tab.hidden:
+                self.shortcuts.bind(action_data)
+            if "command" in fields:
+                DISPATCHER.prepare(action_data.get("command"))
+            if "title" in fields or "icon" in fields:
+                self._refresh_tool_widget(self._tool_button(name, index), name, action_data)
+        elif op == "remove_action":
+            index = payload["index"]
+            action_data = self.model.tab(name).actions[index]
+            button = self._tool_button(name, index)
+            self.model.remove_action(name, action_data)
+            self.shortcuts.unbind(action_data)
+            layout = self.tab_toolbars.get(name)
+            if isinstance(layout, ShelfStripView):
+                layout.refresh()
+            elif button is not None:
+                layout.removeWidget(button)
+                button.deleteLater()
+
+    @traced()
+    def _hot_reload_settings(self):
+        look = (self.icon_size, self.button_base_width, self.button_spacing, self.shelf_view)
+        studio = (self.studio_shelves, self.studio_revalidate_s)
+        storage = (self.shelves_save_path, self.storage_mode, self.command_storage)
+        self.load_settings_from_ini()
+        print(f"[INFO] Settings reloaded from {self.settings_path}")
+        TELEMETRY.slow_ms = self.slow_tool_ms
+        if (self.shelves_save_path, self.storage_mode, self.command_storage) != storage:
+            self._switch_shelf_file(storage[0])
+        if (self.studio_shelves, self.studio_revalidate_s) != studio:
+            self._open_library()
+            self._reload_studio_tabs()
+        if (self.icon_size, self.button_base_width, self.button_spacing, self.shelf_view) != look:
+            self._rebuild_built_pages()
+        self._watch_files()
+
+    def _rebuild_built_pages(self):
+        # Button size / view changed: built pages are rebuilt when shown.
+        for page in [self.tab_widget.widget(i) for i in range(self.tab_widget.count())] + list(self.hidden_tabs.values()):
+            if isinstance(page, LazyTabPage) and page.built:
+                self._clear_tab_page(page)
+        self._on_current_tab_changed(self.tab_widget.currentIndex())
+
+    # ==========================
+    # MacroScript import (see MacroImporter)
+    # ==========================
+    @traced()
+    def _import_macroscripts(self):
+        folder = QFileDialog.getExistingDirectory(self, "Import MacroScripts (.mcr / .ms)")
+        if not folder:
+            return
+        importer = MacroImporter(os.path.join(os.path.dirname(self.settings_path), "cache", "macro_import.json"))
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            result = importer.import_tree(folder)
+        finally:
+            QApplication.restoreOverrideCursor()
+        for path, error in result["errors"]:
+            print(f"[WARNING] Could not import {path}: {error}")
+
+        # MacroScripts with handlers: defined once here, the tools only run them.
+        for source in macro_definitions(result["macros"], result["changed"]):
+            try:
+                pymxs.runtime.execute(source)
+            except Exception as e:
+                print(f"[ERROR] Could not define MacroScript: {e}")
+
+        # One tab per category; tools already imported (same uid) are updated,
+        # keeping the title / icon / shortcut the user gave them.
+        changes = []
+        for name, tools in macros_to_tabs(result["macros"]).items():
+            if name in self.studio_tabs or name == MOST_USED_TAB:
+                name = f"{name} (imported)"
+            tab = self.model.tab(name)
+            if tab is None:
+                changes.append(("add_tab", {"name": name, "index": None, "actions": tools}))
+                continue
+            positions = {a.get("uid"): i for i, a in enumerate(tab.actions) if a.get("uid")}
+            for tool in tools:
+                index = positions.get(tool["uid"])
+                if index is None:
+                    changes.append(("add_action", {"name": name, "index": None, "action": tool}))
+                else:
+                    fields = reimport_fields(tab.actions[index], tool)
+                    if fields:
+                        changes.append(("update_action", {"name": name, "index": index, "fields": fields}))
+        for op, payload in changes:
+            self._apply_shelf_change(op, payload)
+        if changes:
+            self.save_shelves_to_file(self.shelves_save_path)
+        print(f"[INFO] Imported {len(result['macros'])} MacroScripts from {result['files']} files "
+              f"({result['parsed']} parsed, {result['skipped']} unchanged): {len(changes)} shelf change(s)")
+
+    # ==========================
+    # Studio shelf library (read-only, see ShelfLibrary)
+    # ==========================
+    def _open_library(self):
+        self._library_timer.stop()
+        sources = split_sources(self.studio_shelves)
+        if not sources:
+            self.library = None
+            return
+        self.library = ShelfLibrary(sources, os.path.join(os.path.dirname(self.settings_path), "cache"),
+                                    self.studio_revalidate_s)
+        self._library_timer.setInterval(max(1, self.studio_revalidate_s) * 1000)
+        self._library_timer.start()
+        QTimer.singleShot(0, self._revalidate_library)
+
+    def _revalidate_library(self, force=False):
+        # One sync at a time; an unreachable share only delays the next one.
+        if self.library is None or self._library_syncing is not None:
+            return
+        self._library_syncing = self.library
+        self._library_pool.start(_BackgroundTask(self._library_signals, self.library.sync, force))
+
+    @traced()
+    def _on_library_synced(self, results, error):
+        library, self._library_syncing = self._library_syncing, None
+        if library is not self.library:
+            # studio_shelves changed meanwhile: check the new library now.
+            self._revalidate_library()
+            return
+        if error is not None:
+            print(f"[WARNING] Could not check studio shelves: {error}")
+            return
+        if SOURCE_UPDATED in results.values():
+            print(f"[INFO] Studio shelves updated: {sum(s == SOURCE_UPDATED for s in results.values())} source(s)")
+            self._reload_studio_tabs()
+
+    def _add_studio_tabs(self):
+        if self.library is None:
+            return
+        # Studio tabs go after the user's tabs, before Most Used.
+        index = self.tab_widget.count()
+        for i in range(self.tab_widget.count()):
+            page = self.tab_widget.widget(i)
+            if isinstance(page, LazyTabPage) and page.generated:
+                index = i
+                break
+        for source, model in self.library.load():
+            for tab in model.tabs:
+                if tab.hidden:
+                    continue
+                if self.model.tab(tab.name) is not None or tab.name in self.studio_tabs or tab.name == MOST_USED_TAB:
+                    print(f"[WARNING] Skipping studio tab {tab.name!r} from {source}: a tab with that name exists")
+                    continue
+                self._fill_catalog_ids(tab.actions)
+                DISPATCHER.prepare_all(tab.actions)
+                self.shortcuts.bind_all(tab.actions)
+                page = LazyTabPage(tab, studio=source)
+                self.studio_tabs[tab.name] = page
+                self.tab_widget.insertTab(index, page, tab.name)
+                index += 1
+        self._studio_revision += 1
+
+    def _remove_studio_tabs(self):
+        for page in self.studio_tabs.values():
+            self.shortcuts.unbind_all(page.tab.actions)
+            index = self.tab_widget.indexOf(page)
+            if index != -1:
+                self.tab_widget.removeTab(index)
+            self._release_tab_page(page)
+        self.studio_tabs = {}
+        self._studio_revision += 1
+
+    def _reload_studio_tabs(self):
+        current = self.tab_widget.tabText(self.tab_widget.currentIndex())
+        self._remove_studio_tabs()
+        self._add_studio_tabs()
+        for i in range(self.tab_widget.count()):
+            if self.tab_widget.tabText(i) == current:
+                self.tab_widget.setCurrentIndex(i)
+                break
+
+
+
+_IMPORT_END = time.perf_counter()
+TRACER.complete("import shelftoolpro", _IMPORT_START, _IMPORT_END)
 
 
 # ==========================
@@ -749,7 +2414,9 @@ _shelf_tool_dock = None
 
 def main():
     global _shelf_tool_dock
-    
+
+    enable_trace_from_settings(SETTINGS_PATH)
+    check_max_version()
     app = QApplication.instance()
     if app is None:
         app = QApplication(sys.argv)
@@ -770,6 +2437,8 @@ def main():
 
     
     _shelf_tool_dock = QDockWidget("3ds Max Shelf Tool Pro", main_window)
+    _shelf_tool_dock.setMinimumHeight(200)
+    _shelf_tool_dock.setMaximumHeight(200)
     shelf_tool = ShelfTool()
     _shelf_tool_dock.setWidget(shelf_tool)
     main_window.addDockWidget(Qt.LeftDockWidgetArea, _shelf_tool_dock)
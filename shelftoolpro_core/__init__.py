@@ -0,0 +1,9 @@
+# ==========================
+# IMAN SHIRANI
+# Shelf Tool Pro - core (no pymxs / no Qt)
+# ==========================
+from .catalog import ActionCatalog, CatalogAction, load_catalog, DEFAULT_CACHE_DIR
+from .model import ShelfModel, ShelfTab
+from .persistence import save_model, load_model, open_store, SnapshotStore, JournalStore
+from .dispatch import CommandCache, CommandDispatcher
+from .fake_runtime import FakeRuntime
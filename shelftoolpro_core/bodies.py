@@ -0,0 +1,206 @@
+# ==========================
+# Script Body Store (content-addressed, next to shelves.json)
+# ==========================
+import os
+import re
+import json
+import hashlib
+from collections import OrderedDict
+
+from .persistence import atomic_write_bytes, JOURNAL_SUFFIX
+
+# Commands longer than this are written to the body store when saving with
+# COMMANDS_EXTERNAL; shorter ones (catalog actions, one-liners) stay inline.
+INLINE_MAX = 512
+DEFAULT_CACHE_BODIES = 64
+
+COMMANDS_INLINE = "inline"
+COMMANDS_EXTERNAL = "external"
+
+# A body reference in a shelf file / journal (see sweep)
+_REF_RE = re.compile(r'"command_ref"\s*:\s*"([0-9a-f]{40})"')
+
+
+def body_ref(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def bodies_dir_for(shelves_path):
+    return os.path.join(os.path.dirname(os.path.abspath(shelves_path)), "bodies")
+
+
+def _read_text(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _document_refs(text):
+    # Body refs of a shelf document; None for any other JSON file.
+    if '"tabs"' not in text:
+        return None
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("tabs"), list):
+        return None
+    return {action["command_ref"] for tab in data["tabs"] if isinstance(tab, dict)
+            for action in tab.get("actions", []) if isinstance(action, dict) and action.get("command_ref")}
+
+
+class BodyStore:
+    """Script bodies stored once per content hash (bodies/ab/abcdef....ms).
+
+    A tool whose body lives here is saved as {"command": "", "command_ref":
+    <sha1>}; the text is read on first use (click, edit, macro) and kept in
+    a small LRU, so startup cost and memory follow the button count, not
+    the size of the scripts. Files are never rewritten: same text, same
+    name, so identical scripts on many buttons share one file.
+    """
+
+    def __init__(self, folder, cache_size=DEFAULT_CACHE_BODIES):
+        self.folder = folder
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._known = set()
+        self.reads = 0
+
+    # Tools saved through this store keep their command_ref (see InlineBodies)
+    keeps_refs = True
+
+    def path_of(self, ref):
+        return os.path.join(self.folder, ref[:2], ref + ".ms")
+
+    def put(self, text):
+        ref = body_ref(text)
+        if ref not in self._known:
+            path = self.path_of(ref)
+            if not os.path.exists(path):
+                atomic_write_bytes(path, text.encode("utf-8"))
+            self._known.add(ref)
+        return ref
+
+    def get(self, ref):
+        text = self._cache.get(ref)
+        if text is not None:
+            self._cache.move_to_end(ref)
+            return text
+        with open(self.path_of(ref), "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+        self.reads += 1
+        self._known.add(ref)
+        self._cache[ref] = text
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return text
+
+    def command_of(self, action_data):
+        # The tool's script, loading it from the store if it is out of line.
+        ref = action_data.get("command_ref")
+        if ref and not action_data.get("command"):
+            try:
+                return self.get(ref)
+            except OSError as e:
+                print(f"[ERROR] Script body {ref} of {action_data.get('title', '')!r} is missing: {e}")
+                return ""
+        return action_data.get("command") or ""
+
+    def externalize(self, data):
+        # Shelf file form of one clean_action() dict.
+        command = data.get("command") or ""
+        if len(command) > INLINE_MAX:
+            data["command_ref"] = self.put(command.strip())
+            data["command"] = ""
+        return data
+
+    def externalize_fields(self, fields):
+        # Journal form of update_action() fields: a long new script is stored
+        # here and the record only carries its ref.
+        command = fields.get("command") or ""
+        if len(command) > INLINE_MAX and "command_ref" not in fields:
+            return dict(fields, command="", command_ref=self.put(command.strip()))
+        return fields
+
+    def sweep(self, shelves_path):
+        """Delete the bodies no shelf file next to the store refers to.
+
+        `shelves_path` and its journal always count; nothing is removed when
+        they cannot be read. Other .json files in the folder count only when
+        they are shelf documents (a shelf saved under another name shares
+        this bodies/ folder), together with their journals; settings files
+        such as trace.json or usage.json are skipped, and so is a file that
+        cannot be read. Returns the number of files removed."""
+        keep = set()
+        parent = os.path.dirname(self.folder)
+        own = os.path.normcase(os.path.abspath(shelves_path))
+        for path in (shelves_path, shelves_path + JOURNAL_SUFFIX):
+            if os.path.exists(path):
+                try:
+                    keep.update(_REF_RE.findall(_read_text(path)))
+                except OSError as e:
+                    print(f"[WARNING] Not removing unused script bodies, could not read {path}: {e}")
+                    return 0
+        for name in os.listdir(parent):
+            path = os.path.join(parent, name)
+            if not name.endswith(".json") or os.path.normcase(os.path.abspath(path)) == own:
+                continue
+            try:
+                refs = _document_refs(_read_text(path))
+                if refs is None:
+                    continue
+                keep.update(refs)
+                if os.path.exists(path + JOURNAL_SUFFIX):
+                    keep.update(_REF_RE.findall(_read_text(path + JOURNAL_SUFFIX)))
+            except OSError as e:
+                print(f"[WARNING] Skipping {name} while removing unused script bodies: {e}")
+        removed = 0
+        if not os.path.isdir(self.folder):
+            return 0
+        for bucket in os.scandir(self.folder):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                ref, ext = os.path.splitext(entry.name)
+                if ext == ".ms" and ref not in keep:
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        continue
+                    self._known.discard(ref)
+                    self._cache.pop(ref, None)
+                    removed += 1
+        return removed
+
+
+class InlineBodies:
+    """command_storage = inline: the shelf file gets every script inline.
+
+    Stands in for a BodyStore in the stores. Tools saved while the storage
+    was external still carry a command_ref; saving reads their text back
+    from `bodies` and drops the ref. A body that cannot be read keeps it.
+    """
+
+    keeps_refs = False
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+
+    def externalize(self, data):
+        ref = data.get("command_ref")
+        if ref and not data.get("command"):
+            try:
+                data["command"] = self.bodies.get(ref)
+            except OSError as e:
+                print(f"[WARNING] Keeping script body {ref} of {data.get('title', '')!r} out of line: {e}")
+                return data
+            del data["command_ref"]
+        return data
+
+    def externalize_fields(self, fields):
+        if fields.get("command_ref"):
+            return self.externalize(dict(fields))
+        return fields
+
+    def sweep(self, shelves_path):
+        # Bodies are only removed while command_storage is external.
+        return 0
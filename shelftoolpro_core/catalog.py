@@ -0,0 +1,260 @@
+# ==========================
+# Action Catalog (max_actions.json) + on-disk cache
+# ==========================
+import os
+import sys
+import json
+import pickle
+import hashlib
+import re
+
+CACHE_VERSION = 3
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), "Documents", "3dsMaxShelves", "cache")
+
+# In-process memo: survives python.reload() of shelftoolpro.py, so reopening
+# the dock in the same 3ds Max session does not even touch the cache file.
+_memo = {}
+
+
+# ==========================
+# Source fingerprint
+# ==========================
+def _stat_key(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cache_file(json_path, cache_dir):
+    name = hashlib.sha1(os.path.normcase(json_path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_dir, f"catalog-{name}.pickle")
+
+
+# ==========================
+# Action IDs
+# ==========================
+# actionMan.executeAction 0 "40714"     (the max_actions.json form)
+# (actionMan.executeAction -844228238 "13");   -- optional parens, ';', comment
+# actionman.executeaction 0 40714                (any case, unquoted id)
+_EXECUTE_ACTION_RE = re.compile(
+    r'^\s*(?P<paren>\()?\s*actionMan\.executeAction\s+(?P<context>-?\d+)\s+'
+    r'(?P<quote>")?(?P<id>\d+)(?(quote)")\s*(?(paren)\))\s*;?\s*(--[^\n]*)?$',
+    re.IGNORECASE)
+
+
+def parse_action_command(command):
+    # 'actionMan.executeAction 0 "40714"' -> (0, "40714"), anything else -> None
+    match = _EXECUTE_ACTION_RE.match(command or "")
+    if not match:
+        return None
+    return int(match.group("context")), match.group("id")
+
+
+def make_action_id(context_id, action_id):
+    # Context 0 (main UI) keeps the bare number, as trigger_action() expects.
+    return str(action_id) if int(context_id) == 0 else f"{context_id}:{action_id}"
+
+
+def split_action_id(action_id):
+    context_id, sep, item_id = str(action_id).rpartition(":")
+    return (int(context_id) if sep else 0), item_id
+
+
+# ==========================
+# Catalog
+# ==========================
+class CatalogAction:
+    """One read-only catalog entry.
+
+    A slotted record instead of the JSON dict: no per-action key table, and
+    the strings most actions share (group, category, icon, shortcut) are
+    interned, so thousands of actions point at a handful of string objects.
+    get() / [] accept the max_actions.json keys ("Cat", "_GroupName", ...),
+    so code written against the dicts keeps working.
+    """
+    __slots__ = ("title", "command", "icon", "shortcut", "category", "group", "ID")
+
+    _KEYS = {"title": "title", "command": "command", "icon": "icon", "shortcut": "shortcut",
+             "Cat": "category", "_GroupName": "group", "ID": "ID"}
+
+    def __init__(self, action, group_name):
+        cat = action.get("Cat")
+        icon = action.get("icon")
+        shortcut = action.get("shortcut")
+        self.title = action.get("title")
+        self.command = action.get("command")
+        self.icon = sys.intern(icon) if icon is not None else None
+        self.shortcut = sys.intern(shortcut) if shortcut is not None else None
+        self.category = sys.intern(cat) if cat is not None else None
+        self.group = group_name
+        self.ID = action.get("ID") or None
+
+    def get(self, key, default=None):
+        attr = self._KEYS.get(key)
+        value = getattr(self, attr) if attr else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def to_dict(self):
+        return {key: getattr(self, attr) for key, attr in self._KEYS.items() if getattr(self, attr) is not None}
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+
+class ActionCatalog:
+    """Flat, indexed view of max_actions.json.
+
+    `actions` holds one CatalogAction per catalog action (group and ID
+    filled in), built once and shared read-only by the dialogs; lookups by
+    ID, (group, title) and command are dict hits. The same action can be
+    listed in several groups, so by_id / by_command return its first
+    occurrence. Groups can be added later (sharded loading); rows only ever
+    get appended. The source dicts are not kept.
+    """
+
+    def __init__(self, groups=()):
+        self.actions = []
+        self._group_rows = {}
+        self._by_id = {}
+        self._by_group_title = {}
+        self._by_command = {}
+
+        for group in groups:
+            self.add_group(group)
+
+    def add_group(self, group):
+        # Returns the range of rows the group's actions were appended at.
+        group_name = sys.intern(group.get("GroupName", ""))
+        rows = self._group_rows.setdefault(group_name, [])
+        first = len(self.actions)
+        for source in group.get("Actions", []):
+            action = CatalogAction(source, group_name)
+            if not action.ID:
+                parsed = parse_action_command(action.command)
+                if parsed:
+                    action.ID = make_action_id(*parsed)
+            row = len(self.actions)
+            self.actions.append(action)
+            rows.append(row)
+
+            if action.ID:
+                self._by_id.setdefault(action.ID, row)
+            self._by_group_title.setdefault((group_name, action.title or ""), row)
+            if action.command:
+                self._by_command.setdefault(action.command.strip(), row)
+        return range(first, len(self.actions))
+
+    def __len__(self):
+        return len(self.actions)
+
+    def group_names(self):
+        return list(self._group_rows)
+
+    def group_rows(self, group_name):
+        return self._group_rows.get(group_name, [])
+
+    def by_id(self, action_id):
+        row = self._by_id.get(action_id)
+        return None if row is None else self.actions[row]
+
+    def row_of_id(self, action_id):
+        return self._by_id.get(action_id)
+
+    def by_group_title(self, group_name, title):
+        row = self._by_group_title.get((group_name, title))
+        return None if row is None else self.actions[row]
+
+    def by_command(self, command):
+        row = self._by_command.get((command or "").strip())
+        return None if row is None else self.actions[row]
+
+
+def _read_cache(cache_path):
+    try:
+        with open(cache_path, "rb") as f:
+            blob = pickle.load(f)
+        if blob.get("version") == CACHE_VERSION:
+            return blob
+    except Exception:
+        pass
+    return None
+
+
+def _write_cache(cache_path, blob):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(blob, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        print(f"[WARNING] Could not write catalog cache: {e}")
+
+
+# ==========================
+# Load Catalog
+# ==========================
+def load_catalog(json_path, cache_dir=DEFAULT_CACHE_DIR):
+    """Return the ActionCatalog for max_actions.json.
+
+    The parsed catalog is cached next to the shelves (pickle), keyed by the
+    source path, size, mtime and content hash. The JSON is only parsed again
+    when the file really changed.
+    """
+    json_path = os.path.abspath(json_path)
+    size, mtime_ns = _stat_key(json_path)
+
+    memo = _memo.get(json_path)
+    if memo and memo["source"]["size"] == size and memo["source"]["mtime_ns"] == mtime_ns:
+        return memo["catalog"]
+
+    cache_path = _cache_file(json_path, cache_dir) if cache_dir else None
+    blob = _read_cache(cache_path) if cache_path else None
+
+    if blob and blob["source"]["path"] == json_path:
+        source = blob["source"]
+        if source["size"] == size and source["mtime_ns"] == mtime_ns:
+            _memo[json_path] = blob
+            return blob["catalog"]
+        # Touched but maybe not changed (copied / re-deployed): compare content.
+        digest = _file_hash(json_path)
+        if source["size"] == size and source["sha1"] == digest:
+            source["mtime_ns"] = mtime_ns
+            _write_cache(cache_path, blob)
+            _memo[json_path] = blob
+            return blob["catalog"]
+    else:
+        digest = _file_hash(json_path)
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        groups = json.load(f)
+
+    blob = {
+        "version": CACHE_VERSION,
+        "source": {"path": json_path, "size": size, "mtime_ns": mtime_ns, "sha1": digest},
+        "catalog": ActionCatalog(groups),
+    }
+    if cache_path:
+        _write_cache(cache_path, blob)
+    _memo[json_path] = blob
+    return blob["catalog"]
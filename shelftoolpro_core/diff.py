@@ -0,0 +1,106 @@
+# ==========================
+# Shelf Model Diff (hot reload)
+# ==========================
+from difflib import SequenceMatcher
+
+from .model import clean_action
+
+
+def _tool_key(action):
+    # Same tool across two versions of a file: uid, else catalog ID, else script.
+    return (action.get("uid") or action.get("ID") or action.get("script_path") or action.get("command_ref")
+            or (action.get("command") or "").strip() or action.get("title", ""))
+
+
+def _changed_fields(old, new):
+    old_data = clean_action(old)
+    new_data = clean_action(new)
+    fields = {key: value for key, value in new_data.items() if old_data.get(key) != value}
+    # Optional fields that disappeared are reset, not left behind.
+    for key in old_data:
+        if key not in new_data:
+            fields[key] = None
+    return fields
+
+
+def _same(old, new):
+    return old == new or clean_action(old) == clean_action(new)
+
+
+def _diff_actions(name, old_actions, new_actions):
+    # Only the part between the unchanged head and tail goes through the matcher.
+    head = 0
+    limit = min(len(old_actions), len(new_actions))
+    while head < limit and _same(old_actions[head], new_actions[head]):
+        head += 1
+    tail = 0
+    while (tail < limit - head
+           and _same(old_actions[len(old_actions) - 1 - tail], new_actions[len(new_actions) - 1 - tail])):
+        tail += 1
+    old_middle = old_actions[head:len(old_actions) - tail]
+    new_middle = new_actions[head:len(new_actions) - tail]
+    if not old_middle and not new_middle:
+        return []
+
+    ops = []
+    matcher = SequenceMatcher(None, [_tool_key(a) for a in old_middle],
+                              [_tool_key(a) for a in new_middle], autojunk=False)
+    # From the end backwards: indices before the current block stay valid.
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        i1, i2, j1, j2 = i1 + head, i2 + head, j1 + head, j2 + head
+        paired = min(i2 - i1, j2 - j1) if tag in ("equal", "replace") else 0
+        for k in range(paired):
+            fields = _changed_fields(old_actions[i1 + k], new_actions[j1 + k])
+            if fields:
+                ops.append(("update_action", {"name": name, "index": i1 + k, "fields": fields}))
+        for index in range(i2 - 1, i1 + paired - 1, -1):
+            ops.append(("remove_action", {"name": name, "index": index}))
+        for k in range(paired, j2 - j1):
+            ops.append(("add_action", {"name": name, "index": i1 + k, "action": clean_action(new_actions[j1 + k])}))
+    return ops
+
+
+def diff_models(old, new):
+    """Changes that turn ShelfModel `old` into `new`, as (op, payload) pairs.
+
+    The ops are the ones ShelfModel.apply() replays (add_tab, rename_tab,
+    update_action, ...), in an order where every index is valid when the op
+    is applied, so unchanged tabs and tools are never touched. Tabs are
+    matched by name; a tab that vanished while one with the same tools
+    appeared is a rename. Moving an existing tab is not reported.
+    """
+    ops = []
+    old_tabs = {tab.name: tab for tab in old.tabs}
+    new_tabs = {tab.name: tab for tab in new.tabs}
+    removed = [tab for tab in old.tabs if tab.name not in new_tabs]
+    added = [tab for tab in new.tabs if tab.name not in old_tabs]
+
+    renamed = {}
+    for tab in removed:
+        for candidate in added:
+            if (candidate.name not in renamed.values() and len(candidate.actions) == len(tab.actions)
+                    and all(_same(a, b) for a, b in zip(tab.actions, candidate.actions))):
+                renamed[tab.name] = candidate.name
+                break
+
+    for tab in removed:
+        if tab.name in renamed:
+            ops.append(("rename_tab", {"name": tab.name, "new_name": renamed[tab.name]}))
+        else:
+            ops.append(("remove_tab", {"name": tab.name}))
+
+    for index, tab in enumerate(new.tabs):
+        before = old_tabs.get(tab.name)
+        if before is None:
+            renamed_from = next((old_name for old_name, new_name in renamed.items() if new_name == tab.name), None)
+            if renamed_from is None:
+                ops.append(("add_tab", {"name": tab.name, "index": index,
+                                        "actions": [clean_action(a) for a in tab.actions]}))
+                if tab.hidden:
+                    ops.append(("hide_tab", {"name": tab.name, "hidden": True}))
+                continue
+            before = old_tabs[renamed_from]
+        ops.extend(_diff_actions(tab.name, before.actions, tab.actions))
+        if before.hidden != tab.hidden:
+            ops.append(("hide_tab", {"name": tab.name, "hidden": tab.hidden}))
+    return ops
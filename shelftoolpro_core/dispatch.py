@@ -0,0 +1,214 @@
+# ==========================
+# Command Dispatch (shelf button clicks)
+# ==========================
+import re
+import hashlib
+from collections import OrderedDict
+
+from .catalog import parse_action_command
+
+DEFAULT_CACHE_SIZE = 128
+DEFAULT_PLAN_CACHE_SIZE = 4096  # parsed actionMan commands (short strings)
+# Longer scripts are cached under a hash of their text, so the caches do not
+# keep long bodies (e.g. the out-of-line ones, see bodies.py) in memory.
+KEY_TEXT_MAX = 512
+
+# Definitions that MAXScript only accepts at top level: run those as-is.
+_TOP_LEVEL_ONLY_RE = re.compile(r"^\s*(macroScript|plugin|utility|persistent\s+global)\b",
+                                re.IGNORECASE | re.MULTILINE)
+# Definitions other tools (or the next click) look up by name. Inside the
+# wrapper function they would be locals: `try(destroyDialog X)catch()` no
+# longer finds the open dialog, other tools cannot call the fn / struct.
+_GLOBAL_DEFINITION_RE = re.compile(r"^\s*(rollout|rcmenu|struct|(mapped\s+)?(fn|function)|global)\b",
+                                   re.IGNORECASE | re.MULTILINE)
+# Explicit opt-out: a `-- shelftool: top-level` line runs the script as-is.
+_TOP_LEVEL_MARKER_RE = re.compile(r"^\s*--\s*shelftool\s*:\s*top-?level\b", re.IGNORECASE | re.MULTILINE)
+
+# Implicit globals: `obj = box()` at top level creates a global another tool
+# (or the next click) may read; inside the wrapper it would be a local.
+# Strings and comments are blanked first; `for i = 1 to n` and names declared
+# `local` do not count, property / index assignments (`$.name = x`) neither.
+_STRING_OR_COMMENT_RE = re.compile(r'@"[^"]*"|"(?:\\.|[^"\\])*"|/\*.*?\*/|--[^\n]*', re.DOTALL)
+_ASSIGNMENT_RE = re.compile(r"(?<![\w.\]$&])([A-Za-z_]\w*)\s*[-+*/]?=(?!=)")
+_LOOP_VARIABLE_RE = re.compile(r"\bfor\s+([A-Za-z_]\w*)\s*=", re.IGNORECASE)
+_LOCAL_LINE_RE = re.compile(r"\blocal\s+([^\n;]*)", re.IGNORECASE)
+_NAME_RE = re.compile(r"(?:^|,)\s*([A-Za-z_]\w*)")
+
+# Marks a script that must not be wrapped (kept in the LRU like a compiled one)
+_NOT_COMPILABLE = object()
+
+
+def _blank_strings(command, keep_comments=False):
+    # String literals (and comments) replaced, so text inside them never matches
+    def blank(match):
+        text = match.group(0)
+        return text if keep_comments and text.startswith(("--", "/*")) else '""'
+    return _STRING_OR_COMMENT_RE.sub(blank, command or "")
+
+
+def top_level_only(command):
+    # macroScript / plugin / utility definitions cannot run inside a function or block
+    return bool(_TOP_LEVEL_ONLY_RE.search(_blank_strings(command)))
+
+
+def implicit_globals(command):
+    # Names a script assigns without declaring them local (lower case)
+    return _implicit_globals(_blank_strings(command))
+
+
+def _implicit_globals(code):
+    assigned = {name.lower() for name in _ASSIGNMENT_RE.findall(code)}
+    if not assigned:
+        return set()
+    declared = {name.lower() for name in _LOOP_VARIABLE_RE.findall(code)}
+    for line in _LOCAL_LINE_RE.findall(code):
+        declared.update(name.lower() for name in _NAME_RE.findall(line))
+    return assigned - declared
+
+
+def needs_top_level(command):
+    # Scripts that must run with rt.execute, not compiled into a function
+    code = _blank_strings(command)
+    return (bool(_TOP_LEVEL_ONLY_RE.search(code)) or bool(_GLOBAL_DEFINITION_RE.search(code))
+            or bool(_TOP_LEVEL_MARKER_RE.search(_blank_strings(command, keep_comments=True)))
+            or bool(_implicit_globals(code)))
+
+
+def command_key(command):
+    # Stable short id for a script (logs, stats files)
+    return hashlib.sha1(command.encode("utf-8")).hexdigest()[:16]
+
+
+def _cache_key(command):
+    if len(command) <= KEY_TEXT_MAX:
+        return command
+    return ("sha1", hashlib.sha1(command.encode("utf-8")).hexdigest())
+
+
+# ==========================
+# Compile-once MAXScript cache
+# ==========================
+class CommandCache:
+    """Compiles each script once into a MAXScript function and calls it.
+
+    rt.execute(text) parses and compiles the whole text on every call; here a
+    script is wrapped as `(fn ... = ( <script> ))` the first time it runs and
+    the returned function value is kept in a size-bounded LRU keyed by the
+    text (the dict lookup uses the string's cached hash). Scripts longer than
+    KEY_TEXT_MAX are keyed by a SHA-1 of the text instead, so the LRU never
+    holds a long body. `runtime` is pymxs.runtime (or a stand-in).
+
+    Inside the wrapper, variables a script assigns without declaring them
+    would be function locals, not globals. Scripts that do that, or define
+    rollouts, fns, structs or globals (see needs_top_level), keep running
+    through rt.execute at top level; scripts that only call functions or
+    declare their variables `local` get the compiled path.
+    """
+
+    def __init__(self, runtime, max_entries=DEFAULT_CACHE_SIZE):
+        self.rt = runtime
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "entries": len(self._entries), "max_entries": self.max_entries}
+
+    def _compile(self, command):
+        if needs_top_level(command):
+            return _NOT_COMPILABLE
+        try:
+            fn = self.rt.execute(f"(fn shelfToolCommand = (\n{command}\n))")
+        except Exception:
+            # Let the plain execute path report the real error.
+            return _NOT_COMPILABLE
+        return fn if callable(fn) else _NOT_COMPILABLE
+
+    def run(self, command):
+        command = command.strip()
+        key = _cache_key(command)
+        fn = self._entries.get(key)
+        if fn is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        else:
+            self.misses += 1
+            fn = self._compile(command)
+            self._entries[key] = fn
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        if fn is _NOT_COMPILABLE:
+            return self.rt.execute(command)
+        return fn()
+
+    def invalidate(self, command):
+        self._entries.pop(_cache_key(command.strip()), None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+# ==========================
+# Dispatcher: direct actionMan call or cached script
+# ==========================
+_SCRIPT = "script"
+
+
+class CommandDispatcher:
+    """Runs a shelf command the cheapest way available.
+
+    Commands of the form `actionMan.executeAction <context> "<id>"` (nearly
+    the whole catalog) are parsed once by prepare() into a (context, id) pair
+    and dispatched with rt.actionMan.executeAction, bypassing the MAXScript
+    parser. Everything else goes through the CommandCache. Only the parsed
+    actions are kept (a size-bounded LRU): a script fails the parse within a
+    few characters, and its text is held by the CommandCache alone.
+    """
+
+    def __init__(self, runtime, cache_size=DEFAULT_CACHE_SIZE, plan_cache_size=DEFAULT_PLAN_CACHE_SIZE):
+        self.rt = runtime
+        self.cache = CommandCache(runtime, cache_size)
+        self.direct_calls = 0
+        self.max_plans = plan_cache_size
+        self._plans = OrderedDict()
+
+    def prepare(self, command):
+        command = (command or "").strip()
+        plan = self._plans.get(command)
+        if plan is not None:
+            self._plans.move_to_end(command)
+            return plan
+        plan = parse_action_command(command)
+        if plan is None:
+            return _SCRIPT
+        self._plans[command] = plan
+        if len(self._plans) > self.max_plans:
+            self._plans.popitem(last=False)
+        return plan
+
+    def prepare_all(self, actions):
+        for action_data in actions:
+            if action_data.get("command"):
+                self.prepare(action_data["command"])
+
+    def run(self, command):
+        command = command.strip()
+        plan = self.prepare(command)
+        if plan is _SCRIPT:
+            return self.cache.run(command)
+        self.direct_calls += 1
+        return self.rt.actionMan.executeAction(plan[0], plan[1])
+
+    def invalidate(self, command):
+        command = (command or "").strip()
+        self._plans.pop(command, None)
+        self.cache.invalidate(command)
+
+    def stats(self):
+        return dict(self.cache.stats(), direct=self.direct_calls, plans=len(self._plans))
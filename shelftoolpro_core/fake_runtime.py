@@ -0,0 +1,115 @@
+# ==========================
+# Fake pymxs.runtime (benchmarks / headless checks)
+# ==========================
+import re
+
+# Rough MAXScript tokenizer: stands in for the parser cost of rt.execute().
+_TOKEN_RE = re.compile(r'"[^"]*"|--[^\n]*|[A-Za-z_][\w.]*|-?\d+(?:\.\d+)?|\S')
+_EXECUTE_ACTION_RE = re.compile(r'actionMan\.executeAction\s+(-?\d+)\s+"?(\d+)"?', re.IGNORECASE)
+
+
+class FakeActionItem:
+    def __init__(self, action_id, description, category="", button_text=""):
+        self.action_id = action_id
+        self.description = description
+        self.category = category
+        self.button_text = button_text
+
+    def getId(self):
+        return self.action_id
+
+    def getDescription(self):
+        return self.description
+
+    def getCategory(self):
+        return self.category
+
+    def getButtonText(self):
+        return self.button_text
+
+
+class FakeActionTable:
+    # 1-based like MAXScript: getActionItem 1 .. numActionItems
+    def __init__(self, table_id, name, items=None):
+        self.id = table_id
+        self.name = name
+        self.items = list(items or [])
+
+    @property
+    def numActionItems(self):
+        return len(self.items)
+
+    def getActionItem(self, index):
+        return self.items[index - 1]
+
+
+class FakeActionMan:
+    def __init__(self, tables=None):
+        self.calls = []
+        self.record = False
+        self.count = 0
+        self.tables = list(tables or [])
+
+    @property
+    def numActionTables(self):
+        return len(self.tables)
+
+    def getActionTable(self, index):
+        return self.tables[index - 1]
+
+    def executeAction(self, context_id, action_id):
+        self.count += 1
+        if self.record:
+            self.calls.append((int(context_id), str(action_id)))
+        return True
+
+
+class FakeRuntime:
+    """Just enough of pymxs.runtime for the core package.
+
+    execute() tokenizes the text (so parse cost scales with script length
+    like the real thing), returns a callable for `(fn ... = (...))` wrappers
+    and forwards actionMan.executeAction lines to `actionMan`. Set
+    `record = True` to keep every executed script in `executed`.
+    """
+
+    def __init__(self):
+        self.actionMan = FakeActionMan()
+        self.parsed_tokens = 0
+        self.record = False
+        self.executed = []
+        self.messages = []
+
+    def execute(self, text):
+        tokens = _TOKEN_RE.findall(text)
+        self.parsed_tokens += len(tokens)
+        if self.record:
+            self.executed.append(text)
+        calls = _EXECUTE_ACTION_RE.findall(text)
+        if text.startswith("(fn "):
+            # "Compiled": the call list is parsed once, not on every run.
+            return lambda: self._run_calls(calls)
+        return self._run_calls(calls)
+
+    def _run_calls(self, calls):
+        result = None
+        for context_id, action_id in calls:
+            result = self.actionMan.executeAction(int(context_id), action_id)
+        return result
+
+    def messageBox(self, text, title=""):
+        self.messages.append((title, text))
+
+
+def fake_tables_from_catalog(groups):
+    # Action tables (one per context) holding every action of a max_actions.json.
+    from .catalog import parse_action_command
+    tables = {}
+    for group in groups:
+        for action in group.get("Actions", []):
+            parsed = parse_action_command(action.get("command"))
+            if parsed:
+                context_id, action_id = parsed
+                table = tables.setdefault(context_id, FakeActionTable(context_id, "Main UI" if context_id == 0 else f"Table {context_id}"))
+                table.items.append(FakeActionItem(int(action_id), action.get("title", ""), group.get("GroupName", "")))
+    return list(tables.values())
@@ -0,0 +1,153 @@
+# ==========================
+# Studio Shelf Library (read-only shelves from a share, mirrored locally)
+# ==========================
+import os
+import json
+import time
+import hashlib
+
+from .model import ShelfModel
+from .persistence import atomic_write_bytes, atomic_write_json
+from .bodies import BodyStore, bodies_dir_for
+
+# 2: local copies have their command_ref bodies inlined
+LIBRARY_VERSION = 2
+MANIFEST_NAME = "library.json"
+DEFAULT_REVALIDATE_S = 300
+
+# sync() result per source
+SOURCE_CACHED = "cached"        # checked recently, network not touched
+SOURCE_UNCHANGED = "unchanged"  # stat (or hash) matched the local copy
+SOURCE_UPDATED = "updated"      # new content copied to the local cache
+SOURCE_OFFLINE = "offline"      # source unreachable, local copy used
+SOURCE_MISSING = "missing"      # unreachable and never cached
+
+
+def split_sources(text):
+    # settings.ini: studio_shelves = \\server\shelves\modeling.json; \\server\shelves\fx.json
+    return [part.strip() for part in (text or "").split(";") if part.strip()]
+
+
+class ShelfLibrary:
+    """Read-only studio shelf files, each mirrored into `cache_dir`.
+
+    The UI only ever loads the local copies. sync() revalidates a source at
+    most once per `revalidate_s`: a stat of the share first, and the file is
+    read (and hashed) only when size / mtime differ, so an unchanged library
+    costs one stat per source and interval. The manifest remembers the source
+    fingerprints and check times between sessions.
+
+    Tools saved with command_storage = external keep their scripts in the
+    share's own bodies/ folder; those are inlined into the local copy, so
+    studio tabs never depend on the user's bodies/ folder.
+    """
+
+    def __init__(self, sources, cache_dir, revalidate_s=DEFAULT_REVALIDATE_S):
+        self.sources = list(sources)
+        self.folder = os.path.join(cache_dir, "library")
+        self.revalidate_s = revalidate_s
+        self.entries = {}
+        self._load_manifest()
+
+    def _load_manifest(self):
+        path = os.path.join(self.folder, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Could not read shelf library manifest: {e}")
+            return
+        if data.get("version") == LIBRARY_VERSION:
+            self.entries = data.get("sources", {})
+
+    def _save_manifest(self):
+        atomic_write_json(os.path.join(self.folder, MANIFEST_NAME),
+                          {"version": LIBRARY_VERSION, "sources": self.entries})
+
+    def local_path(self, source):
+        name = hashlib.sha1(os.path.normcase(source).encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.folder, f"{name}.json")
+
+    # ==========================
+    # Revalidate
+    # ==========================
+    def sync(self, force=False, now=None):
+        """Revalidate the sources that are due; returns {source: status}."""
+        now = time.time() if now is None else now
+        results = {}
+        for source in self.sources:
+            entry = self.entries.get(source)
+            local = self.local_path(source)
+            if (not force and entry and os.path.exists(local)
+                    and now - entry.get("checked", 0) < self.revalidate_s):
+                results[source] = SOURCE_CACHED
+                continue
+            results[source] = self._revalidate(source, entry, local, now)
+        if any(status != SOURCE_CACHED for status in results.values()):
+            self._save_manifest()
+        return results
+
+    def _revalidate(self, source, entry, local, now):
+        try:
+            st = os.stat(source)
+            if (entry and os.path.exists(local)
+                    and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns):
+                entry["checked"] = now
+                return SOURCE_UNCHANGED
+            with open(source, "rb") as f:
+                payload = f.read()
+        except OSError as e:
+            if entry and os.path.exists(local):
+                entry["checked"] = now
+                print(f"[WARNING] Studio shelves unreachable, using local copy: {source} ({e})")
+                return SOURCE_OFFLINE
+            print(f"[WARNING] Studio shelves unreachable: {source} ({e})")
+            return SOURCE_MISSING
+
+        digest = hashlib.sha1(payload).hexdigest()
+        status = SOURCE_UNCHANGED
+        if not (entry and entry["sha1"] == digest and os.path.exists(local)):
+            try:
+                payload = self._inline_bodies(json.loads(payload), source) or payload
+            except (OSError, ValueError, AttributeError, TypeError) as e:
+                # Never replace a good copy with a half-deployed file.
+                print(f"[WARNING] Studio shelves are not valid or incomplete, keeping local copy: {source} ({e})")
+                return SOURCE_OFFLINE if entry and os.path.exists(local) else SOURCE_MISSING
+            atomic_write_bytes(local, payload)
+            status = SOURCE_UPDATED
+        self.entries[source] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                "sha1": digest, "checked": now}
+        return status
+
+    def _inline_bodies(self, data, source):
+        # Local copy with the share's out-of-line scripts inlined; None when it has none.
+        bodies = None
+        for tab in data.get("tabs", []):
+            for action in tab.get("actions", []):
+                ref = action.get("command_ref")
+                if ref and not action.get("command"):
+                    bodies = bodies or BodyStore(bodies_dir_for(source))
+                    action["command"] = bodies.get(ref)
+                    del action["command_ref"]
+        if bodies is None:
+            return None
+        return json.dumps(data, indent=4).encode("utf-8")
+
+    # ==========================
+    # Load (local disk only)
+    # ==========================
+    def load(self):
+        """[(source, ShelfModel)] from the local copies, in source order."""
+        models = []
+        for source in self.sources:
+            local = self.local_path(source)
+            if not os.path.exists(local):
+                continue
+            try:
+                with open(local, "r", encoding="utf-8") as f:
+                    models.append((source, ShelfModel.from_dict(json.load(f))))
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[WARNING] Could not read studio shelves {source}: {e}")
+        return models
@@ -0,0 +1,127 @@
+# ==========================
+# Live Action Catalog (built from actionMan)
+# ==========================
+import os
+import json
+
+from .catalog import make_action_id
+from .persistence import atomic_write_bytes
+
+LIVE_STATE_VERSION = 1
+DEFAULT_ICON = "default.png"
+
+
+def _item_id(item):
+    getter = getattr(item, "getId", None) or getattr(item, "getActionId")
+    return getter()
+
+
+def _item_title(item):
+    title = item.getDescription() or ""
+    if not title.strip():
+        title = item.getButtonText() or ""
+    return title.strip()
+
+
+class CatalogBuilder:
+    """Enumerates actionMan's action tables into max_actions.json form.
+
+    `action_man` is pymxs.runtime.actionMan (or the fake in fake_runtime).
+    Every table is fingerprinted by (id, name, item count); refresh() only
+    re-reads the items of tables whose fingerprint changed. The per-table
+    items are kept in a small state file between sessions.
+    """
+
+    def __init__(self, action_man, state_path=None):
+        self.action_man = action_man
+        self.state_path = state_path
+        self.tables = {}  # str(table id) -> {"name", "count", "items": [[category, title, id], ...]}
+        self._load_state()
+
+    def _load_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == LIVE_STATE_VERSION:
+            self.tables = data.get("tables", {})
+
+    def _save_state(self):
+        if self.state_path:
+            payload = json.dumps({"version": LIVE_STATE_VERSION, "tables": self.tables}, separators=(",", ":"))
+            atomic_write_bytes(self.state_path, payload.encode("utf-8"))
+
+    # ==========================
+    # Refresh
+    # ==========================
+    def _read_items(self, table, count):
+        items = []
+        for index in range(1, count + 1):
+            item = table.getActionItem(index)
+            title = _item_title(item)
+            if title:
+                items.append([item.getCategory() or "", title, str(_item_id(item))])
+        return items
+
+    def refresh(self, force=False):
+        """Re-read changed tables; returns stats {"tables", "reread", "actions", "changed"}."""
+        seen = {}
+        reread = 0
+        for number in range(1, self.action_man.numActionTables + 1):
+            table = self.action_man.getActionTable(number)
+            key = str(table.id)
+            name = str(table.name)
+            count = table.numActionItems
+            cached = self.tables.get(key)
+            if not force and cached and cached["name"] == name and cached["count"] == count:
+                seen[key] = cached
+                continue
+            seen[key] = {"name": name, "count": count, "items": self._read_items(table, count)}
+            reread += 1
+
+        changed = reread > 0 or set(seen) != set(self.tables)
+        self.tables = seen
+        if changed:
+            self._save_state()
+        return {"tables": len(seen), "reread": reread,
+                "actions": sum(len(t["items"]) for t in seen.values()), "changed": changed}
+
+    # ==========================
+    # Output
+    # ==========================
+    def groups(self):
+        # max_actions.json layout: groups by category, sorted, titles sorted.
+        by_category = {}
+        for key, table in self.tables.items():
+            context_id = int(key)
+            for category, title, action_id in table["items"]:
+                by_category.setdefault(category or table["name"], []).append({
+                    "title": title,
+                    "command": f'actionMan.executeAction {context_id} "{action_id}"',
+                    "shortcut": "",
+                    "icon": DEFAULT_ICON,
+                    "Cat": category or table["name"],
+                    "ID": make_action_id(context_id, action_id),
+                })
+        return [{"GroupName": name, "Actions": sorted(actions, key=lambda a: a["title"].lower())}
+                for name, actions in sorted(by_category.items(), key=lambda item: item[0].lower())]
+
+    def write(self, json_path):
+        payload = json.dumps(self.groups(), indent=1, ensure_ascii=False)
+        atomic_write_bytes(json_path, payload.encode("utf-8"))
+
+
+def build_live_catalog(action_man, json_path, state_path=None, force=False):
+    """Refresh from actionMan and (re)write json_path when anything changed.
+
+    An unchanged 3ds Max only costs one fingerprint pass over the tables;
+    the catalog file keeps its mtime, so the catalog caches stay valid."""
+    builder = CatalogBuilder(action_man, state_path)
+    stats = builder.refresh(force)
+    if stats["changed"] or force or not os.path.exists(json_path):
+        builder.write(json_path)
+        stats["written"] = True
+    return stats
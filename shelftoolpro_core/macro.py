@@ -0,0 +1,92 @@
+# ==========================
+# Macro tools: several shelf tools in one undo step
+# ==========================
+import uuid
+
+from .catalog import split_action_id
+from .dispatch import top_level_only, needs_top_level
+
+MACRO_TYPE = "macro"
+
+
+def is_macro(action_data):
+    return action_data.get("type") == MACRO_TYPE
+
+
+def new_uid():
+    return uuid.uuid4().hex[:12]
+
+
+def make_macro(title, step_uids, icon="", shortcut=""):
+    return {"title": title, "icon": icon, "command": "", "shortcut": shortcut, "ID": None,
+            "uid": new_uid(), "type": MACRO_TYPE, "steps": list(step_uids)}
+
+
+def uid_index(model):
+    return {action["uid"]: action for tab in model.tabs for action in tab.actions if action.get("uid")}
+
+
+def macro_steps(macro, index):
+    """The macro's tools in order, nested macros expanded.
+
+    Returns (tools, missing uids); a macro that (indirectly) contains itself
+    is expanded only once."""
+    tools = []
+    missing = []
+
+    def expand(current, seen):
+        for uid in current.get("steps", []):
+            tool = index.get(uid)
+            if tool is None:
+                missing.append(uid)
+            elif is_macro(tool):
+                if uid not in seen:
+                    expand(tool, seen | {uid})
+            else:
+                tools.append(tool)
+
+    expand(macro, {macro.get("uid")})
+    return tools, missing
+
+
+def maxscript_string(text):
+    # A one-line MAXScript string literal holding `text`
+    text = text.replace("\\", "\\\\").replace('"', '\\"')
+    return '"' + text.replace("\r\n", "\n").replace("\r", "\n").replace("\n", "\\n") + '"'
+
+
+def step_script(tool):
+    command = (tool.get("command") or "").strip()
+    if command:
+        if top_level_only(command):
+            raise ValueError(f"{tool.get('title', '')!r} defines a macroScript/plugin and cannot run inside a macro")
+        if needs_top_level(command):
+            # Rollouts, fns, structs, implicit globals: inside the step's block
+            # they would be locals. execute() runs at global scope, still
+            # within the macro's undo context.
+            return f"execute {maxscript_string(command)}"
+        return command
+    if tool.get("ID"):
+        context_id, action_id = split_action_id(tool["ID"])
+        return f'actionMan.executeAction {context_id} "{action_id}"'
+    return ""
+
+
+def macro_script(macro, tools):
+    """One MAXScript block running every step inside a single undo context.
+
+    The text only changes when a step changes, so the dispatcher's
+    compile-once cache parses it once per macro. Steps that must run at top
+    level (see dispatch.needs_top_level) are embedded as `execute "..."`."""
+    label = maxscript_string(macro.get("title") or "Shelf Macro")
+    lines = [f"undo {label} on", "("]
+    for number, tool in enumerate(tools, 1):
+        script = step_script(tool)
+        if script:
+            lines.append(f"    -- {number}: {tool.get('title', '')}".rstrip())
+            lines.append("    (")
+            lines.extend("        " + line for line in script.splitlines())
+            lines.append("    )")
+    lines.append("    ok")
+    lines.append(")")
+    return "\n".join(lines)
@@ -0,0 +1,324 @@
+# ==========================
+# MacroScript (.mcr / .ms) bulk import
+# ==========================
+import os
+import re
+import sys
+import json
+import hashlib
+import multiprocessing
+from multiprocessing import spawn
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .persistence import atomic_write_bytes
+
+IMPORT_INDEX_VERSION = 1
+MACRO_EXTENSIONS = (".mcr", ".ms")
+PARALLEL_MIN_FILES = 64  # below this a pool costs more than it saves
+DEFAULT_TAB = "MacroScripts"
+IMAGE_EXTENSIONS = (".png", ".bmp", ".jpg", ".jpeg", ".ico")
+# What the user may have changed on an imported tool; a re-import keeps these.
+USER_FIELDS = ("title", "icon", "shortcut")
+
+# Only the tokens that matter for nesting; everything else is skipped by re.
+_TOKEN_RE = re.compile(
+    r'@"[^"]*"'                  # verbatim string
+    r'|"(?:[^"\\]|\\.)*"'        # string
+    r'|--[^\n]*'                 # line comment
+    r'|/\*.*?\*/'                # block comment
+    r'|#\('                      # array literal (icon:#("Main", 3))
+    r'|[()]'
+    r'|\bmacroscript\b',
+    re.IGNORECASE | re.DOTALL)
+_NAME_RE = re.compile(r'\s*("(?:[^"\\]|\\.)*"|[\w.]+)')
+_PROPERTY_RE = re.compile(r'(\w+)\s*:\s*(@"[^"]*"|"(?:[^"\\]|\\.)*"|#\([^)]*\)|[^\s"]+)')
+_HANDLER_RE = re.compile(r'^\s*on\s+\w+\s+(do|return)\b', re.IGNORECASE | re.MULTILINE)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\"}
+
+
+def _unquote(value):
+    if value.startswith('@"'):
+        return value[2:-1]
+    if value.startswith('"'):
+        return re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(0)), value[1:-1])
+    return value
+
+
+def _quote(text):
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+# ==========================
+# Parse
+# ==========================
+def parse_macroscripts(text):
+    """Every top-level `macroScript` definition in a MAXScript source.
+
+    Returns dicts with name, category, buttonText, tooltip, icon (raw header
+    value) and body (text inside the definition's parentheses), plus the
+    whole definition as `source`."""
+    macros = []
+    depth = 0
+    start = None   # (keyword start, header start) of the macroScript being read
+    body_start = None
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group()
+        first = token[0]
+        if first in '"@-/':
+            continue
+        if token == "#(":
+            depth += 1
+        elif token == "(":
+            if start is not None and body_start is None and depth == 0:
+                body_start = match.end()
+            depth += 1
+        elif token == ")":
+            depth = max(0, depth - 1)
+            if depth == 0 and body_start is not None:
+                macro = _make_macro(text[start[1]:body_start - 1], text[body_start:match.start()])
+                if macro:
+                    macro["source"] = text[start[0]:match.end()]
+                    macros.append(macro)
+                start = body_start = None
+        elif depth == 0:
+            start = (match.start(), match.end())
+            body_start = None
+    return macros
+
+
+def _make_macro(header, body):
+    name = _NAME_RE.match(header)
+    if not name:
+        return None
+    props = {key.lower(): value for key, value in _PROPERTY_RE.findall(header[name.end():])}
+    return {
+        "name": _unquote(name.group(1)),
+        "category": _unquote(props.get("category", "")),
+        "buttonText": _unquote(props.get("buttontext", "")),
+        "tooltip": _unquote(props.get("tooltip", "")),
+        "icon": props.get("icon", ""),
+        "body": body,
+    }
+
+
+def parse_file(path, known_sha1=None):
+    """Worker: read + hash one file, parse it unless the hash is `known_sha1`.
+
+    Returns {"path", "size", "mtime_ns", "sha1", "macros" (None = unchanged),
+    "error"}; top level so a process pool can pickle it."""
+    result = {"path": path, "size": 0, "mtime_ns": 0, "sha1": "", "macros": None, "error": None}
+    try:
+        st = os.stat(path)
+        with open(path, "rb") as f:
+            payload = f.read()
+    except OSError as e:
+        result["error"] = str(e)
+        return result
+    result["size"], result["mtime_ns"] = st.st_size, st.st_mtime_ns
+    result["sha1"] = hashlib.sha1(payload).hexdigest()
+    if result["sha1"] == known_sha1:
+        return result
+    try:
+        text = payload.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = payload.decode("latin-1")  # ANSI MacroScripts
+    result["macros"] = parse_macroscripts(text)
+    return result
+
+
+# ==========================
+# Worker pool
+# ==========================
+def python_executable():
+    """A python interpreter for worker processes, or None.
+
+    Inside 3ds Max sys.executable is 3dsmax.exe; spawning that would start
+    another 3ds Max, so the bundled python.exe is looked up instead."""
+    exe = sys.executable or ""
+    if os.path.basename(exe).lower().startswith("python"):
+        return exe
+    for candidate in (os.path.join(sys.exec_prefix, "python.exe"),
+                      os.path.join(os.path.dirname(exe), "Python", "python.exe"),
+                      os.path.join(sys.exec_prefix, "bin", "python3")):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _run_pool(jobs, workers):
+    if len(jobs) < PARALLEL_MIN_FILES:
+        return [parse_file(path, sha1) for path, sha1 in jobs]
+    paths = [path for path, _ in jobs]
+    known = [sha1 for _, sha1 in jobs]
+    workers = workers or os.cpu_count() or 4
+    chunksize = max(1, len(jobs) // (workers * 4))
+    python = python_executable()
+    if python:
+        # The spawn executable is process-wide: put back what 3ds Max (or
+        # another tool) had once the workers are gone.
+        previous = spawn.get_executable()
+        context = multiprocessing.get_context("spawn")
+        context.set_executable(python)
+        try:
+            with ProcessPoolExecutor(workers, mp_context=context) as pool:
+                return list(pool.map(parse_file, paths, known, chunksize=chunksize))
+        except (BrokenProcessPool, OSError) as e:
+            print(f"[WARNING] MacroScript import: process pool failed ({e}), using threads")
+        finally:
+            spawn.set_executable(previous)
+    # Threads still overlap the file reads (network shares); parsing holds the GIL.
+    with ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(parse_file, paths, known))
+
+
+# ==========================
+# Incremental import
+# ==========================
+def find_macro_files(root):
+    found = []
+    for folder, _, files in os.walk(root):
+        for name in files:
+            if name.lower().endswith(MACRO_EXTENSIONS):
+                found.append(os.path.join(folder, name))
+    found.sort()
+    return found
+
+
+class MacroImporter:
+    """Imports MacroScript trees, remembering what each file contained.
+
+    The index (path -> size, mtime, sha1, macros) lets a re-import skip
+    files whose size / mtime are unchanged without opening them, and files
+    that were only touched (same hash) without parsing them.
+    """
+
+    def __init__(self, index_path=None):
+        self.index_path = index_path
+        self.files = {}
+        if index_path and os.path.exists(index_path):
+            try:
+                with open(index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == IMPORT_INDEX_VERSION:
+                    self.files = data.get("files", {})
+            except (OSError, ValueError) as e:
+                print(f"[WARNING] Could not read MacroScript import index: {e}")
+
+    def import_tree(self, root, workers=None):
+        """Returns {"macros", "files", "parsed", "skipped", "errors", "changed"}.
+
+        "changed" lists the files whose contents are new or changed since the
+        last import (their macroScripts need to be defined again)."""
+        paths = find_macro_files(root)
+        jobs = []
+        skipped = 0
+        for path in paths:
+            entry = self.files.get(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                skipped += 1
+            else:
+                jobs.append((path, entry["sha1"] if entry else None))
+
+        errors = []
+        parsed = 0
+        changed = []
+        for result in _run_pool(jobs, workers):
+            path = result["path"]
+            if result["error"]:
+                errors.append((path, result["error"]))
+                continue
+            entry = self.files.get(path)
+            if result["macros"] is None and entry:
+                skipped += 1
+                macros = entry["macros"]
+            else:
+                parsed += 1
+                macros = result["macros"]
+                changed.append(path)
+            self.files[path] = {"size": result["size"], "mtime_ns": result["mtime_ns"],
+                                "sha1": result["sha1"], "macros": macros}
+
+        # Files under root that are gone are forgotten.
+        prefix = os.path.join(os.path.abspath(root), "")
+        present = set(paths)
+        for path in [p for p in self.files if os.path.abspath(p).startswith(prefix) and p not in present]:
+            del self.files[path]
+        if jobs and self.index_path:
+            payload = json.dumps({"version": IMPORT_INDEX_VERSION, "files": self.files}, separators=(",", ":"))
+            atomic_write_bytes(self.index_path, payload.encode("utf-8"))
+
+        macros = [dict(macro, file=path) for path in paths if path in self.files
+                  for macro in self.files[path]["macros"]]
+        return {"macros": macros, "files": len(paths), "parsed": parsed, "skipped": skipped, "errors": errors,
+                "changed": changed}
+
+
+# ==========================
+# MacroScripts -> shelf tools
+# ==========================
+def has_handlers(macro):
+    return bool(_HANDLER_RE.search(macro["body"]))
+
+
+def macro_command(macro):
+    # A plain body runs as a (compiled once) script; one with event handlers
+    # (on execute do ...) runs the macroScript, defined once at import (see
+    # macro_definitions): evaluating a definition makes 3ds Max rewrite its
+    # UserMacros .mcr file, so it must not happen per click.
+    if not has_handlers(macro):
+        return macro["body"].strip()
+    return f'macros.run {_quote(macro["category"])} {_quote(macro["name"])}'
+
+
+def macro_definitions(macros, files):
+    """Sources of the macroScripts from `files` that must be defined in 3ds Max.
+
+    Only macros with event handlers are run through their definition; 3ds
+    Max keeps a defined macroScript across sessions, so files unchanged
+    since the last import are not defined again."""
+    files = set(files)
+    return [macro["source"] for macro in macros if macro.get("file") in files and has_handlers(macro)]
+
+
+def reimport_fields(current, imported):
+    # Fields a re-import changes on a tool already on the shelf. An ID the
+    # shelf filled in from the catalog is kept: the import has none.
+    return {key: value for key, value in imported.items()
+            if key not in USER_FIELDS and current.get(key) != value
+            and not (key == "ID" and value is None)}
+
+
+def macro_icon(macro):
+    # Only image files map to shelf icons; icon:#("Strip", n) has no file.
+    icon = _unquote(macro["icon"]) if macro["icon"].startswith(('"', '@"')) else ""
+    if not icon.lower().endswith(IMAGE_EXTENSIONS):
+        return ""
+    if not os.path.isabs(icon) and macro.get("file"):
+        icon = os.path.join(os.path.dirname(macro["file"]), icon)
+    return icon
+
+
+def macros_to_tabs(macros):
+    """{tab name: [shelf tool dicts]}, one tab per MacroScript category.
+
+    Tools get a stable uid ("mcr:<category>/<name>") so a re-import updates
+    the same tools instead of adding copies (see reimport_fields)."""
+    tabs = {}
+    for macro in macros:
+        category = macro["category"] or DEFAULT_TAB
+        uid = f"mcr:{category}/{macro['name']}"
+        # Defined twice: the later definition wins, as in 3ds Max.
+        tabs.setdefault(category, {})[uid] = {
+            "title": macro["buttonText"] or macro["name"],
+            "icon": macro_icon(macro),
+            "command": macro_command(macro),
+            "shortcut": "",
+            "ID": None,
+            "uid": uid,
+        }
+    return {category: list(tools.values()) for category, tools in tabs.items()}
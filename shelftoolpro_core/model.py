@@ -0,0 +1,212 @@
+# ==========================
+# Shelf Data Model (tabs + tools)
+# ==========================
+
+# Fields written to shelves.json for every tool
+ACTION_FIELDS = ("title", "icon", "command", "shortcut", "ID")
+# Written only when set: "uid" (stable id, e.g. for macro steps), "type" / "steps" (macro tools),
+# "command_ref" (script body kept in the BodyStore; "command" is then empty),
+# "script_path" (a .ms / .py file run instead of the command)
+OPTIONAL_FIELDS = ("uid", "type", "steps", "command_ref", "script_path")
+
+# Tab the UI generates from usage data (see UsageStore); no user tab may take its name
+MOST_USED_TAB = "Most Used"
+RESERVED_TAB_NAMES = (MOST_USED_TAB,)
+
+
+def clean_action(action_data):
+    data = {
+        "title": action_data.get("title", ""),
+        "icon": action_data.get("icon", ""),
+        "command": action_data.get("command", ""),
+        "shortcut": action_data.get("shortcut", ""),
+        "ID": action_data.get("ID", None),
+    }
+    for field in OPTIONAL_FIELDS:
+        if action_data.get(field):
+            data[field] = action_data[field]
+    return data
+
+
+class ShelfTab:
+    def __init__(self, name, actions=None, hidden=False):
+        self.name = name
+        self.actions = list(actions or [])
+        self.hidden = hidden
+
+    def to_dict(self, bodies=None):
+        # bodies: a BodyStore that takes the long scripts out of line
+        if bodies is None:
+            actions = [clean_action(a) for a in self.actions]
+        else:
+            actions = [bodies.externalize(clean_action(a)) for a in self.actions]
+        data = {"name": self.name, "actions": actions}
+        if self.hidden:
+            data["hidden"] = True
+        return data
+
+
+class ShelfModel:
+    """In-memory shelves; the UI renders it and persistence serializes it.
+
+    Every mutation bumps `revision`, sets `dirty` and notifies listeners with
+    (op, payload), so saving can be coalesced instead of rewriting the file
+    after each edit. Tool dicts are shared with the UI (identity matters).
+    """
+
+    def __init__(self, tabs=None):
+        self.tabs = list(tabs or [])
+        self.dirty = False
+        self.revision = 0
+        self._listeners = []
+
+    # ==========================
+    # (De)serialize
+    # ==========================
+    @classmethod
+    def from_dict(cls, data):
+        return cls([ShelfTab(tab["name"], tab.get("actions", []), tab.get("hidden", False))
+                    for tab in data.get("tabs", [])])
+
+    def to_dict(self, bodies=None):
+        return {"tabs": [tab.to_dict(bodies) for tab in self.tabs]}
+
+    # ==========================
+    # Change tracking
+    # ==========================
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _changed(self, op, **payload):
+        self.revision += 1
+        self.dirty = True
+        for listener in list(self._listeners):
+            listener(op, **payload)
+
+    def mark_saved(self, revision=None):
+        # Only clean if nothing changed since the snapshot that was written.
+        if revision is None or revision == self.revision:
+            self.dirty = False
+
+    # ==========================
+    # Lookups
+    # ==========================
+    def tab(self, name):
+        for tab in self.tabs:
+            if tab.name == name:
+                return tab
+        return None
+
+    def tab_names(self):
+        return [tab.name for tab in self.tabs]
+
+    def _require_tab(self, name):
+        tab = self.tab(name)
+        if tab is None:
+            raise KeyError(f"No shelf tab named {name!r}")
+        return tab
+
+    def tab_of(self, action_data):
+        for tab in self.tabs:
+            if any(action is action_data for action in tab.actions):
+                return tab
+        return None
+
+    @staticmethod
+    def _action_index(tab, action_data):
+        for i, action in enumerate(tab.actions):
+            if action is action_data:
+                return i
+        raise ValueError(f"Tool is not on tab {tab.name!r}")
+
+    # ==========================
+    # Tabs
+    # ==========================
+    def _check_new_tab_name(self, name):
+        if name in RESERVED_TAB_NAMES:
+            raise ValueError(f"The tab name {name!r} is reserved")
+        if self.tab(name) is not None:
+            raise ValueError(f"A shelf tab named {name!r} already exists")
+
+    def add_tab(self, name, actions=None, index=None):
+        self._check_new_tab_name(name)
+        tab = ShelfTab(name, actions)
+        index = len(self.tabs) if index is None else index
+        self.tabs.insert(index, tab)
+        self._changed("add_tab", name=name, index=index, actions=[clean_action(a) for a in tab.actions])
+        return tab
+
+    def remove_tab(self, name):
+        tab = self._require_tab(name)
+        self.tabs.remove(tab)
+        self._changed("remove_tab", name=name)
+        return tab
+
+    def rename_tab(self, old_name, new_name):
+        if old_name == new_name:
+            return self._require_tab(old_name)
+        self._check_new_tab_name(new_name)
+        tab = self._require_tab(old_name)
+        tab.name = new_name
+        self._changed("rename_tab", name=old_name, new_name=new_name)
+        return tab
+
+    def set_tab_hidden(self, name, hidden):
+        tab = self._require_tab(name)
+        if tab.hidden != hidden:
+            tab.hidden = hidden
+            self._changed("hide_tab", name=name, hidden=hidden)
+        return tab
+
+    # ==========================
+    # Tools
+    # ==========================
+    def add_action(self, tab_name, action_data, index=None):
+        tab = self._require_tab(tab_name)
+        index = len(tab.actions) if index is None else index
+        tab.actions.insert(index, action_data)
+        self._changed("add_action", name=tab_name, index=index, action=clean_action(action_data))
+        return action_data
+
+    def update_action(self, tab_name, action_data, fields):
+        tab = self._require_tab(tab_name)
+        index = self._action_index(tab, action_data)
+        if "command" in fields and "command_ref" not in fields:
+            # A new script replaces the stored body.
+            action_data.pop("command_ref", None)
+        action_data.update(fields)
+        self._changed("update_action", name=tab_name, index=index, fields=dict(fields))
+        return action_data
+
+    def remove_action(self, tab_name, action_data):
+        tab = self._require_tab(tab_name)
+        index = self._action_index(tab, action_data)
+        del tab.actions[index]
+        self._changed("remove_action", name=tab_name, index=index)
+        return action_data
+
+    # ==========================
+    # Replay a recorded change (see persistence.JournalStore)
+    # ==========================
+    def apply(self, op, payload):
+        name = payload["name"]
+        if op == "add_tab":
+            self.add_tab(name, [dict(a) for a in payload.get("actions", [])], payload.get("index"))
+        elif op == "remove_tab":
+            self.remove_tab(name)
+        elif op == "rename_tab":
+            self.rename_tab(name, payload["new_name"])
+        elif op == "hide_tab":
+            self.set_tab_hidden(name, payload["hidden"])
+        elif op == "add_action":
+            self.add_action(name, dict(payload["action"]), payload.get("index"))
+        elif op == "update_action":
+            self.update_action(name, self._require_tab(name).actions[payload["index"]], payload["fields"])
+        elif op == "remove_action":
+            self.remove_action(name, self._require_tab(name).actions[payload["index"]])
+        else:
+            raise ValueError(f"Unknown shelf change: {op!r}")
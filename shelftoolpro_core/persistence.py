@@ -0,0 +1,271 @@
+# ==========================
+# Shelf Persistence (shelves.json)
+# ==========================
+import os
+import json
+
+from .model import ShelfModel
+
+
+# ==========================
+# Atomic write: temp file + fsync + rename
+# ==========================
+def atomic_write_bytes(filepath, payload):
+    folder = os.path.dirname(os.path.abspath(filepath))
+    os.makedirs(folder, exist_ok=True)
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # A crash before this line leaves the previous file untouched.
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(folder)
+
+
+def _fsync_dir(folder):
+    # Make the rename itself durable (POSIX only; not supported on Windows).
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(filepath, data):
+    atomic_write_bytes(filepath, json.dumps(data, indent=4).encode("utf-8"))
+
+
+# ==========================
+# Model <-> file
+# ==========================
+def save_model(model, filepath, bodies=None):
+    revision = model.revision
+    data = model.to_dict(bodies)
+    atomic_write_json(filepath, data)
+    model.mark_saved(revision)
+    return data
+
+
+def load_model(filepath):
+    with open(filepath, "r", encoding="utf-8") as f:
+        return ShelfModel.from_dict(json.load(f))
+
+
+# ==========================
+# Stores: how the UI loads / saves a shelf file
+# ==========================
+JOURNAL_SUFFIX = ".journal"
+DEFAULT_COMPACT_BYTES = 256 * 1024
+
+STORAGE_SNAPSHOT = "snapshot"
+STORAGE_JOURNAL = "journal"
+
+
+def _body_refs(data):
+    return {action["command_ref"] for tab in data.get("tabs", []) for action in tab.get("actions", [])
+            if action.get("command_ref")}
+
+
+class _BodySweeper:
+    # Sweeps the BodyStore after a full write, the first time in a session
+    # and then only when a body the previous full write referred to is gone.
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._refs = None
+
+    def after_full_write(self, bodies, data):
+        if bodies is None:
+            return
+        refs = _body_refs(data)
+        if self._refs is None or self._refs - refs:
+            try:
+                removed = bodies.sweep(self.filepath)
+            except OSError as e:
+                print(f"[WARNING] Could not remove unused script bodies: {e}")
+            else:
+                if removed:
+                    print(f"[INFO] Removed {removed} unused script bodies")
+        self._refs = refs
+
+
+class SnapshotStore:
+    """Rewrites the whole shelves.json on every save (the default)."""
+
+    def __init__(self, filepath, bodies=None):
+        self.filepath = filepath
+        self.bodies = bodies
+        self._sweeper = _BodySweeper(filepath)
+
+    def load(self):
+        # A journal left behind by journal mode still holds newer edits.
+        if os.path.exists(self.filepath + JOURNAL_SUFFIX):
+            return JournalStore(self.filepath, bodies=self.bodies).load()
+        if not os.path.exists(self.filepath):
+            return ShelfModel()
+        return load_model(self.filepath)
+
+    def attach(self, model):
+        pass
+
+    def detach(self, model):
+        pass
+
+    def save(self, model):
+        data = save_model(model, self.filepath, self.bodies)
+        # The snapshot now holds everything; an old journal would replay twice.
+        if os.path.exists(self.filepath + JOURNAL_SUFFIX):
+            os.remove(self.filepath + JOURNAL_SUFFIX)
+        self._sweeper.after_full_write(self.bodies, data)
+
+
+class JournalStore:
+    """shelves.json snapshot + append-only shelves.json.journal.
+
+    Each model change is appended as one JSON line ({"seq", "op", ...}); the
+    snapshot records the last seq it contains ("journal_seq"), so a crash
+    between writing a snapshot and truncating the journal never replays a
+    change twice. Once the journal passes `compact_bytes` it is folded into a
+    fresh snapshot. With a BodyStore, long scripts go out of line in the
+    journal records too, and bodies left unused are swept at compaction.
+    """
+
+    def __init__(self, filepath, compact_bytes=DEFAULT_COMPACT_BYTES, bodies=None):
+        self.filepath = filepath
+        self.journal_path = filepath + JOURNAL_SUFFIX
+        self.compact_bytes = compact_bytes
+        self.bodies = bodies
+        self._sweeper = _BodySweeper(filepath)
+        self.seq = 0
+        self._pending = []
+        # Until load() has read this file, the first save writes a full snapshot.
+        self._needs_compact = True
+
+    # ==========================
+    # Load: snapshot + replay
+    # ==========================
+    def load(self):
+        snapshot_seq = 0
+        self._needs_compact = False
+        self._pending = []
+        if os.path.exists(self.filepath):
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            snapshot_seq = data.get("journal_seq", 0)
+            model = ShelfModel.from_dict(data)
+        else:
+            model = ShelfModel()
+            self._needs_compact = True
+        self.seq = snapshot_seq
+
+        replayed = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn tail from a crash mid-append: rewrite on next save.
+                        print(f"[WARNING] Ignoring damaged journal record in {self.journal_path}")
+                        self._needs_compact = True
+                        break
+                    if record["seq"] <= snapshot_seq:
+                        continue
+                    try:
+                        model.apply(record["op"], record)
+                    except (KeyError, IndexError, ValueError) as e:
+                        print(f"[WARNING] Skipping journal record {record['seq']}: {e}")
+                    self.seq = record["seq"]
+                    replayed += 1
+            if os.path.getsize(self.journal_path) > self.compact_bytes:
+                self._needs_compact = True
+
+        if (self.bodies is not None and not self.bodies.keeps_refs
+                and any(a.get("command_ref") for tab in model.tabs for a in tab.actions)):
+            # command_storage went back to inline: rewrite with the scripts inline.
+            self._needs_compact = True
+        model.mark_saved()
+        if replayed:
+            print(f"[INFO] Replayed {replayed} shelf journal records")
+        return model
+
+    # ==========================
+    # Record / save
+    # ==========================
+    def attach(self, model):
+        model.add_listener(self._record)
+
+    def detach(self, model):
+        model.remove_listener(self._record)
+
+    def _record(self, op, **payload):
+        self._pending.append(dict(payload, op=op))
+
+    def save(self, model):
+        revision = model.revision
+        if self._needs_compact or not os.path.exists(self.filepath):
+            self.compact(model)
+        elif self._pending:
+            self._append()
+            if os.path.getsize(self.journal_path) > self.compact_bytes:
+                self.compact(model)
+        model.mark_saved(revision)
+
+    def _append(self):
+        lines = []
+        for record in self._pending:
+            if self.bodies is not None:
+                record = self._externalize(record)
+            self.seq += 1
+            record["seq"] = self.seq
+            lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending = []
+
+    def _externalize(self, record):
+        op = record["op"]
+        if op == "add_action":
+            record["action"] = self.bodies.externalize(dict(record["action"]))
+        elif op == "add_tab":
+            record["actions"] = [self.bodies.externalize(dict(a)) for a in record.get("actions", [])]
+        elif op == "update_action":
+            record["fields"] = self.bodies.externalize_fields(record["fields"])
+        return record
+
+    def compact(self, model):
+        # Everything pending is part of the new snapshot.
+        self.seq += len(self._pending)
+        self._pending = []
+        data = model.to_dict(self.bodies)
+        data["journal_seq"] = self.seq
+        atomic_write_json(self.filepath, data)
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "w", encoding="utf-8"):
+                pass
+        self._needs_compact = False
+        self._sweeper.after_full_write(self.bodies, data)
+
+
+def open_store(filepath, mode=STORAGE_SNAPSHOT, compact_bytes=DEFAULT_COMPACT_BYTES, bodies=None):
+    # bodies: BodyStore for long scripts, InlineBodies to write them back inline
+    # (see bodies.py); None writes the tools as they are
+    if mode == STORAGE_JOURNAL:
+        return JournalStore(filepath, compact_bytes, bodies)
+    return SnapshotStore(filepath, bodies)
@@ -0,0 +1,103 @@
+# ==========================
+# Script File Cache (tools that run a .ms / .py file)
+# ==========================
+import os
+import time
+
+DEFAULT_TTL_S = 2.0  # lookups within this reuse the last stat (clicks always stat)
+
+SCRIPT_MAXSCRIPT = "maxscript"
+SCRIPT_PYTHON = "python"
+
+
+def script_kind(path):
+    return SCRIPT_PYTHON if path.lower().endswith(".py") else SCRIPT_MAXSCRIPT
+
+
+def maxscript_call(path):
+    # How a MAXScript block (macro step) runs a python file.
+    return 'python.ExecuteFile @"{}"'.format(path.replace('"', ""))
+
+
+class ScriptFile:
+    __slots__ = ("path", "kind", "key", "text", "code", "error", "checked")
+
+    def __init__(self, path, key, text, checked):
+        self.path = path
+        self.kind = script_kind(path)
+        self.key = key
+        self.text = text
+        self.code = None
+        self.error = None
+        self.checked = checked
+        if self.kind == SCRIPT_PYTHON:
+            try:
+                self.code = compile(text, path, "exec")
+            except SyntaxError as e:
+                self.error = e
+
+
+class ScriptFileCache:
+    """File contents (and compiled python) keyed by (path, size, mtime).
+
+    A click passes fresh=True: the file is stat'ed once, so an edit saved a
+    moment ago is picked up, and re-read / recompiled only when size or
+    mtime changed. Other lookups reuse a check younger than `ttl_s` for a
+    dict lookup, e.g. the steps of a macro right after revalidate() stat'ed
+    the whole batch in one pass. MAXScript text is compiled by the
+    CommandDispatcher, which keys on the text: the caller gets the replaced
+    text back so it can drop the stale compile.
+    """
+
+    def __init__(self, ttl_s=DEFAULT_TTL_S):
+        self.ttl_s = ttl_s
+        self._files = {}
+        self.stats = 0
+        self.reads = 0
+
+    def _stat(self, path):
+        self.stats += 1
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+
+    def _read(self, path, key, now):
+        with open(path, "r", encoding="utf-8-sig") as f:
+            text = f.read()
+        self.reads += 1
+        script = self._files[path] = ScriptFile(path, key, text, now)
+        return script
+
+    def get(self, path, now=None, fresh=False):
+        """(ScriptFile, replaced text or None); OSError if never readable."""
+        now = time.monotonic() if now is None else now
+        script = self._files.get(path)
+        if script is not None and not fresh and now - script.checked < self.ttl_s:
+            return script, None
+        try:
+            key = self._stat(path)
+        except OSError as e:
+            if script is None:
+                raise
+            # Share hiccup: keep running the last good copy.
+            print(f"[WARNING] Could not check {path}, using cached copy: {e}")
+            script.checked = now
+            return script, None
+        if script is not None and script.key == key:
+            script.checked = now
+            return script, None
+        old_text = script.text if script is not None else None
+        return self._read(path, key, now), old_text
+
+    def revalidate(self, paths, now=None, fresh=False):
+        """get() for several files at once; returns the replaced texts."""
+        now = time.monotonic() if now is None else now
+        replaced = []
+        for path in dict.fromkeys(paths):
+            try:
+                _, old_text = self.get(path, now, fresh)
+            except OSError as e:
+                print(f"[WARNING] Script file not found: {path} ({e})")
+                continue
+            if old_text is not None:
+                replaced.append(old_text)
+        return replaced
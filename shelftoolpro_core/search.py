@@ -0,0 +1,380 @@
+# ==========================
+# Action Search Index (Add Tool dialog)
+# ==========================
+import re
+import heapq
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Per-term scores, best first
+SCORE_WORD = 100        # "snap"      -> "Toggle Snap"
+SCORE_WORD_PREFIX = 80  # "sna"       -> "Toggle Snap"
+SCORE_SUBSTRING = 60    # "ggle"      -> "Toggle Snap"
+SCORE_ACRONYM = 50      # "ts"        -> "Toggle Snap"
+SCORE_FUZZY = 30        # "tgl"       -> "Toggle Snap"
+SCORE_OTHER_FIELD = 10  # only matched in group name / command
+SCORE_FRECENCY_MAX = 40 # bonus for often / recently used actions (see usage.py)
+
+ACRONYM_KEY = 4             # initials substrings indexed up to this length
+DIRECT_SCORE_LIMIT = 2000   # below this, re-score rows instead of walking postings
+RESCORE_COST = 8            # re-scoring a row costs about this many posting entries
+RESULT_LIMIT = 1000         # rows shown for a query; broad prefixes ("s") match half a catalog
+
+
+def _words(text):
+    return _WORD_RE.findall(text.lower())
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _is_subsequence(term, word):
+    pos = 0
+    for ch in term:
+        pos = word.find(ch, pos) + 1
+        if not pos:
+            return False
+    return True
+
+
+def query_terms(query):
+    return _words(query)
+
+
+def action_terms(action, group_name=""):
+    # (words, adjacent title initials) an action contributes to a shard's term index
+    title_words = _words(action.get("title") or "")
+    words = set(title_words)
+    words.update(_words("{} {}".format(group_name, action.get("command") or "")))
+    initials = "".join(word[0] for word in title_words)
+    return words, {initials[i:i + 2] for i in range(len(initials) - 1)}
+
+
+def term_may_match(term, words, initial_pairs):
+    """False only if no action with these words / title initials can match
+    `term` in a SearchIndex (word, prefix, substring, fuzzy or acronym)."""
+    if len(term) > 1 and all(term[i:i + 2] in initial_pairs for i in range(len(term) - 1)):
+        return True
+    head = term[0]
+    for word in words:
+        if word[0] == head and _is_subsequence(term, word):
+            return True
+        if len(term) >= 3 and term in word:
+            return True
+    return False
+
+
+# ==========================
+# Index
+# ==========================
+class SearchIndex:
+    """Inverted index over title, group name and command words.
+
+    Terms are matched against the vocabulary (unique words, via a trigram and
+    first-letter index), never against every action, then expanded through
+    the word -> actions postings. Documents are addressed by their position in
+    the list passed in (and to later add() calls), so results can be used
+    directly as row numbers.
+    """
+
+    def __init__(self, actions=()):
+        self.size = 0
+        self._vocab = {}
+        self._words = []
+        self._word_trigrams = {}
+        self._word_heads = {}
+        self._title_postings = []
+        self._other_postings = []
+        self._acronyms = {}
+        self._doc_title_words = []
+        self._doc_other_words = []
+        self._doc_initials = []
+        self._doc_title_len = []
+        self._term_cache = {}
+        self.add(actions)
+
+    def add(self, actions):
+        # Index more documents, numbered after the existing ones.
+        first = self.size
+        self.size += len(actions)
+        self._term_cache.clear()
+        for doc, action in enumerate(actions, first):
+            title = action.get("title") or ""
+            title_words = [self._word_id(w) for w in _words(title)]
+            other_words = [self._word_id(w) for w in
+                           _words("{} {}".format(action.get("_GroupName", ""), action.get("command", "")))]
+            for wid in title_words:
+                self._title_postings[wid].add(doc)
+            for wid in other_words:
+                self._other_postings[wid].add(doc)
+
+            initials = "".join(self._words[wid][0] for wid in title_words)
+            for i in range(len(initials)):
+                for j in range(i + 2, min(i + ACRONYM_KEY, len(initials)) + 1):
+                    self._acronyms.setdefault(initials[i:j], set()).add(doc)
+
+            self._doc_title_words.append(tuple(title_words))
+            self._doc_other_words.append(tuple(other_words))
+            self._doc_initials.append(initials)
+            self._doc_title_len.append(len(title))
+
+    def _word_id(self, word):
+        wid = self._vocab.get(word)
+        if wid is None:
+            wid = self._vocab[word] = len(self._words)
+            self._words.append(word)
+            self._title_postings.append(set())
+            self._other_postings.append(set())
+            self._word_heads.setdefault(word[0], set()).add(wid)
+            for gram in _trigrams(word):
+                self._word_trigrams.setdefault(gram, set()).add(wid)
+        return wid
+
+    # ==========================
+    # Term -> matching vocabulary words
+    # ==========================
+    def _term_words(self, term):
+        """{word id: score} for every vocabulary word the term matches.
+
+        Terms under 3 chars only match at word starts (prefix / fuzzy); longer
+        terms also match inside words."""
+        cached = self._term_cache.get(term)
+        if cached is not None:
+            return cached
+
+        candidates = set(self._word_heads.get(term[0], ()))
+        if len(term) >= 3:
+            grams = _trigrams(term)
+            inside = None
+            for gram in grams:
+                posting = self._word_trigrams.get(gram, set())
+                inside = set(posting) if inside is None else inside & posting
+                if not inside:
+                    break
+            candidates |= inside
+
+        matches = {}
+        for wid in candidates:
+            word = self._words[wid]
+            if word == term:
+                matches[wid] = SCORE_WORD
+            elif word.startswith(term):
+                matches[wid] = SCORE_WORD_PREFIX
+            elif len(term) >= 3 and term in word:
+                matches[wid] = SCORE_SUBSTRING
+            elif word[0] == term[0] and _is_subsequence(term, word):
+                matches[wid] = SCORE_FUZZY
+
+        if len(self._term_cache) > 256:
+            self._term_cache.clear()
+        self._term_cache[term] = matches
+        return matches
+
+    def _acronym_docs(self, term):
+        if len(term) < 2:
+            return set()
+        docs = self._acronyms.get(term[:ACRONYM_KEY], set())
+        if len(term) > ACRONYM_KEY:
+            docs = {d for d in docs if term in self._doc_initials[d]}
+        return docs
+
+    # ==========================
+    # Scoring
+    # ==========================
+    def _score_term(self, doc, term):
+        matches = self._term_words(term)
+        best = 0
+        for wid in self._doc_title_words[doc]:
+            s = matches.get(wid, 0)
+            if s > best:
+                best = s
+        if best < SCORE_ACRONYM and len(term) > 1 and term in self._doc_initials[doc]:
+            best = SCORE_ACRONYM
+        if not best:
+            for wid in self._doc_other_words[doc]:
+                if wid in matches and (len(term) >= 3 or self._words[wid].startswith(term)):
+                    return SCORE_OTHER_FIELD
+        return best
+
+    def _term_docs(self, term):
+        # {doc: score} through the postings, for a term over the whole catalog.
+        matches = self._term_words(term)
+        scores = {}
+        for wid, s in matches.items():
+            if len(term) >= 3 or s >= SCORE_WORD_PREFIX:
+                for doc in self._other_postings[wid]:
+                    scores[doc] = SCORE_OTHER_FIELD
+        for doc in self._acronym_docs(term):
+            scores[doc] = SCORE_ACRONYM
+        for wid, s in matches.items():
+            for doc in self._title_postings[wid]:
+                if scores.get(doc, 0) < s:
+                    scores[doc] = s
+        return scores
+
+    def _term_tiers(self, term):
+        # The docs of _term_docs() grouped by score, best first, as sets.
+        matches = self._term_words(term)
+        by_score = {}
+        for wid, s in matches.items():
+            by_score.setdefault(s, []).append(self._title_postings[wid])
+        by_score.setdefault(SCORE_ACRONYM, []).append(self._acronym_docs(term))
+        by_score[SCORE_OTHER_FIELD] = [self._other_postings[wid] for wid, s in matches.items()
+                                       if len(term) >= 3 or s >= SCORE_WORD_PREFIX]
+        return [set().union(*by_score[s]) for s in sorted(by_score, reverse=True)]
+
+    def _top_docs(self, term, docs, boost, limit):
+        """Best `limit` docs for a single term without scoring every match.
+
+        Score tiers are taken best first and the walk stops at the tier that
+        fills the limit; only that tier is ordered (by title length). Boosted
+        docs may jump tiers, so they are scored individually."""
+        boost = boost or {}
+        lengths = self._doc_title_len
+        allowed = None if docs is None else (docs if isinstance(docs, (set, frozenset)) else set(docs))
+        seen = set(boost)
+        picked = []
+        for tier in self._term_tiers(term):
+            tier -= seen
+            if allowed is not None:
+                tier &= allowed
+            seen |= tier
+            need = limit - len(picked)
+            if len(tier) > need:
+                picked.extend(heapq.nsmallest(need, sorted(tier), key=lengths.__getitem__))
+                break
+            picked.extend(sorted(tier, key=lengths.__getitem__))
+        scored = [(-self._score_term(d, term), lengths[d], d) for d in picked]
+        for doc, bonus in boost.items():
+            if doc < self.size and (allowed is None or doc in allowed):
+                s = self._score_term(doc, term)
+                if s:
+                    scored.append((-s - bonus, lengths[doc], doc))
+        return heapq.nsmallest(limit, scored)
+
+    def _estimate(self, term):
+        return sum(len(self._title_postings[wid]) + len(self._other_postings[wid])
+                   for wid in self._term_words(term))
+
+    def score(self, doc, terms):
+        total = 0
+        for term in terms:
+            s = self._score_term(doc, term)
+            if not s:
+                return 0
+            total += s
+        return total
+
+    # ==========================
+    # Search
+    # ==========================
+    def search(self, query, docs=None, boost=None, limit=None):
+        """Return matching doc numbers, best first.
+
+        `docs` restricts the search to an earlier result set (incremental
+        narrowing) or to one category. `boost` ({doc: bonus}) is added to
+        the text score, so used actions rise within and across score tiers.
+        With `limit`, only the best `limit` matches are returned; they are
+        picked with a heap, so a one-letter query does not sort the whole
+        catalog.
+        """
+        terms = _words(query)
+        if not terms:
+            docs = range(self.size) if docs is None else sorted(docs)
+            if not boost:
+                return list(docs)
+            return sorted(docs, key=lambda d: -boost.get(d, 0))
+
+        if limit is not None and len(terms) == 1 and (docs is None or len(docs) > DIRECT_SCORE_LIMIT):
+            return [doc for _, _, doc in self._top_docs(terms[0], docs, boost, limit)]
+
+        if docs is not None and (len(docs) <= DIRECT_SCORE_LIMIT
+                                 or len(docs) <= min(self._estimate(t) for t in terms)):
+            scored = []
+            for doc in docs:
+                s = self.score(doc, terms)
+                if s:
+                    scored.append((-s, self._doc_title_len[doc], doc))
+        else:
+            # Most selective term first; once few rows are left, re-score
+            # them instead of expanding the postings of the broader terms.
+            terms = sorted(terms, key=self._estimate)
+            totals = self._term_docs(terms[0])
+            if docs is not None:
+                allowed = docs if isinstance(docs, (set, frozenset)) else set(docs)
+                totals = {d: s for d, s in totals.items() if d in allowed}
+            for term in terms[1:]:
+                if len(totals) <= DIRECT_SCORE_LIMIT or len(totals) * RESCORE_COST <= self._estimate(term):
+                    totals = {d: s + t for d, s in totals.items() for t in (self._score_term(d, term),) if t}
+                else:
+                    scores = self._term_docs(term)
+                    totals = {d: s + scores[d] for d, s in totals.items() if d in scores}
+                if not totals:
+                    break
+            scored = [(-s, self._doc_title_len[d], d) for d, s in totals.items()]
+
+        if boost:
+            scored = [(s - boost.get(d, 0), n, d) for s, n, d in scored]
+        if limit is not None and len(scored) > limit:
+            scored = heapq.nsmallest(limit, scored)
+        else:
+            scored.sort()
+        return [doc for _, _, doc in scored]
+
+
+# ==========================
+# Per-dialog search session
+# ==========================
+class SearchSession:
+    """Remembers previous results so each extra keystroke only re-checks the
+    rows that matched one character ago (and backspace is a cache hit).
+
+    Results are capped at `limit` rows; a capped result is not a complete
+    match set, so later keystrokes never narrow from it."""
+
+    def __init__(self, index, max_history=32, boost=None, limit=RESULT_LIMIT):
+        self.index = index
+        self.max_history = max_history
+        self.boost = boost
+        self.limit = limit
+        self.scope_name = None
+        self._scope = None
+        self._history = {}
+
+    def set_scope(self, docs, name=None):
+        # None = whole catalog, otherwise an iterable of doc numbers (category).
+        self.scope_name = name
+        self._scope = None if docs is None else frozenset(docs)
+        self._history.clear()
+
+    @staticmethod
+    def _narrows(previous, key):
+        # True when every match of `key` is also a match of `previous`.
+        if not previous or not key.startswith(previous):
+            return False
+        if len(key) == len(previous) or key[len(previous)] == " ":
+            return True
+        # The last term grew: only safe once it is past the short-term rules.
+        return len(previous.rsplit(" ", 1)[-1]) >= 3
+
+    def search(self, query):
+        key = " ".join(_words(query))
+        if key in self._history:
+            return self._history[key]
+
+        base = self._scope
+        best = ""
+        for previous, rows in self._history.items():
+            if (len(previous) > len(best) and self._narrows(previous, key)
+                    and (self.limit is None or len(rows) < self.limit)):
+                best = previous
+        if best:
+            base = self._history[best]
+
+        result = self.index.search(key, docs=base, boost=self.boost, limit=self.limit if key else None)
+
+        if len(self._history) >= self.max_history:
+            self._history.pop(next(iter(self._history)))
+        self._history[key] = result
+        return result
@@ -0,0 +1,219 @@
+# ==========================
+# Sharded Action Catalog (one file per action group)
+# ==========================
+import os
+import json
+import hashlib
+
+from .catalog import ActionCatalog, DEFAULT_CACHE_DIR, parse_action_command, make_action_id, _stat_key, _file_hash
+from .persistence import atomic_write_bytes
+from .search import query_terms, action_terms, term_may_match
+
+SHARD_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+TERMS_NAME = "terms.json"  # per group: search words + title initial pairs
+
+# In-process: reopening the dock keeps the shards that are already loaded.
+_memo = {}
+
+
+def _write_compact_json(filepath, data):
+    atomic_write_bytes(filepath, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+
+def shard_dir_for(json_path, cache_dir=DEFAULT_CACHE_DIR):
+    name = hashlib.sha1(os.path.normcase(os.path.abspath(json_path)).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_dir, f"shards-{name}")
+
+
+# ==========================
+# Build: max_actions.json -> manifest + shards
+# ==========================
+def build_shards(json_path, shard_dir, groups=None, source=None):
+    """Split a catalog into per-group shard files plus a small manifest.
+
+    The manifest (group names, counts, shard file, action ID -> group) is
+    written last, so a half-written shard set is never picked up. The term
+    index lets a search find the groups worth loading (see groups_matching)."""
+    if groups is None:
+        with open(json_path, "r", encoding="utf-8") as f:
+            groups = json.load(f)
+    if source is None:
+        size, mtime_ns = _stat_key(json_path)
+        source = {"path": os.path.abspath(json_path), "size": size, "mtime_ns": mtime_ns,
+                  "sha1": _file_hash(json_path)}
+
+    os.makedirs(shard_dir, exist_ok=True)
+    entries = []
+    ids = {}
+    terms = []
+    for number, group in enumerate(groups):
+        file_name = f"g{number:04d}.json"
+        actions = group.get("Actions", [])
+        words, pairs = set(), set()
+        for action in actions:
+            action_words, action_pairs = action_terms(action, group.get("GroupName", ""))
+            words |= action_words
+            pairs |= action_pairs
+            action_id = action.get("ID")
+            if not action_id:
+                parsed = parse_action_command(action.get("command"))
+                action_id = make_action_id(*parsed) if parsed else None
+            if action_id:
+                ids.setdefault(action_id, number)
+        _write_compact_json(os.path.join(shard_dir, file_name),
+                            {"GroupName": group.get("GroupName", ""), "Actions": actions})
+        entries.append({"name": group.get("GroupName", ""), "count": len(actions), "file": file_name})
+        terms.append([" ".join(sorted(words)), " ".join(sorted(pairs))])
+
+    _write_compact_json(os.path.join(shard_dir, TERMS_NAME), terms)
+    manifest = {"version": SHARD_VERSION, "source": source, "groups": entries, "ids": ids}
+    _write_compact_json(os.path.join(shard_dir, MANIFEST_NAME), manifest)
+    return manifest
+
+
+def _read_manifest(shard_dir):
+    try:
+        with open(os.path.join(shard_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == SHARD_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+# ==========================
+# Load on demand
+# ==========================
+class ShardedCatalog:
+    """Catalog whose groups are read one shard at a time.
+
+    Only the manifest is read up front. `catalog` is a regular
+    ActionCatalog that grows as shards are loaded (load_group / load_next),
+    so row numbers handed out earlier stay valid.
+    """
+
+    def __init__(self, shard_dir, manifest):
+        self.shard_dir = shard_dir
+        self.manifest = manifest
+        self.catalog = ActionCatalog()
+        self._groups = {entry["name"]: number for number, entry in enumerate(manifest["groups"])}
+        self._loaded = set()
+        self._terms = None
+
+    def __len__(self):
+        return self.total
+
+    @property
+    def total(self):
+        return sum(entry["count"] for entry in self.manifest["groups"])
+
+    def group_names(self):
+        return [entry["name"] for entry in self.manifest["groups"]]
+
+    def group_count(self, name):
+        number = self._groups.get(name)
+        return 0 if number is None else self.manifest["groups"][number]["count"]
+
+    def is_loaded(self, name):
+        return self._groups.get(name) in self._loaded
+
+    @property
+    def complete(self):
+        return len(self._loaded) == len(self.manifest["groups"])
+
+    def pending_groups(self):
+        return [entry["name"] for number, entry in enumerate(self.manifest["groups"])
+                if number not in self._loaded]
+
+    def _term_index(self):
+        # [(words, initial pairs)] per group, read on the first search
+        if self._terms is None:
+            try:
+                with open(os.path.join(self.shard_dir, TERMS_NAME), "r", encoding="utf-8") as f:
+                    self._terms = [(words.split(), set(pairs.split())) for words, pairs in json.load(f)]
+            except (OSError, ValueError) as e:
+                print(f"[WARNING] Could not read catalog term index, searching every group: {e}")
+                self._terms = []
+        return self._terms
+
+    def groups_matching(self, query):
+        """Pending groups that may hold a match for `query`; loading just
+        these gives the same results as a search over the whole catalog."""
+        terms = query_terms(query)
+        if not terms:
+            return []
+        index = self._term_index()
+        return [entry["name"] for number, entry in enumerate(self.manifest["groups"])
+                if number not in self._loaded
+                and (number >= len(index) or all(term_may_match(t, *index[number]) for t in terms))]
+
+    def load_group(self, name):
+        # Rows of the group in `catalog` (an empty range if already loaded / unknown).
+        number = self._groups.get(name)
+        if number is None or number in self._loaded:
+            return range(0)
+        entry = self.manifest["groups"][number]
+        with open(os.path.join(self.shard_dir, entry["file"]), "r", encoding="utf-8") as f:
+            group = json.load(f)
+        self._loaded.add(number)
+        return self.catalog.add_group(group)
+
+    def load_next(self, prefer=None):
+        # Load `prefer` if it is still pending, else the next pending group.
+        if prefer and not self.is_loaded(prefer) and prefer in self._groups:
+            return prefer, self.load_group(prefer)
+        for number, entry in enumerate(self.manifest["groups"]):
+            if number not in self._loaded:
+                return entry["name"], self.load_group(entry["name"])
+        return None, range(0)
+
+    def load_all(self):
+        while not self.complete:
+            self.load_next()
+        return self.catalog
+
+    def ensure_id(self, action_id):
+        # Catalog action for an ID, loading its group if needed.
+        action = self.catalog.by_id(action_id)
+        if action is None:
+            number = self.manifest["ids"].get(action_id)
+            if number is not None:
+                self.load_group(self.manifest["groups"][number]["name"])
+                action = self.catalog.by_id(action_id)
+        return action
+
+
+def open_sharded_catalog(json_path, cache_dir=DEFAULT_CACHE_DIR):
+    """ShardedCatalog for max_actions.json, (re)building the shards when the
+    source file changed (size / mtime, then content hash)."""
+    json_path = os.path.abspath(json_path)
+    shard_dir = shard_dir_for(json_path, cache_dir)
+    size, mtime_ns = _stat_key(json_path)
+
+    memo = _memo.get(shard_dir)
+    if memo and memo.manifest["source"]["size"] == size and memo.manifest["source"]["mtime_ns"] == mtime_ns:
+        return memo
+
+    manifest = _read_manifest(shard_dir)
+    if manifest and manifest["source"]["path"] == json_path:
+        source = manifest["source"]
+        if source["size"] == size and source["mtime_ns"] == mtime_ns:
+            return _remember(ShardedCatalog(shard_dir, manifest))
+        digest = _file_hash(json_path)
+        if source["size"] == size and source["sha1"] == digest:
+            source["mtime_ns"] = mtime_ns
+            _write_compact_json(os.path.join(shard_dir, MANIFEST_NAME), manifest)
+            return _remember(ShardedCatalog(shard_dir, manifest))
+    else:
+        digest = _file_hash(json_path)
+
+    manifest = build_shards(json_path, shard_dir,
+                            source={"path": json_path, "size": size, "mtime_ns": mtime_ns, "sha1": digest})
+    return _remember(ShardedCatalog(shard_dir, manifest))
+
+
+def _remember(sharded):
+    _memo[sharded.shard_dir] = sharded
+    return sharded
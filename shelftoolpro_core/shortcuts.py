@@ -0,0 +1,151 @@
+# ==========================
+# Shortcut Registry (one key -> one shelf tool)
+# ==========================
+import re
+
+_MODIFIERS = ("Ctrl", "Shift", "Alt", "Meta")
+_MODIFIER_ALIASES = {
+    "ctrl": "Ctrl", "control": "Ctrl",
+    "shift": "Shift",
+    "alt": "Alt", "option": "Alt",
+    "meta": "Meta", "cmd": "Meta", "command": "Meta", "win": "Meta",
+}
+# Qt PortableText key names
+_KEY_NAMES = {
+    "esc": "Esc", "escape": "Esc", "del": "Del", "delete": "Del", "ins": "Ins", "insert": "Ins",
+    "pgup": "PgUp", "pageup": "PgUp", "pgdown": "PgDown", "pagedown": "PgDown",
+    "return": "Return", "enter": "Enter", "space": "Space", "tab": "Tab", "backspace": "Backspace",
+    "home": "Home", "end": "End", "left": "Left", "right": "Right", "up": "Up", "down": "Down",
+    "pause": "Pause", "print": "Print",
+}
+_FUNCTION_KEY_RE = re.compile(r"^f([1-9]|[12]\d|3[0-5])$", re.IGNORECASE)
+
+
+def normalize_shortcut(text):
+    """Canonical form of a single key combination ("shift+ctrl+a" -> "Ctrl+Shift+A").
+
+    Returns "" for no shortcut and None for something that is not a single
+    key combination (unknown key, modifier only, multi-key sequence)."""
+    text = (text or "").strip()
+    if not text:
+        return ""
+    if ", " in text:
+        return None
+    parts = [p.strip() for p in text.split("+")]
+    if text.endswith("+"):
+        # "Ctrl++" / "+": the key itself is plus; "Ctrl+" has no key
+        if text != "+" and not text.endswith("++"):
+            return None
+        parts = parts[:-2] + ["+"]
+    *modifier_parts, key = parts
+
+    modifiers = set()
+    for part in modifier_parts:
+        modifier = _MODIFIER_ALIASES.get(part.lower())
+        if modifier is None:
+            return None
+        modifiers.add(modifier)
+
+    if len(key) == 1 and key.isprintable() and not key.isspace():
+        key = key.upper()
+    elif _FUNCTION_KEY_RE.match(key):
+        key = key.upper()
+    else:
+        key = _KEY_NAMES.get(key.lower())
+        if key is None:
+            return None
+    return "+".join([m for m in _MODIFIERS if m in modifiers] + [key])
+
+
+class ShortcutRegistry:
+    """Normalized key -> shelf tool, the single source of shelf shortcuts.
+
+    Tools are shelf tool dicts (identity, like ShelfModel). The first tool
+    bound to a key owns it; later ones wait in line (conflicts()) and take
+    over when the owner is unbound. `on_added(key)` / `on_removed(key)` fire
+    when a key gains its first / loses its last tool, so the UI keeps exactly
+    one Qt shortcut per key in use.
+    """
+
+    def __init__(self, on_added=None, on_removed=None):
+        self.on_added = on_added
+        self.on_removed = on_removed
+        self._owners = {}      # key -> tool
+        self._waiting = {}     # key -> [tools that also want the key]
+        self._tool_keys = {}   # id(tool) -> key
+
+    def __len__(self):
+        return len(self._owners)
+
+    def keys(self):
+        return list(self._owners)
+
+    def lookup(self, key):
+        return self._owners.get(key)
+
+    def key_of(self, tool):
+        return self._tool_keys.get(id(tool))
+
+    def conflict(self, shortcut, tool=None):
+        # The other tool already using `shortcut`, or None.
+        key = normalize_shortcut(shortcut)
+        owner = self._owners.get(key) if key else None
+        return owner if owner is not None and owner is not tool else None
+
+    def conflicts(self):
+        return {key: list(tools) for key, tools in self._waiting.items() if tools}
+
+    # ==========================
+    # Bind / unbind
+    # ==========================
+    def bind(self, tool):
+        self.unbind(tool)
+        key = normalize_shortcut(tool.get("shortcut"))
+        if not key:
+            if key is None:
+                print(f"[WARNING] Ignoring invalid shortcut {tool.get('shortcut')!r} on {tool.get('title', '')!r}")
+            return None
+        self._tool_keys[id(tool)] = key
+        owner = self._owners.get(key)
+        if owner is None:
+            self._owners[key] = tool
+            if self.on_added:
+                self.on_added(key)
+        else:
+            self._waiting.setdefault(key, []).append(tool)
+            print(f"[WARNING] Shortcut {key} of {tool.get('title', '')!r} is already used by {owner.get('title', '')!r}")
+        return key
+
+    def unbind(self, tool):
+        key = self._tool_keys.pop(id(tool), None)
+        if key is None:
+            return
+        waiting = self._waiting.get(key, [])
+        if self._owners.get(key) is tool:
+            if waiting:
+                self._owners[key] = waiting.pop(0)
+            else:
+                del self._owners[key]
+                if self.on_removed:
+                    self.on_removed(key)
+        else:
+            self._waiting[key] = [t for t in waiting if t is not tool]
+        if not self._waiting.get(key):
+            self._waiting.pop(key, None)
+
+    def bind_all(self, tools):
+        for tool in tools:
+            self.bind(tool)
+
+    def unbind_all(self, tools):
+        for tool in tools:
+            self.unbind(tool)
+
+    def clear(self):
+        keys = list(self._owners)
+        self._owners.clear()
+        self._waiting.clear()
+        self._tool_keys.clear()
+        if self.on_removed:
+            for key in keys:
+                self.on_removed(key)
@@ -0,0 +1,192 @@
+# ==========================
+# Per-tool execution telemetry (tool_stats.json)
+# ==========================
+import os
+import json
+import time
+import functools
+from bisect import bisect_left
+
+from .dispatch import command_key, KEY_TEXT_MAX
+from .persistence import atomic_write_json
+
+TELEMETRY_VERSION = 1
+# Histogram bucket upper bounds in ms; one extra overflow bucket after the last.
+LATENCY_BOUNDS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+DEFAULT_SLOW_MS = 500
+FLUSH_INTERVAL_S = 30
+FLUSH_BATCH = 200
+
+
+def tool_key(action_data):
+    # Catalog tools by ID, macros by uid, script files by path, custom tools
+    # by a hash of their script.
+    if action_data.get("type") == "macro" and action_data.get("uid"):
+        return "macro:" + action_data["uid"]
+    if action_data.get("script_path"):
+        return "file:" + os.path.normcase(action_data["script_path"])
+    if action_data.get("ID"):
+        return str(action_data["ID"])
+    if action_data.get("command_ref") and not action_data.get("command"):
+        # Same key as the inline script: the ref hashes the stripped text too.
+        return "cmd:" + action_data["command_ref"][:16]
+    return command_tool_key(action_data.get("command") or "")
+
+
+def command_tool_key(command):
+    # Long scripts are hashed on each call rather than kept in the lru_cache.
+    if len(command) > KEY_TEXT_MAX:
+        return "cmd:" + command_key(command.strip())
+    return _short_command_tool_key(command)
+
+
+@functools.lru_cache(maxsize=1024)
+def _short_command_tool_key(command):
+    return "cmd:" + command_key(command.strip())
+
+
+class ToolStats:
+    __slots__ = ("title", "count", "errors", "total_ms", "max_ms", "buckets",
+                 "last_used", "last_error", "last_error_time")
+
+    def __init__(self, title=""):
+        self.title = title
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BOUNDS_MS) + 1)
+        self.last_used = 0.0
+        self.last_error = ""
+        self.last_error_time = 0.0
+
+    def record(self, ms, error=None, now=None):
+        now = time.time() if now is None else now
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        self.buckets[bisect_left(LATENCY_BOUNDS_MS, ms)] += 1
+        self.last_used = now
+        if error is not None:
+            self.errors += 1
+            self.last_error = str(error)
+            self.last_error_time = now
+
+    def percentile(self, fraction):
+        # Interpolated within the bucket holding the percentile; the bucket's
+        # upper bound is capped at the slowest call seen, so a tool that always
+        # takes 300 ms reports ~300, not the 500 ms bound.
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= target:
+                lower = LATENCY_BOUNDS_MS[i - 1] if i else 0.0
+                upper = min(LATENCY_BOUNDS_MS[i], self.max_ms) if i < len(LATENCY_BOUNDS_MS) else self.max_ms
+                if upper <= lower:
+                    return upper
+                return lower + (upper - lower) * (target - seen) / n
+            seen += n
+        return self.max_ms
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data.get("title", ""))
+        for slot in cls.__slots__:
+            if slot in data:
+                setattr(stats, slot, data[slot])
+        if len(stats.buckets) != len(LATENCY_BOUNDS_MS) + 1:
+            stats.buckets = [0] * (len(LATENCY_BOUNDS_MS) + 1)
+        return stats
+
+
+class ToolTelemetry:
+    """Call counts, latency histograms and errors per shelf tool.
+
+    record() only touches memory; the UI calls flush() from a timer (and on
+    close) once flush_due() says a batch is ready, so a click never waits on
+    disk. The file holds cumulative stats and is loaded back on start.
+    """
+
+    def __init__(self, filepath=None, slow_ms=DEFAULT_SLOW_MS,
+                 flush_interval=FLUSH_INTERVAL_S, flush_batch=FLUSH_BATCH):
+        self.filepath = filepath
+        self.slow_ms = slow_ms
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.tools = {}
+        self.pending = 0
+        self._last_flush = time.monotonic()
+
+    # ==========================
+    # Record
+    # ==========================
+    def record(self, key, ms, error=None, title=""):
+        stats = self.tools.get(key)
+        if stats is None:
+            stats = self.tools[key] = ToolStats(title)
+        elif title:
+            stats.title = title
+        stats.record(ms, error)
+        self.pending += 1
+        return stats
+
+    def is_slow(self, stats):
+        return stats.count > 0 and stats.percentile(0.95) > self.slow_ms
+
+    def slow_tools(self):
+        return [key for key, stats in self.tools.items() if self.is_slow(stats)]
+
+    def reset(self):
+        self.tools.clear()
+        self.pending += 1
+
+    # ==========================
+    # Disk
+    # ==========================
+    def load(self):
+        if not self.filepath or not os.path.exists(self.filepath):
+            return
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Could not read tool stats: {e}")
+            return
+        if data.get("version") != TELEMETRY_VERSION:
+            return
+        for key, entry in data.get("tools", {}).items():
+            self.tools[key] = ToolStats.from_dict(entry)
+
+    def flush_due(self):
+        if not self.pending:
+            return False
+        return (self.pending >= self.flush_batch
+                or time.monotonic() - self._last_flush >= self.flush_interval)
+
+    def flush(self):
+        if not self.pending or not self.filepath:
+            return False
+        self.export(self.filepath)
+        self.pending = 0
+        self._last_flush = time.monotonic()
+        return True
+
+    def to_dict(self):
+        tools = {}
+        for key, stats in self.tools.items():
+            entry = stats.to_dict()
+            entry["p50_ms"] = round(stats.percentile(0.5), 2)
+            entry["p95_ms"] = round(stats.percentile(0.95), 2)
+            entry["slow"] = self.is_slow(stats)
+            tools[key] = entry
+        return {"version": TELEMETRY_VERSION, "bounds_ms": list(LATENCY_BOUNDS_MS),
+                "slow_ms": self.slow_ms, "tools": tools}
+
+    def export(self, filepath):
+        atomic_write_json(filepath, self.to_dict())
@@ -0,0 +1,153 @@
+# ==========================
+# Timing spans (Chrome trace JSON)
+# ==========================
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+
+TRACE_ENV = "SHELFTOOL_TRACE"  # "1" = trace to the default file, or a path
+MAX_EVENTS = 100000
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class Tracer:
+    """Collects named timing spans while `enabled`.
+
+    Disabled, span() hands back a shared no-op context manager and @traced
+    wrappers do one attribute check, so the hooks can stay in production
+    code. Spans are kept in a bounded deque and written as Chrome trace
+    events (chrome://tracing, Perfetto) by export().
+    """
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self.enabled = False
+        self.path = None
+        self.events = deque(maxlen=max_events)
+        self._origin = time.perf_counter()
+
+    def enable(self, path=None):
+        self.enabled = True
+        if path:
+            self.path = path
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self.events.clear()
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def complete(self, name, start, end, args=None):
+        # Record a span measured elsewhere (e.g. module import).
+        if self.enabled:
+            self.events.append((name, start, end - start, threading.get_ident(), args or None))
+
+    # ==========================
+    # Output
+    # ==========================
+    def chrome_events(self):
+        pid = os.getpid()
+        result = []
+        for name, start, duration, tid, args in self.events:
+            event = {"name": name, "ph": "X", "pid": pid, "tid": tid,
+                     "ts": round((start - self._origin) * 1e6, 1), "dur": round(duration * 1e6, 1)}
+            if args:
+                event["args"] = {k: v if isinstance(v, (int, float, bool)) else str(v) for k, v in args.items()}
+            result.append(event)
+        return result
+
+    def export(self, path=None):
+        path = path or self.path
+        if not path or not self.events:
+            return None
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.chrome_events(), "displayTimeUnit": "ms"}, f)
+        return path
+
+    def totals(self, since=None):
+        # name -> (count, total seconds)
+        totals = {}
+        for name, start, duration, tid, args in self.events:
+            if since is not None and start < since:
+                continue
+            count, total = totals.get(name, (0, 0.0))
+            totals[name] = (count + 1, total + duration)
+        return totals
+
+    def summary(self, label="startup", since=None, until=None, limit=6):
+        totals = self.totals(since)
+        if not totals:
+            return f"[TRACE] {label}: no spans"
+        parts = []
+        for name, (count, total) in sorted(totals.items(), key=lambda item: -item[1][1])[:limit]:
+            times = f" x{count}" if count > 1 else ""
+            parts.append(f"{name}{times} {total * 1000:.1f} ms")
+        head = f"[TRACE] {label}"
+        if since is not None and until is not None:
+            head += f" {(until - since) * 1000:.1f} ms"
+        return head + ": " + ", ".join(parts)
+
+
+TRACER = Tracer()
+
+
+def traced(name=None):
+    # Method / function decorator: one span per call while TRACER is enabled.
+    def decorate(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                TRACER.complete(span_name, start, time.perf_counter())
+        return wrapper
+    return decorate
+
+
+def enable_from_env(default_path):
+    value = os.environ.get(TRACE_ENV, "").strip()
+    if not value or value.lower() in ("0", "false", "no", "off"):
+        return False
+    TRACER.enable(default_path if value.lower() in ("1", "true", "yes", "on") else value)
+    return True
@@ -0,0 +1,138 @@
+# ==========================
+# Frecency usage store (usage.json)
+# ==========================
+import os
+import json
+import time
+
+from .persistence import atomic_write_bytes
+from .search import SCORE_FRECENCY_MAX
+
+USAGE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_HALF_LIFE_DAYS = 14
+WEIGHT_LAUNCH = 1.0
+WEIGHT_ADD = 2.0
+FRECENCY_HALF = 3.0  # frecency that earns half of SCORE_FRECENCY_MAX
+FLUSH_INTERVAL_S = 30
+FLUSH_BATCH = 50
+
+# entry = [score, stamp, launches, adds]; score is decayed lazily from stamp
+_SCORE, _STAMP, _LAUNCHES, _ADDS = range(4)
+
+
+class UsageStore:
+    """Launches and additions per tool, ranked by frequency and recency.
+
+    Each key keeps one exponentially decaying score (halved every
+    `half_life_days`) plus raw counters, so an entry is four numbers. The
+    store keeps at most `max_entries` keys, dropping the coldest. Updates
+    only touch memory; flush() is called in batches by the UI.
+    """
+
+    def __init__(self, filepath=None, max_entries=DEFAULT_MAX_ENTRIES,
+                 half_life_days=DEFAULT_HALF_LIFE_DAYS):
+        self.filepath = filepath
+        self.max_entries = max_entries
+        self.half_life = half_life_days * 86400.0
+        self.entries = {}
+        self.pending = 0
+        self.revision = 0
+        self._last_flush = time.monotonic()
+
+    # ==========================
+    # Record
+    # ==========================
+    def _decayed(self, entry, now):
+        return entry[_SCORE] * 0.5 ** ((now - entry[_STAMP]) / self.half_life)
+
+    def _bump(self, key, weight, counter, now=None):
+        now = time.time() if now is None else now
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [0.0, now, 0, 0]
+        entry[_SCORE] = self._decayed(entry, now) + weight
+        entry[_STAMP] = now
+        entry[counter] += 1
+        self.pending += 1
+        self.revision += 1
+        # Prune in steps, not on every new key.
+        if len(self.entries) > self.max_entries * 1.1:
+            self.prune(now)
+
+    def record_launch(self, key, now=None):
+        self._bump(key, WEIGHT_LAUNCH, _LAUNCHES, now)
+
+    def record_add(self, key, now=None):
+        self._bump(key, WEIGHT_ADD, _ADDS, now)
+
+    def forget(self, key):
+        if self.entries.pop(key, None) is not None:
+            self.pending += 1
+            self.revision += 1
+
+    def prune(self, now=None):
+        now = time.time() if now is None else now
+        if len(self.entries) <= self.max_entries:
+            return
+        keep = sorted(self.entries, key=lambda k: self._decayed(self.entries[k], now), reverse=True)
+        self.entries = {k: self.entries[k] for k in keep[:self.max_entries]}
+        self.pending += 1
+
+    # ==========================
+    # Ranking
+    # ==========================
+    def frecency(self, key, now=None):
+        entry = self.entries.get(key)
+        if entry is None:
+            return 0.0
+        return self._decayed(entry, time.time() if now is None else now)
+
+    def top(self, count, now=None):
+        now = time.time() if now is None else now
+        ranked = sorted(self.entries, key=lambda k: self._decayed(self.entries[k], now), reverse=True)
+        return ranked[:count]
+
+    def boosts(self, doc_of, now=None):
+        """{doc: search bonus} for every known key that doc_of() maps to a
+        row; the bonus saturates at SCORE_FRECENCY_MAX."""
+        now = time.time() if now is None else now
+        result = {}
+        for key, entry in self.entries.items():
+            doc = doc_of(key)
+            if doc is not None:
+                value = self._decayed(entry, now)
+                result[doc] = SCORE_FRECENCY_MAX * value / (value + FRECENCY_HALF)
+        return result
+
+    # ==========================
+    # Disk
+    # ==========================
+    def load(self):
+        if not self.filepath or not os.path.exists(self.filepath):
+            return
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Could not read usage data: {e}")
+            return
+        if data.get("version") == USAGE_VERSION:
+            self.entries = {k: list(v) for k, v in data.get("entries", {}).items()}
+            self.prune()
+            self.revision += 1
+
+    def flush_due(self):
+        if not self.pending:
+            return False
+        return (self.pending >= FLUSH_BATCH
+                or time.monotonic() - self._last_flush >= FLUSH_INTERVAL_S)
+
+    def flush(self):
+        if not self.pending or not self.filepath:
+            return False
+        payload = json.dumps({"version": USAGE_VERSION, "entries": self.entries}, separators=(",", ":"))
+        atomic_write_bytes(self.filepath, payload.encode("utf-8"))
+        self.pending = 0
+        self._last_flush = time.monotonic()
+        return True
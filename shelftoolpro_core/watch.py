@@ -0,0 +1,82 @@
+# ==========================
+# File Watcher (polling, mtime index)
+# ==========================
+import os
+import time
+
+DEFAULT_SETTLE_S = 0.5
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def stat_paths(paths):
+    # The disk half of poll(), safe on a worker thread: no watcher state.
+    return {path: _stat_key(path) for path in paths}
+
+
+class FileWatcher:
+    """Reports files whose size / mtime changed, once they stopped changing.
+
+    Polling instead of QFileSystemWatcher: an atomic save (temp file +
+    rename, as persistence.atomic_write_bytes does) replaces the watched
+    inode, and editors / network shares differ in which events they send. A
+    change is reported only after the file kept the same stat for
+    `settle_s`, so a tool writing in several steps causes one reload.
+    remember() records our own writes so they are not reported back.
+    poll(keys=stat_paths(paths())) lets the stat calls run off the UI thread.
+    """
+
+    def __init__(self, paths=(), settle_s=DEFAULT_SETTLE_S):
+        self.settle_s = settle_s
+        self._known = {}    # path -> stat key last seen as settled
+        self._pending = {}  # path -> (stat key, first seen)
+        for path in paths:
+            self.add(path)
+
+    def add(self, path):
+        self._known[path] = _stat_key(path)
+        self._pending.pop(path, None)
+
+    def remove(self, path):
+        self._known.pop(path, None)
+        self._pending.pop(path, None)
+
+    def paths(self):
+        return list(self._known)
+
+    def remember(self, path):
+        if path in self._known:
+            self.add(path)
+
+    def poll(self, now=None, keys=None):
+        """Paths that changed and have settled since the last report.
+
+        `keys` is a stat_paths() result taken earlier; paths added since
+        then are checked by the next poll.
+        """
+        now = time.monotonic() if now is None else now
+        changed = []
+        for path, known in self._known.items():
+            if keys is None:
+                key = _stat_key(path)
+            elif path in keys:
+                key = keys[path]
+            else:
+                continue
+            if key == known:
+                self._pending.pop(path, None)
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending[0] != key:
+                self._pending[path] = (key, now)
+            elif now - pending[1] >= self.settle_s:
+                self._known[path] = key
+                del self._pending[path]
+                changed.append(path)
+        return changed
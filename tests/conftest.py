@@ -0,0 +1,8 @@
+# ==========================
+# Tests for the headless core (no 3ds Max, no Qt needed)
+#   python -m pytest -q
+# ==========================
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
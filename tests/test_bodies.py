@@ -0,0 +1,138 @@
+# ==========================
+# Out-of-line script bodies (BodyStore)
+# ==========================
+import os
+
+from shelftoolpro_core.bodies import BodyStore, InlineBodies, bodies_dir_for, body_ref, INLINE_MAX
+from shelftoolpro_core.persistence import open_store, STORAGE_SNAPSHOT, STORAGE_JOURNAL, JOURNAL_SUFFIX
+from shelftoolpro_core.dispatch import CommandCache, KEY_TEXT_MAX
+from shelftoolpro_core.telemetry import command_tool_key
+from shelftoolpro_core.fake_runtime import FakeRuntime
+
+LONG_A = "\n".join(f"print {i} -- a" for i in range(INLINE_MAX))
+LONG_B = "\n".join(f"print {i} -- b" for i in range(INLINE_MAX))
+
+
+def body_files(bodies):
+    return sorted(name[:-3] for _, _, files in os.walk(bodies.folder) for name in files)
+
+
+def open_shelf(path, mode):
+    bodies = BodyStore(bodies_dir_for(path))
+    store = open_store(path, mode, bodies=bodies)
+    model = store.load()
+    store.attach(model)
+    return bodies, store, model
+
+
+def test_round_trip_with_external_bodies(tmp_path):
+    path = str(tmp_path / "shelves.json")
+    for mode in (STORAGE_SNAPSHOT, STORAGE_JOURNAL):
+        bodies, store, model = open_shelf(path, mode)
+        if not model.tabs:
+            model.add_tab("Tab", [{"title": "Long", "command": LONG_A}, {"title": "Short", "command": "box()"}])
+        store.save(model)
+        loaded = open_store(path, mode).load()
+        long_tool, short_tool = loaded.tab("Tab").actions
+        assert long_tool["command"] == "" and long_tool["command_ref"] == body_ref(LONG_A)
+        assert BodyStore(bodies_dir_for(path)).command_of(long_tool) == LONG_A
+        assert short_tool["command"] == "box()"
+
+
+def test_journal_records_carry_only_the_ref(tmp_path):
+    path = str(tmp_path / "shelves.json")
+    bodies, store, model = open_shelf(path, STORAGE_JOURNAL)
+    model.add_tab("Tab", [{"title": "Long", "command": "box()"}])
+    store.save(model)
+    tool = model.tab("Tab").actions[0]
+    model.update_action("Tab", tool, {"title": "Long", "command": LONG_A})
+    model.add_action("Tab", {"title": "Other", "command": LONG_B})
+    store.save(model)
+
+    journal = open(path + JOURNAL_SUFFIX, encoding="utf-8").read()
+    assert LONG_A not in journal and LONG_B not in journal
+    assert body_ref(LONG_A) in journal
+    loaded = open_store(path, STORAGE_JOURNAL).load()
+    assert [bodies.command_of(a) for a in loaded.tab("Tab").actions] == [LONG_A, LONG_B]
+
+
+def test_unused_bodies_are_swept_at_compaction(tmp_path):
+    path = str(tmp_path / "shelves.json")
+    bodies, store, model = open_shelf(path, STORAGE_JOURNAL)
+    model.add_tab("Tab", [{"title": "Long", "command": LONG_A}])
+    store.save(model)
+    # Another shelf file in the same folder keeps its body.
+    open_store(str(tmp_path / "backup.json"), bodies=bodies).save(model)
+
+    tool = model.tab("Tab").actions[0]
+    model.update_action("Tab", tool, {"command": LONG_B})
+    store.save(model)
+    assert body_files(bodies) == sorted([body_ref(LONG_A), body_ref(LONG_B)])
+
+    os.remove(str(tmp_path / "backup.json"))
+    store.compact(model)
+    assert body_files(bodies) == [body_ref(LONG_B)]
+    assert bodies.command_of(open_store(path, STORAGE_JOURNAL).load().tab("Tab").actions[0]) == LONG_B
+
+
+def test_snapshot_save_sweeps_dropped_bodies(tmp_path):
+    path = str(tmp_path / "shelves.json")
+    bodies, store, model = open_shelf(path, STORAGE_SNAPSHOT)
+    model.add_tab("Tab", [{"title": "Long", "command": LONG_A}])
+    store.save(model)
+    model.update_action("Tab", model.tab("Tab").actions[0], {"command": "box()"})
+    store.save(model)
+    assert body_files(bodies) == []
+
+
+def test_sweep_reads_only_shelf_documents(tmp_path):
+    path = str(tmp_path / "shelves.json")
+    bodies, store, model = open_shelf(path, STORAGE_SNAPSHOT)
+    model.add_tab("Tab", [{"title": "Long", "command": LONG_A}])
+    store.save(model)
+    other = bodies.put(LONG_B)
+    # Not shelf documents: a ref in them does not keep a body.
+    (tmp_path / "usage.json").write_text('{"entries": {"command_ref": "%s"}}' % other, encoding="utf-8")
+    (tmp_path / "trace.json").write_text("{not json", encoding="utf-8")
+    # An unreadable file does not stop the sweep.
+    os.mkdir(str(tmp_path / "locked.json"))
+    assert bodies.sweep(path) == 1
+    assert body_files(bodies) == [body_ref(LONG_A)]
+
+    # Nothing is removed when the shelf file itself cannot be read.
+    os.remove(path)
+    os.mkdir(path)
+    assert bodies.sweep(path) == 0
+    assert body_files(bodies) == [body_ref(LONG_A)]
+
+
+def test_inline_storage_writes_bodies_back(tmp_path):
+    path = str(tmp_path / "shelves.json")
+    for mode in (STORAGE_SNAPSHOT, STORAGE_JOURNAL):
+        bodies, store, model = open_shelf(path, mode)
+        model.add_tab("Tab", [{"title": "Long", "command": LONG_A}])
+        store.save(model)
+        assert open_store(path, mode).load().tab("Tab").actions[0]["command_ref"] == body_ref(LONG_A)
+
+        # Switched back to inline: the next save writes the script again.
+        inline = open_store(path, mode, bodies=InlineBodies(bodies))
+        model = inline.load()
+        inline.attach(model)
+        model.add_action("Tab", {"title": "Short", "command": "box()"})
+        inline.save(model)
+        long_tool, short_tool = open_store(path, mode).load().tab("Tab").actions
+        assert long_tool["command"] == LONG_A and "command_ref" not in long_tool
+        assert short_tool["command"] == "box()"
+        os.remove(path)
+
+
+def test_long_scripts_are_cached_by_hash():
+    rt = FakeRuntime()
+    cache = CommandCache(rt)
+    cache.run(LONG_A)
+    cache.run(LONG_A)
+    assert cache.stats()["hits"] == 1
+    assert all(not isinstance(key, str) or len(key) <= KEY_TEXT_MAX for key in cache._entries)
+    cache.invalidate(LONG_A)
+    assert len(cache) == 0
+    assert command_tool_key(LONG_A) == "cmd:" + body_ref(LONG_A.strip())[:16]
@@ -0,0 +1,97 @@
+# ==========================
+# Action catalog: cache and shards
+# ==========================
+import os
+import json
+
+from shelftoolpro_core import catalog as catalog_module
+from shelftoolpro_core import shards as shards_module
+from shelftoolpro_core.catalog import load_catalog
+from shelftoolpro_core.shards import open_sharded_catalog
+from shelftoolpro_core.search import SearchIndex
+
+GROUPS = [
+    {"GroupName": "Snaps", "Actions": [
+        {"title": "Toggle Snap", "command": 'actionMan.executeAction 0 "40072"'},
+        {"title": "Angle Snap", "command": 'actionMan.executeAction 0 "40073"', "shortcut": "A"}]},
+    {"GroupName": "Tools", "Actions": [
+        {"title": "Custom", "command": "box()"},
+        {"title": "Toggle Snap", "command": 'actionMan.executeAction 0 "40072"'}]},
+]
+
+
+def write_catalog(path, groups=GROUPS):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(groups, f)
+
+
+def test_catalog_lookups_and_cache(tmp_path):
+    path = str(tmp_path / "max_actions.json")
+    write_catalog(path)
+    cache_dir = str(tmp_path / "cache")
+    catalog_module._memo.clear()
+    catalog = load_catalog(path, cache_dir)
+    catalog_module._memo.clear()
+    cached = load_catalog(path, cache_dir)
+
+    for c in (catalog, cached):
+        assert len(c) == 4
+        assert c.by_id("40072")["_GroupName"] == "Snaps"
+        assert c.row_of_id("40073") == 1
+        assert c.by_group_title("Tools", "Custom").command == "box()"
+        assert c.by_command(' actionMan.executeAction 0 "40073" ')["shortcut"] == "A"
+        assert c.group_rows("Tools") == [2, 3]
+
+
+def test_shards_load_on_demand(tmp_path):
+    path = str(tmp_path / "max_actions.json")
+    write_catalog(path)
+    cache_dir = str(tmp_path / "cache")
+    shards_module._memo.clear()
+    sharded = open_sharded_catalog(path, cache_dir)
+    assert sharded.total == 4 and len(sharded.catalog) == 0
+    assert sharded.group_names() == ["Snaps", "Tools"]
+
+    assert list(sharded.load_group("Tools")) == [0, 1]
+    assert sharded.is_loaded("Tools") and not sharded.complete
+    # The first group listing an ID owns it, even when loaded later.
+    assert sharded.ensure_id("40073")["title"] == "Angle Snap"
+    assert sharded.complete
+    assert sharded.load_next() == (None, range(0))
+
+
+def test_shards_rebuilt_when_source_changes(tmp_path):
+    path = str(tmp_path / "max_actions.json")
+    write_catalog(path)
+    cache_dir = str(tmp_path / "cache")
+    shards_module._memo.clear()
+    assert open_sharded_catalog(path, cache_dir).total == 4
+
+    write_catalog(path, GROUPS[:1])
+    os.utime(path, ns=(1, 1))
+    shards_module._memo.clear()
+    sharded = open_sharded_catalog(path, cache_dir)
+    assert sharded.total == 2 and sharded.group_names() == ["Snaps"]
+
+
+def test_search_loads_only_groups_that_can_match(tmp_path):
+    # max_actions.json as shipped: loading groups_matching() must find
+    # everything a search over the whole catalog finds.
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "max_actions.json")
+    catalog_module._memo.clear()
+    full = load_catalog(path, str(tmp_path / "full"))
+    full_index = SearchIndex(full.actions)
+
+    def matches(actions, index, query):
+        return {(actions[d].get("_GroupName"), actions[d].get("title")) for d in index.search(query)}
+
+    for query in ["snap", "sna", "ggle", "tgl", "ts", "rndr", "box", "select obj", "zzzq"]:
+        shards_module._memo.clear()
+        sharded = open_sharded_catalog(path, str(tmp_path / "shards"))
+        groups = sharded.groups_matching(query)
+        assert len(groups) < len(sharded.group_names())
+        for name in groups:
+            sharded.load_group(name)
+        partial = sharded.catalog.actions
+        assert matches(partial, SearchIndex(partial), query) == matches(full.actions, full_index, query)
+    assert sharded.groups_matching("") == []
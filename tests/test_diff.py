@@ -0,0 +1,75 @@
+# ==========================
+# diff_models: old shelves + diff == new shelves
+# ==========================
+import random
+
+from shelftoolpro_core.model import ShelfModel
+from shelftoolpro_core.diff import diff_models
+
+
+def tool(n, rng):
+    return {"title": f"Tool {n}", "icon": "", "command": f"cmd{n}()", "shortcut": rng.choice(["", "Ctrl+K"]), "ID": None}
+
+
+def random_model(rng, tools):
+    tabs = []
+    for t in range(rng.randint(0, 5)):
+        tabs.append({"name": f"Tab {t}", "hidden": rng.random() < 0.2,
+                     "actions": [dict(rng.choice(tools)) for _ in range(rng.randint(0, 8))]})
+    return ShelfModel.from_dict({"tabs": tabs})
+
+
+def mutate(data, rng, tools):
+    for tab in data["tabs"]:
+        actions = tab["actions"]
+        for _ in range(rng.randint(0, 3)):
+            roll = rng.random()
+            if roll < 0.3 and actions:
+                del actions[rng.randrange(len(actions))]
+            elif roll < 0.6:
+                actions.insert(rng.randint(0, len(actions)), dict(rng.choice(tools)))
+            elif actions:
+                rng.choice(actions)["title"] = f"Edited {rng.random():.3f}"
+        if rng.random() < 0.2:
+            tab["hidden"] = not tab.get("hidden", False)
+    if data["tabs"] and rng.random() < 0.2:
+        data["tabs"][0]["name"] = "Renamed"
+    if data["tabs"] and rng.random() < 0.2:
+        del data["tabs"][-1]
+    if rng.random() < 0.2:
+        data["tabs"].append({"name": "New", "actions": [dict(rng.choice(tools))]})
+    return data
+
+
+def test_diff_applies_to_new_model():
+    rng = random.Random(7)
+    tools = [tool(n, rng) for n in range(12)]
+    for _ in range(300):
+        old = random_model(rng, tools)
+        new = ShelfModel.from_dict(mutate(old.to_dict(), rng, tools))
+        for op, payload in diff_models(old, new):
+            old.apply(op, payload)
+        assert old.to_dict() == new.to_dict()
+
+
+def test_diff_of_equal_models_is_empty():
+    rng = random.Random(3)
+    model = random_model(rng, [tool(n, rng) for n in range(5)])
+    assert diff_models(model, ShelfModel.from_dict(model.to_dict())) == []
+
+
+def test_renamed_tab_is_one_op():
+    old = ShelfModel.from_dict({"tabs": [{"name": "A", "actions": [{"title": "x", "command": "x()"}]}]})
+    new = ShelfModel.from_dict({"tabs": [{"name": "B", "actions": [{"title": "x", "command": "x()"}]}]})
+    assert diff_models(old, new) == [("rename_tab", {"name": "A", "new_name": "B"})]
+
+
+def test_unchanged_tools_keep_identity():
+    old = ShelfModel.from_dict({"tabs": [{"name": "A", "actions": [
+        {"title": "x", "command": "x()"}, {"title": "y", "command": "y()"}]}]})
+    first = old.tabs[0].actions[0]
+    new = ShelfModel.from_dict({"tabs": [{"name": "A", "actions": [
+        {"title": "x", "command": "x()"}, {"title": "y2", "command": "y()"}]}]})
+    for op, payload in diff_models(old, new):
+        old.apply(op, payload)
+    assert old.tabs[0].actions[0] is first
@@ -0,0 +1,70 @@
+# ==========================
+# Command dispatch: direct actionMan calls, compile-once cache
+# ==========================
+import pytest
+
+from shelftoolpro_core.dispatch import CommandDispatcher, needs_top_level
+from shelftoolpro_core.fake_runtime import FakeRuntime
+
+
+def dispatcher():
+    rt = FakeRuntime()
+    rt.record = True
+    return rt, CommandDispatcher(rt)
+
+
+def test_catalog_action_bypasses_the_parser():
+    rt, d = dispatcher()
+    d.run(' actionMan.executeAction 0 "40072" ')
+    assert rt.executed == [] and d.stats()["direct"] == 1
+
+
+def test_script_is_compiled_once():
+    rt, d = dispatcher()
+    for _ in range(3):
+        d.run("box()\nsphere()")
+    assert rt.executed == ["(fn shelfToolCommand = (\nbox()\nsphere()\n))"]
+    d.invalidate("box()\nsphere()")
+    d.run("box()\nsphere()")
+    assert len(rt.executed) == 2
+
+
+@pytest.mark.parametrize("script", [
+    'try(destroyDialog MyRoll)catch()\nrollout MyRoll "Tool" ( button b "Go" )\ncreateDialog MyRoll',
+    "fn alignPivots objs = ( for o in objs do o.pivot = o.center )",
+    "mapped function hideIt o = hide o",
+    "struct ToolState ( count = 0 )",
+    "global gLastSelection = selection as array",
+    'rcmenu MyMenu ( menuItem m "Go" )',
+    'macroScript Foo category:"X" ( box() )',
+    "-- shelftool: top-level\nobj = box()",
+    "obj = box()",
+    "sel = selection as array\nselect sel",
+    "count += 1",
+])
+def test_global_definitions_run_at_top_level(script):
+    rt, d = dispatcher()
+    assert needs_top_level(script)
+    d.run(script)
+    d.run(script)
+    assert rt.executed == [script, script]
+
+
+@pytest.mark.parametrize("script", [
+    "box()", "local fnName = 1", "-- top-level comment\nbox()", "for o in objects do print o",
+    "local a = 1, b = 2\nb += a", "for i = 1 to 3 do box()", '$.name = "x"', 'print "a = b"',
+    "if a == b then box()", "-- x = 1\nbox()", "o.pivot = o.center",
+    'messageBox "fn x = 1\nrollout r"', 'execute "-- shelftool: top-level\nobj = box()"',
+])
+def test_plain_scripts_are_compiled(script):
+    assert not needs_top_level(script)
+
+
+def test_only_parsed_actions_are_kept_and_bounded():
+    rt, d = dispatcher()
+    d.max_plans = 2
+    for i in range(3):
+        d.run(f'actionMan.executeAction 0 "{i}"')
+    d.run("box()")
+    assert d.stats()["plans"] == 2
+    assert d.stats()["direct"] == 3
@@ -0,0 +1,104 @@
+# ==========================
+# Studio shelf library: revalidation and the local copies
+# ==========================
+import json
+import os
+
+from shelftoolpro_core.library import (ShelfLibrary, SOURCE_CACHED, SOURCE_UNCHANGED, SOURCE_UPDATED,
+                                       SOURCE_OFFLINE, SOURCE_MISSING)
+from shelftoolpro_core.bodies import BodyStore, bodies_dir_for, INLINE_MAX
+from shelftoolpro_core.model import ShelfModel
+
+
+def tool(title, command):
+    return {"title": title, "icon": "", "command": command, "shortcut": "", "ID": None}
+
+
+def write_shelves(path, model, bodies=None, mtime=1):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(model.to_dict(bodies), f)
+    os.utime(path, ns=(mtime * 10 ** 9, mtime * 10 ** 9))
+
+
+def studio(tmp_path):
+    share = tmp_path / "share"
+    share.mkdir()
+    source = str(share / "modeling.json")
+    write_shelves(source, shelves("box()"))
+    return source, str(tmp_path / "cache")
+
+
+def shelves(command):
+    model = ShelfModel()
+    model.add_tab("Modeling", [tool("Tool", command)])
+    return model
+
+
+def commands(library):
+    return [a["command"] for _, model in library.load() for tab in model.tabs for a in tab.actions]
+
+
+def test_cached_then_unchanged_then_updated(tmp_path):
+    source, cache = studio(tmp_path)
+    library = ShelfLibrary([source], cache, revalidate_s=60)
+    assert library.sync(now=100.0) == {source: SOURCE_UPDATED}
+    assert commands(library) == ["box()"]
+
+    # Within the interval the share is not touched.
+    write_shelves(source, shelves("sphere()"), mtime=2)
+    assert library.sync(now=130.0) == {source: SOURCE_CACHED}
+    assert commands(library) == ["box()"]
+
+    assert library.sync(now=200.0) == {source: SOURCE_UPDATED}
+    assert commands(library) == ["sphere()"]
+    assert library.sync(now=300.0) == {source: SOURCE_UNCHANGED}
+
+    # A new session reads the manifest and still skips the share.
+    again = ShelfLibrary([source], cache, revalidate_s=60)
+    assert again.sync(now=310.0) == {source: SOURCE_CACHED}
+    assert again.sync(force=True, now=310.0) == {source: SOURCE_UNCHANGED}
+
+
+def test_offline_uses_local_copy_and_missing_has_none(tmp_path):
+    source, cache = studio(tmp_path)
+    library = ShelfLibrary([source], cache, revalidate_s=0)
+    library.sync(now=1.0)
+    os.remove(source)
+    assert library.sync(now=2.0) == {source: SOURCE_OFFLINE}
+    assert commands(library) == ["box()"]
+
+    never = str(tmp_path / "share" / "fx.json")
+    other = ShelfLibrary([never], cache, revalidate_s=0)
+    assert other.sync(now=1.0) == {never: SOURCE_MISSING}
+    assert other.load() == []
+
+
+def test_half_deployed_file_keeps_local_copy(tmp_path):
+    source, cache = studio(tmp_path)
+    library = ShelfLibrary([source], cache, revalidate_s=0)
+    library.sync(now=1.0)
+    with open(source, "w", encoding="utf-8") as f:
+        f.write('{"tabs": [')
+    assert library.sync(now=2.0) == {source: SOURCE_OFFLINE}
+    assert commands(library) == ["box()"]
+
+
+def test_external_bodies_are_inlined_from_the_share(tmp_path):
+    source, cache = studio(tmp_path)
+    script = "-- studio tool\n" + "box()\n" * (INLINE_MAX // 6 + 1)
+    share_bodies = BodyStore(bodies_dir_for(source))
+    write_shelves(source, shelves(script), bodies=share_bodies, mtime=2)
+
+    library = ShelfLibrary([source], cache, revalidate_s=0)
+    assert library.sync(now=1.0) == {source: SOURCE_UPDATED}
+    (action,) = [a for _, model in library.load() for tab in model.tabs for a in tab.actions]
+    assert action["command"] == script.strip()
+    assert "command_ref" not in action
+
+    # A body missing on the share is a half-deployed library.
+    write_shelves(source, shelves(script + "sphere()\n"), bodies=share_bodies, mtime=3)
+    for name in os.listdir(share_bodies.folder):
+        for body in os.listdir(os.path.join(share_bodies.folder, name)):
+            os.remove(os.path.join(share_bodies.folder, name, body))
+    assert library.sync(now=2.0) == {source: SOURCE_OFFLINE}
+    assert commands(library) == [script.strip()]
@@ -0,0 +1,100 @@
+# ==========================
+# Live catalog built from a fake actionMan
+# ==========================
+import json
+import os
+
+from shelftoolpro_core.live_catalog import CatalogBuilder, build_live_catalog
+from shelftoolpro_core.fake_runtime import FakeActionItem, FakeActionTable, FakeActionMan
+
+
+class CountingTable(FakeActionTable):
+    def __init__(self, table_id, name, items=None):
+        super().__init__(table_id, name, items)
+        self.reads = 0
+
+    def getActionItem(self, index):
+        self.reads += 1
+        return super().getActionItem(index)
+
+
+class OldActionItem:
+    # Older action items only have getActionId.
+    def __init__(self, action_id, description):
+        self.action_id = action_id
+        self.description = description
+
+    def getActionId(self):
+        return self.action_id
+
+    def getDescription(self):
+        return self.description
+
+    def getCategory(self):
+        return "Old"
+
+    def getButtonText(self):
+        return ""
+
+
+def action_man():
+    main = CountingTable(0, "Main UI", [FakeActionItem(50001, "Box", "Objects"), FakeActionItem(50002, "Sphere", "Objects")])
+    track = CountingTable(2, "Track View", [FakeActionItem(7, "", "Keys", button_text="Add Key")])
+    return FakeActionMan([main, track])
+
+
+def test_unchanged_tables_are_not_read_again(tmp_path):
+    state = str(tmp_path / "state.json")
+    man = action_man()
+    first = CatalogBuilder(man, state).refresh()
+    assert first == {"tables": 2, "reread": 2, "actions": 3, "changed": True}
+
+    main, track = man.tables
+    main.reads = track.reads = 0
+    track.items.append(FakeActionItem(8, "Delete Key", "Keys"))
+    second = CatalogBuilder(man, state).refresh()
+    assert second == {"tables": 2, "reread": 1, "actions": 4, "changed": True}
+    assert main.reads == 0 and track.reads == 2
+
+    third = CatalogBuilder(man, state).refresh()
+    assert third["reread"] == 0 and not third["changed"]
+    assert CatalogBuilder(man, state).refresh(force=True)["reread"] == 2
+
+
+def test_unchanged_catalog_keeps_its_file(tmp_path):
+    json_path = str(tmp_path / "max_actions_live.json")
+    state = str(tmp_path / "state.json")
+    man = action_man()
+    assert build_live_catalog(man, json_path, state)["written"]
+    os.utime(json_path, ns=(10 ** 9, 10 ** 9))
+    stats = build_live_catalog(man, json_path, state)
+    assert "written" not in stats
+    assert os.stat(json_path).st_mtime_ns == 10 ** 9
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        groups = json.load(f)
+    assert [g["GroupName"] for g in groups] == ["Keys", "Objects"]
+    assert groups[0]["Actions"][0]["title"] == "Add Key"
+    assert groups[1]["Actions"][0]["command"] == 'actionMan.executeAction 0 "50001"'
+
+
+def test_get_action_id_fallback():
+    man = FakeActionMan([FakeActionTable(5, "Plugin", [OldActionItem(12, "Old Tool")])])
+    builder = CatalogBuilder(man)
+    builder.refresh()
+    action = builder.groups()[0]["Actions"][0]
+    assert action["title"] == "Old Tool"
+    assert action["command"] == 'actionMan.executeAction 5 "12"'
+
+
+def test_empty_tables(tmp_path):
+    json_path = str(tmp_path / "max_actions_live.json")
+    man = FakeActionMan([FakeActionTable(3, "Empty")])
+    stats = build_live_catalog(man, json_path)
+    assert stats["tables"] == 1 and stats["actions"] == 0 and stats["written"]
+    with open(json_path, "r", encoding="utf-8") as f:
+        assert json.load(f) == []
+
+    builder = CatalogBuilder(FakeActionMan())
+    assert builder.refresh() == {"tables": 0, "reread": 0, "actions": 0, "changed": False}
+    assert builder.groups() == []
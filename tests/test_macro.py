@@ -0,0 +1,72 @@
+# ==========================
+# Macro tools: step expansion and the one-undo MAXScript block
+# ==========================
+import pytest
+
+from shelftoolpro_core.macro import make_macro, macro_steps, macro_script, step_script, uid_index, maxscript_string
+from shelftoolpro_core.dispatch import needs_top_level
+from shelftoolpro_core.model import ShelfModel
+
+
+def tool(uid, command, title=None):
+    return {"title": title or uid, "icon": "", "command": command, "shortcut": "", "ID": None, "uid": uid}
+
+
+def test_nested_macros_expand_in_order():
+    inner = dict(make_macro("Inner", ["b", "c"]), uid="inner")
+    outer = dict(make_macro("Outer", ["a", "inner", "gone", "c"]), uid="outer")
+    model = ShelfModel()
+    model.add_tab("T", [tool("a", "box()"), tool("b", "sphere()"), tool("c", "cone()"), inner, outer])
+    tools, missing = macro_steps(outer, uid_index(model))
+    assert [t["uid"] for t in tools] == ["a", "b", "c", "c"]
+    assert missing == ["gone"]
+
+
+def test_macro_cycle_is_expanded_once():
+    first = dict(make_macro("First", ["a", "second"]), uid="first")
+    second = dict(make_macro("Second", ["b", "first", "second"]), uid="second")
+    index = {"a": tool("a", "box()"), "b": tool("b", "sphere()"), "first": first, "second": second}
+    tools, missing = macro_steps(first, index)
+    assert [t["uid"] for t in tools] == ["a", "b"]
+    assert missing == []
+
+
+def test_undo_label_is_escaped():
+    script = macro_script({"title": 'Say "hi" \\ now'}, [tool("a", "box()")])
+    assert script.splitlines()[0] == 'undo "Say \\"hi\\" \\\\ now" on'
+    assert macro_script({"title": ""}, []).splitlines()[0] == 'undo "Shelf Macro" on'
+
+
+def test_catalog_step_and_empty_step():
+    catalog = dict(tool("a", ""), ID="647394")
+    assert step_script(catalog) == 'actionMan.executeAction 0 "647394"'
+    assert step_script(tool("b", "   ")) == ""
+
+
+@pytest.mark.parametrize("command", [
+    'macroScript Foo category:"X" ( box() )',
+    "plugin simpleObject Foo name:\"Foo\" ( )",
+    "utility Foo \"Foo\" ( )",
+])
+def test_top_level_only_steps_are_rejected(command):
+    with pytest.raises(ValueError):
+        macro_script({"title": "M"}, [tool("a", "box()"), tool("b", command)])
+
+
+@pytest.mark.parametrize("command", [
+    'try(destroyDialog R)catch()\nrollout R "Tool" ( button b "Go" )\ncreateDialog R',
+    "fn helper = box()",
+    "struct S ( n = 0 )",
+    "global gSel = selection as array",
+    "obj = box()",
+])
+def test_global_definitions_run_through_execute(command):
+    script = step_script(tool("a", command))
+    assert script == "execute " + maxscript_string(command)
+    assert "\n" not in script
+    # The macro itself stays compilable: the definitions are inside a string.
+    assert not needs_top_level(macro_script({"title": "M"}, [tool("a", command), tool("b", "box()")]))
+
+
+def test_maxscript_string_escapes():
+    assert maxscript_string('a "b" \\n\r\nc') == '"a \\"b\\" \\\\n\\nc"'
@@ -0,0 +1,116 @@
+# ==========================
+# MacroScript parser and import
+# ==========================
+import os
+
+from multiprocessing import spawn
+
+from shelftoolpro_core import macroscript
+from shelftoolpro_core.macroscript import (parse_macroscripts, macros_to_tabs, macro_command, macro_definitions,
+                                           reimport_fields, MacroImporter)
+
+SOURCE = r'''
+-- a comment with macroScript Fake ( in it
+macroScript AlignPivot
+    category:"My Tools"
+    buttonText:"Align (pivot)"
+    tooltip:"Say \"hi\" ) here"
+    icon:#("Standard", 3)
+(
+    /* block comment ) ( */
+    local s = ")"
+    if selection.count > 0 then ( for o in selection do o.pivot = o.center )
+)
+
+macroScript "Quoted Name" category:"My Tools" icon:"tool.png"
+(
+    on execute do ( print @"C:\path\)" )
+)
+'''
+
+
+def test_parse_macroscripts():
+    macros = parse_macroscripts(SOURCE)
+    assert [m["name"] for m in macros] == ["AlignPivot", "Quoted Name"]
+    first, second = macros
+    assert first["category"] == "My Tools"
+    assert first["buttonText"] == "Align (pivot)"
+    assert first["tooltip"] == 'Say "hi" ) here'
+    assert first["icon"] == '#("Standard", 3)'
+    assert "o.pivot = o.center" in first["body"]
+    assert first["source"].startswith("macroScript AlignPivot") and first["source"].endswith(")")
+    assert second["icon"] == '"tool.png"'
+    assert "on execute do" in second["body"]
+
+
+def test_parse_ignores_unbalanced_and_nested():
+    text = 'fn f = ( macroScript Inner category:"X" ( 1 ) )\nmacroScript Top category:"X" ( 2 '
+    assert parse_macroscripts(text) == []
+
+
+def test_macros_to_tabs():
+    macros = parse_macroscripts(SOURCE) + parse_macroscripts('macroScript AlignPivot category:"My Tools" ( 3 )')
+    macros = [dict(m, file=os.path.join("lib", "tools.mcr")) for m in macros]
+    tabs = macros_to_tabs(macros)
+    assert list(tabs) == ["My Tools"]
+    tools = tabs["My Tools"]
+    # Defined twice: the later definition wins, in place.
+    assert [t["uid"] for t in tools] == ["mcr:My Tools/AlignPivot", "mcr:My Tools/Quoted Name"]
+    assert tools[0]["title"] == "AlignPivot" and tools[0]["command"] == "3"
+    assert tools[1]["icon"] == os.path.join("lib", "tool.png")
+
+
+def test_plain_body_runs_as_script():
+    macro = parse_macroscripts('macroScript A category:"C" ( box() )')[0]
+    assert macro_command(macro) == "box()"
+
+
+def test_handler_macro_is_defined_once_and_run_by_name():
+    macros = [dict(m, file="a.mcr") for m in parse_macroscripts(SOURCE)]
+    assert macro_command(macros[1]) == 'macros.run "My Tools" "Quoted Name"'
+    assert macro_definitions(macros, ["a.mcr"]) == [macros[1]["source"]]
+    assert macro_definitions(macros, []) == []
+
+
+def test_reimport_keeps_user_fields():
+    current = {"title": "My Title", "icon": "mine.png", "shortcut": "Ctrl+J", "command": "1", "uid": "mcr:C/A"}
+    imported = {"title": "A", "icon": "", "shortcut": "", "command": "2", "uid": "mcr:C/A", "ID": None}
+    assert reimport_fields(current, imported) == {"command": "2"}
+
+
+def test_reimport_keeps_catalog_id_filled_by_the_shelf():
+    current = {"title": "A", "command": "1", "uid": "mcr:C/A", "ID": "647394"}
+    imported = {"title": "A", "command": "1", "uid": "mcr:C/A", "ID": None}
+    assert reimport_fields(current, imported) == {}
+
+
+def test_process_pool_restores_spawn_executable(tmp_path):
+    root = tmp_path / "macros"
+    root.mkdir()
+    for n in range(macroscript.PARALLEL_MIN_FILES):
+        (root / f"t{n}.mcr").write_text(f'macroScript T{n} category:"Cat" ( {n} )', encoding="utf-8")
+    before = spawn.get_executable()
+    result = MacroImporter(None).import_tree(str(root), workers=2)
+    assert len(result["macros"]) == macroscript.PARALLEL_MIN_FILES
+    assert spawn.get_executable() == before
+
+
+def test_importer_skips_unchanged_files(tmp_path):
+    root = tmp_path / "macros"
+    root.mkdir()
+    for n in range(3):
+        (root / f"t{n}.mcr").write_text(f'macroScript T{n} category:"Cat" ( {n} )', encoding="utf-8")
+    index = str(tmp_path / "index.json")
+
+    result = MacroImporter(index).import_tree(str(root))
+    assert (result["parsed"], result["skipped"], len(result["macros"])) == (3, 0, 3)
+    result = MacroImporter(index).import_tree(str(root))
+    assert (result["parsed"], result["skipped"]) == (0, 3)
+
+    (root / "t0.mcr").write_text('macroScript T0 category:"Cat" ( "changed" )', encoding="utf-8")
+    os.utime(root / "t0.mcr", ns=(1, 1))
+    (root / "t2.mcr").unlink()
+    result = MacroImporter(index).import_tree(str(root))
+    assert (result["parsed"], result["files"]) == (1, 2)
+    assert result["changed"] == [str(root / "t0.mcr")]
+    assert sorted(m["body"].strip() for m in result["macros"]) == ['"changed"', "1"]
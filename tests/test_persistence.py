@@ -0,0 +1,108 @@
+# ==========================
+# Shelf model <-> shelves.json (snapshot and journal)
+# ==========================
+import os
+import json
+
+from shelftoolpro_core.model import ShelfModel
+from shelftoolpro_core.persistence import open_store, STORAGE_SNAPSHOT, STORAGE_JOURNAL, JOURNAL_SUFFIX
+
+
+def sample_model():
+    model = ShelfModel()
+    model.add_tab("Modeling", [
+        {"title": "Box", "icon": "box.png", "command": "box()", "shortcut": "Ctrl+B", "ID": None},
+        {"title": "Snap", "icon": "", "command": 'actionMan.executeAction 0 "40072"', "shortcut": "",
+         "ID": "0:40072", "uid": "u1"},
+    ])
+    model.add_tab("Hidden", [{"title": "Macro", "type": "macro", "steps": ["u1"], "uid": "m1"}])
+    model.set_tab_hidden("Hidden", True)
+    model.mark_saved()
+    return model
+
+
+def edit(model):
+    tab = model.tab("Modeling")
+    model.update_action("Modeling", tab.actions[0], {"title": "Big Box", "command": "box width:100"})
+    model.add_action("Modeling", {"title": "Sphere", "icon": "", "command": "sphere()", "shortcut": "", "ID": None}, 1)
+    model.remove_action("Modeling", tab.actions[2])
+    model.rename_tab("Modeling", "Modelling")
+    model.add_tab("Empty")
+    model.set_tab_hidden("Hidden", False)
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "shelves.json")
+    model = sample_model()
+    open_store(path, STORAGE_SNAPSHOT).save(model)
+    assert not model.dirty
+    assert open_store(path, STORAGE_SNAPSHOT).load().to_dict() == model.to_dict()
+
+
+def test_journal_replays_edits(tmp_path):
+    path = str(tmp_path / "shelves.json")
+    open_store(path, STORAGE_JOURNAL).save(sample_model())
+    snapshot = open(path, encoding="utf-8").read()
+
+    store = open_store(path, STORAGE_JOURNAL)
+    model = store.load()
+    store.attach(model)
+    edit(model)
+    store.save(model)
+
+    # The edits went to the journal only.
+    assert open(path, encoding="utf-8").read() == snapshot
+    assert os.path.getsize(path + JOURNAL_SUFFIX) > 0
+    assert open_store(path, STORAGE_JOURNAL).load().to_dict() == model.to_dict()
+    # Snapshot mode picks up a journal left behind.
+    assert open_store(path, STORAGE_SNAPSHOT).load().to_dict() == model.to_dict()
+
+
+def test_journal_compaction_does_not_replay_twice(tmp_path):
+    path = str(tmp_path / "shelves.json")
+    store = open_store(path, STORAGE_JOURNAL, compact_bytes=1)
+    model = store.load()
+    store.attach(model)
+    model.add_tab("Tab", [])
+    store.save(model)
+    model.add_action("Tab", {"title": "A", "command": "a()"})
+    store.save(model)  # appends, then compacts past 1 byte
+    assert os.path.getsize(path + JOURNAL_SUFFIX) == 0
+    assert json.load(open(path, encoding="utf-8"))["journal_seq"] == 2
+
+    # A journal that still holds records the snapshot already contains.
+    with open(path + JOURNAL_SUFFIX, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"seq": 2, "op": "add_action", "name": "Tab", "index": 1,
+                            "action": {"title": "A", "command": "a()"}}) + "\n")
+    assert len(open_store(path, STORAGE_JOURNAL).load().tab("Tab").actions) == 1
+
+
+def test_journal_ignores_torn_tail(tmp_path):
+    path = str(tmp_path / "shelves.json")
+    store = open_store(path, STORAGE_JOURNAL)
+    model = store.load()
+    store.attach(model)
+    model.add_tab("Tab", [])
+    store.save(model)
+    model.add_action("Tab", {"title": "A", "command": "a()"})
+    store.save(model)
+    with open(path + JOURNAL_SUFFIX, "a", encoding="utf-8") as f:
+        f.write('{"seq": 9, "op": "add_ac')
+
+    store = open_store(path, STORAGE_JOURNAL)
+    loaded = store.load()
+    assert [a["title"] for a in loaded.tab("Tab").actions] == ["A"]
+    # The next save rewrites the damaged journal.
+    store.attach(loaded)
+    loaded.add_action("Tab", {"title": "B", "command": "b()"})
+    store.save(loaded)
+    assert os.path.getsize(path + JOURNAL_SUFFIX) == 0
+    assert [a["title"] for a in open_store(path, STORAGE_JOURNAL).load().tab("Tab").actions] == ["A", "B"]
+
+
+def test_replay_matches_live_model():
+    model = sample_model()
+    replica = ShelfModel.from_dict(json.loads(json.dumps(model.to_dict())))
+    model.add_listener(lambda op, **payload: replica.apply(op, json.loads(json.dumps(payload))))
+    edit(model)
+    assert replica.to_dict() == model.to_dict()
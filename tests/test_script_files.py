@@ -0,0 +1,104 @@
+# ==========================
+# Script file tools: (path, size, mtime) cache with a TTL
+# ==========================
+import os
+
+import pytest
+
+from shelftoolpro_core.script_files import ScriptFileCache, maxscript_call, script_kind, SCRIPT_PYTHON, SCRIPT_MAXSCRIPT
+
+
+def write(path, text, mtime):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.utime(path, ns=(mtime * 10 ** 9, mtime * 10 ** 9))
+
+
+def test_ttl_reuses_the_last_check(tmp_path):
+    path = str(tmp_path / "tool.ms")
+    write(path, "box()", 1)
+    cache = ScriptFileCache(ttl_s=2.0)
+    script, replaced = cache.get(path, now=0.0)
+    assert (script.text, replaced, cache.stats, cache.reads) == ("box()", None, 1, 1)
+
+    write(path, "sphere()", 2)
+    # Within the TTL: no stat, the old text.
+    assert cache.get(path, now=1.0)[0].text == "box()"
+    assert cache.stats == 1
+    # After the TTL: stat, re-read, the replaced text comes back.
+    script, replaced = cache.get(path, now=2.5)
+    assert (script.text, replaced, cache.stats, cache.reads) == ("sphere()", "box()", 2, 2)
+
+
+def test_unchanged_file_is_only_stat(tmp_path):
+    path = str(tmp_path / "tool.ms")
+    write(path, "box()", 1)
+    cache = ScriptFileCache(ttl_s=0.0)
+    first, _ = cache.get(path, now=0.0)
+    again, replaced = cache.get(path, now=1.0)
+    assert again is first and replaced is None
+    assert (cache.stats, cache.reads) == (2, 1)
+
+
+def test_click_picks_up_an_edit_within_the_ttl(tmp_path):
+    path = str(tmp_path / "tool.ms")
+    write(path, "box()", 1)
+    cache = ScriptFileCache(ttl_s=2.0)
+    cache.get(path, now=0.0, fresh=True)
+    write(path, "sphere()", 2)
+    script, replaced = cache.get(path, now=0.5, fresh=True)
+    assert script.text == "sphere()" and replaced == "box()"
+
+    # A macro click stats its step files once; the steps then reuse that check.
+    write(path, "cone()", 3)
+    assert cache.revalidate([path, path], now=0.6, fresh=True) == ["sphere()"]
+    stats = cache.stats
+    assert cache.get(path, now=0.7)[0].text == "cone()"
+    assert cache.stats == stats
+
+
+def test_python_is_compiled_once_and_maxscript_is_not(tmp_path):
+    py = str(tmp_path / "Tool.PY")
+    ms = str(tmp_path / "tool.ms")
+    write(py, "result.append(len(result))\n", 1)
+    write(ms, "box()", 1)
+    cache = ScriptFileCache(ttl_s=0.0)
+    script, _ = cache.get(py, now=0.0)
+    assert script_kind(py) == script.kind == SCRIPT_PYTHON
+    code = script.code
+    result = []
+    for i in range(2):
+        script, _ = cache.get(py, now=float(i + 1))
+        assert script.code is code
+        exec(script.code, {"__name__": "__main__", "result": result})
+    assert result == [0, 1] and cache.reads == 1
+
+    maxscript, _ = cache.get(ms, now=0.0)
+    assert maxscript.kind == SCRIPT_MAXSCRIPT and maxscript.code is None
+
+
+def test_python_syntax_error_is_kept_for_the_click(tmp_path):
+    path = str(tmp_path / "broken.py")
+    write(path, "def (:\n", 1)
+    script, _ = ScriptFileCache().get(path, now=0.0)
+    assert script.code is None and isinstance(script.error, SyntaxError)
+
+
+def test_missing_file(tmp_path):
+    path = str(tmp_path / "tool.ms")
+    cache = ScriptFileCache(ttl_s=0.0)
+    with pytest.raises(OSError):
+        cache.get(path, now=0.0)
+    assert cache.revalidate([path], now=0.0) == []
+
+    # Once read, an unreachable file keeps running the last good copy.
+    write(path, "box()", 1)
+    cache.get(path, now=1.0)
+    os.remove(path)
+    assert cache.get(path, now=2.0, fresh=True)[0].text == "box()"
+
+
+def test_maxscript_call_quoting():
+    assert maxscript_call(r"C:\tools\my tool.py") == r'python.ExecuteFile @"C:\tools\my tool.py"'
+    # A verbatim string cannot hold a quote; Windows paths never contain one.
+    assert maxscript_call(r'C:\tools\"odd".py') == r'python.ExecuteFile @"C:\tools\odd.py"'
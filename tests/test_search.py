@@ -0,0 +1,36 @@
+# ==========================
+# Add Tool search
+# ==========================
+import random
+
+from shelftoolpro_core.search import SearchIndex, SearchSession
+
+ACTIONS = [
+    {"title": "Toggle Snap", "_GroupName": "Snaps", "command": ""},
+    {"title": "Angle Snap Toggle", "_GroupName": "Snaps", "command": ""},
+    {"title": "Select Object", "_GroupName": "Selection", "command": ""},
+    {"title": "Render", "_GroupName": "Render", "command": ""},
+    {"title": "Snapshot", "_GroupName": "Tools", "command": "snapshot $"},
+]
+
+
+def test_ranked_fuzzy_and_acronym():
+    index = SearchIndex(ACTIONS)
+    assert index.search("toggle snap") == [0, 1]
+    assert index.search("tgl snp")[0] == 0
+    assert index.search("ts")[0] == 0
+    assert index.search("snap") == [0, 1, 4]
+    assert index.search("xyz") == []
+
+
+def test_session_matches_fresh_search():
+    rng = random.Random(5)
+    words = ["toggle", "snap", "select", "object", "render", "angle", "mesh", "edit"]
+    actions = [{"title": " ".join(rng.choice(words) for _ in range(rng.randint(1, 3))), "_GroupName": "G",
+                "command": ""} for _ in range(3000)]
+    index = SearchIndex(actions)
+    boost = {rng.randrange(3000): rng.random() * 40 for _ in range(50)}
+    session = SearchSession(index, boost=boost, limit=100)
+    for query in ["select object", "toggle snap", "tgl snp", "s", "e m"]:
+        for i in range(1, len(query) + 1):
+            assert session.search(query[:i]) == index.search(query[:i], boost=boost)[:100]
@@ -0,0 +1,56 @@
+# ==========================
+# Shortcut normalisation and the registry
+# ==========================
+import pytest
+
+from shelftoolpro_core.shortcuts import normalize_shortcut, ShortcutRegistry
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", ""),
+    ("  ", ""),
+    ("ctrl+a", "Ctrl+A"),
+    ("shift+ctrl+a", "Ctrl+Shift+A"),
+    ("Control+Option+x", "Ctrl+Alt+X"),
+    ("cmd+Shift+F5", "Shift+Meta+F5"),
+    ("f12", "F12"),
+    ("Ctrl++", "Ctrl++"),
+    ("alt+pagedown", "Alt+PgDown"),
+    ("Ctrl+Escape", "Ctrl+Esc"),
+    ("Ctrl+", None),
+    ("Ctrl+Shift", None),
+    ("Hyper+A", None),
+    ("Ctrl+A, Ctrl+B", None),
+    ("F36", None),
+])
+def test_normalize_shortcut(text, expected):
+    assert normalize_shortcut(text) == expected
+
+
+def test_registry_conflicts_and_takeover():
+    added, removed = [], []
+    registry = ShortcutRegistry(added.append, removed.append)
+    first = {"title": "First", "shortcut": "ctrl+k"}
+    second = {"title": "Second", "shortcut": "Ctrl+K"}
+    registry.bind(first)
+    registry.bind(second)
+    assert registry.lookup("Ctrl+K") is first
+    assert registry.conflict("CTRL+k", second) is first
+    assert registry.conflicts() == {"Ctrl+K": [second]}
+
+    registry.unbind(first)
+    assert registry.lookup("Ctrl+K") is second
+    assert registry.conflicts() == {}
+    registry.unbind(second)
+    assert added == ["Ctrl+K"] and removed == ["Ctrl+K"]
+    assert len(registry) == 0
+
+
+def test_registry_rebind_moves_key():
+    registry = ShortcutRegistry()
+    tool = {"title": "T", "shortcut": "F2"}
+    registry.bind(tool)
+    tool["shortcut"] = "F3"
+    registry.bind(tool)
+    assert registry.keys() == ["F3"]
+    assert registry.key_of(tool) == "F3"
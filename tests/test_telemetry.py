@@ -0,0 +1,29 @@
+# ==========================
+# Tool telemetry: percentiles and slow tools
+# ==========================
+from shelftoolpro_core.telemetry import ToolTelemetry, ToolStats
+
+
+def test_percentile_stays_within_observed_range():
+    stats = ToolStats()
+    for _ in range(100):
+        stats.record(300.0)
+    assert 200.0 < stats.percentile(0.95) <= 300.0
+    assert stats.percentile(0.5) <= 300.0
+
+
+def test_percentile_interpolates_within_bucket():
+    stats = ToolStats()
+    for ms in range(1, 101):
+        stats.record(float(ms))
+    assert 40 <= stats.percentile(0.5) <= 60
+    assert 90 <= stats.percentile(0.95) <= 100
+    assert ToolStats().percentile(0.95) == 0.0
+
+
+def test_slow_threshold_between_bucket_bounds():
+    telemetry = ToolTelemetry(slow_ms=400)
+    for _ in range(20):
+        telemetry.record("fast", 300.0)
+        telemetry.record("slow", 450.0)
+    assert telemetry.slow_tools() == ["slow"]
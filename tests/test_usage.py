@@ -0,0 +1,90 @@
+# ==========================
+# Frecency usage store and the generated Most Used tab
+# ==========================
+import json
+
+import pytest
+
+from shelftoolpro_core.usage import UsageStore, USAGE_VERSION, FRECENCY_HALF
+from shelftoolpro_core.search import SCORE_FRECENCY_MAX
+from shelftoolpro_core.model import ShelfModel, MOST_USED_TAB
+
+DAY = 86400.0
+
+
+def test_score_halves_every_half_life():
+    usage = UsageStore(half_life_days=14)
+    usage.record_launch("a", now=0.0)
+    assert usage.frecency("a", now=0.0) == pytest.approx(1.0)
+    assert usage.frecency("a", now=14 * DAY) == pytest.approx(0.5)
+    usage.record_launch("a", now=14 * DAY)
+    assert usage.frecency("a", now=14 * DAY) == pytest.approx(1.5)
+    assert usage.frecency("missing") == 0.0
+
+
+def test_recent_use_outranks_old_frequent_use():
+    usage = UsageStore(half_life_days=1)
+    for _ in range(4):
+        usage.record_launch("old", now=0.0)
+    usage.record_launch("new", now=3 * DAY)
+    usage.record_add("added", now=3 * DAY)
+    assert usage.top(3, now=3 * DAY) == ["added", "new", "old"]
+
+
+def test_boosts_saturate_and_skip_unknown_rows():
+    usage = UsageStore()
+    usage.record_launch("a", now=0.0)
+    for _ in range(1000):
+        usage.record_launch("b", now=0.0)
+    usage.record_launch("gone", now=0.0)
+    boosts = usage.boosts({"a": 1, "b": 2}.get, now=0.0)
+    assert set(boosts) == {1, 2}
+    assert boosts[1] == pytest.approx(SCORE_FRECENCY_MAX * 1 / (1 + FRECENCY_HALF))
+    assert boosts[1] < boosts[2] < SCORE_FRECENCY_MAX
+
+
+def test_prune_keeps_the_hottest_keys():
+    usage = UsageStore(max_entries=10)
+    for i in range(12):
+        for _ in range(i + 1):
+            usage.record_launch(f"k{i}", now=0.0)
+    usage.prune(now=0.0)
+    assert len(usage.entries) == 10
+    assert "k0" not in usage.entries and "k11" in usage.entries
+
+
+def test_flush_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "usage.json")
+    usage = UsageStore(path)
+    assert not usage.flush_due()
+    usage.record_launch("a", now=100.0)
+    usage.record_add("b", now=100.0)
+    assert usage.flush()
+    assert usage.pending == 0 and not usage.flush()
+
+    loaded = UsageStore(path)
+    revision = loaded.revision
+    loaded.load()
+    assert loaded.entries == usage.entries
+    assert loaded.revision > revision
+
+
+def test_load_ignores_other_versions_and_bad_files(tmp_path):
+    path = tmp_path / "usage.json"
+    path.write_text(json.dumps({"version": USAGE_VERSION + 1, "entries": {"a": [1, 0, 1, 0]}}), encoding="utf-8")
+    usage = UsageStore(str(path))
+    usage.load()
+    assert usage.entries == {}
+    path.write_text("{not json", encoding="utf-8")
+    usage.load()
+    assert usage.entries == {}
+
+
+def test_most_used_tab_name_is_reserved():
+    model = ShelfModel()
+    with pytest.raises(ValueError):
+        model.add_tab(MOST_USED_TAB)
+    model.add_tab("Tools")
+    with pytest.raises(ValueError):
+        model.rename_tab("Tools", MOST_USED_TAB)
+    assert model.tab_names() == ["Tools"]
@@ -0,0 +1,47 @@
+# ==========================
+# FileWatcher with the stat calls taken off the UI thread
+# ==========================
+import os
+
+from shelftoolpro_core.watch import FileWatcher, stat_paths
+
+
+def write(path, text, mtime):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.utime(path, ns=(mtime * 10 ** 9, mtime * 10 ** 9))
+
+
+def test_poll_with_keys_reports_settled_change(tmp_path):
+    path = str(tmp_path / "shelves.json")
+    write(path, "{}", 1)
+    watcher = FileWatcher([path], settle_s=0.5)
+    write(path, '{"tabs": []}', 2)
+    keys = stat_paths(watcher.paths())
+    assert watcher.poll(now=10.0, keys=keys) == []
+    assert watcher.poll(now=10.6, keys=keys) == [path]
+    assert watcher.poll(now=11.2, keys=stat_paths(watcher.paths())) == []
+
+
+def test_stale_keys_do_not_report_our_own_write(tmp_path):
+    path = str(tmp_path / "shelves.json")
+    write(path, "{}", 1)
+    watcher = FileWatcher([path], settle_s=0.5)
+    stale = stat_paths(watcher.paths())
+    write(path, '{"tabs": []}', 2)
+    watcher.remember(path)
+    assert watcher.poll(now=10.0, keys=stale) == []
+    assert watcher.poll(now=10.6, keys=stat_paths(watcher.paths())) == []
+
+
+def test_paths_missing_from_keys_wait_for_next_poll(tmp_path):
+    old = str(tmp_path / "a.json")
+    new = str(tmp_path / "b.json")
+    write(old, "{}", 1)
+    watcher = FileWatcher([old], settle_s=0.0)
+    keys = stat_paths(watcher.paths())
+    watcher.add(new)
+    write(new, "{}", 2)
+    assert watcher.poll(now=1.0, keys=keys) == []
+    assert watcher.poll(now=1.0, keys=stat_paths(watcher.paths())) == []
+    assert watcher.poll(now=1.0, keys=stat_paths(watcher.paths())) == [new]